@@ -0,0 +1,269 @@
+import argparse
+import sys
+import time
+
+from constants import FORMATS, SNAPSHOT_DB
+
+# ==========================================
+# 통합 CLI: python aws_resource.py <명령> [옵션]
+# - 리포트 1개: routetable / tgwroute / securitygroup / securitygroup2 / vpcendpoint / ssouser / permissionset
+# - all: 여러 대상 x 리포트 일괄 수집 (collector) / serve: 상주 서비스 (service)
+# - route: 라우트 조회 (route_lookup) / reach: 보안그룹 도달성 조회 (sg_reach)
+# - 모듈별 단독 실행(python collector.py 등)도 이 CLI 의 해당 명령으로 넘김 → 옵션 이름/의미는 여기 한 곳
+# - 최상단은 argparse 와 constants(import 없는 상수 모듈)만 import
+#   → --help 는 boto3/pandas/openpyxl/sqlite3 로딩 없이 바로 응답
+#   무거운 모듈은 명령 실행 직전에 import (collector 도 선택한 리포트 모듈만 로딩)
+# - profile / region / 출력 파일은 인자로 받음 (get_*.py 의 설정 블록은 단독 실행용 기본값)
+# - --timing: import 시간과 실행 시간 출력
+# ==========================================
+PROFILE = "default"
+REGION = "ap-northeast-2"
+
+REPORT_HELP = {
+    "routetable": "라우팅 테이블 리포트",
+    "tgwroute": "Transit Gateway 라우팅 테이블 리포트 (라우트 검색 + attachment → VPC 이름)",
+    "securitygroup": "보안그룹 룰 리포트 (Inbound/Outbound 좌우 배치)",
+    "securitygroup2": "보안그룹 룰 리포트 (SG 정보 가운데 배치)",
+    "vpcendpoint": "VPC 엔드포인트 + ENI IP 리포트",
+    "ssouser": "IAM Identity Center 사용자/그룹 리포트",
+    "permissionset": "IAM Identity Center 계정 x 권한 세트 x 사용자 할당 리포트",
+}
+
+# -------------------------
+# 명령 실행에 필요한 모듈 로딩 (startup 벤치도 같은 경로 사용)
+# -------------------------
+def load(command):
+    import collector
+    if command in REPORT_HELP:
+        collector.report_module(command)
+    elif command == "serve":
+        import service
+    elif command == "route":
+        import route_lookup
+    elif command == "reach":
+        import sg_reach
+    return collector
+
+def _load_timed(args):
+    started = time.perf_counter()
+    collector = load(args.command)
+    if args.timing:
+        print(f"⏱ import: {(time.perf_counter() - started) * 1e3:.0f}ms")
+    return collector
+
+def _formats(parser, value):
+    formats = [f for f in value.split(",") if f]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"지원하지 않는 출력 형식: {', '.join(sorted(unknown))}")
+    return formats
+
+def _snapshot(args):
+    from snapshot import SnapshotStore
+    if args.from_snapshot:
+        return SnapshotStore(args.from_snapshot), "replay"
+    if args.snapshot:
+        return SnapshotStore(args.snapshot), ("record" if args.refresh else "auto")
+    return None, "auto"
+
+def _scope(args):
+    from scope import Scope
+    return Scope.parse(args.vpc, args.tag, getattr(args, "sg_name", None), getattr(args, "service", None))
+
+def _profile(args):
+    from instrument import PROFILER
+    if args.stats or args.trace or args.trace_memory:
+        PROFILER.enable(trace_memory=args.trace_memory)
+    return PROFILER
+
+def _finish(args, profiler, schedulers, started):
+    if args.timing:
+        print(f"⏱ 실행: {time.perf_counter() - started:.2f}s")
+    if args.stats:
+        for t, scheduler in schedulers.items():
+            scheduler.print_metrics(f"[{t.label} {t.region}]")
+    profiler.print_summary()
+    if args.trace:
+        profiler.dump_json(args.trace)
+
+# 리포트 1개 (대상 1개)
+def run_report(parser, args):
+    collector = _load_timed(args)
+    import export
+    from throttle import RequestScheduler
+
+    formats = _formats(parser, args.format)
+    target = collector.Target(args.profile, args.region, args.label or args.profile)
+    snapshot, mode = _snapshot(args)
+    schedulers = {target: RequestScheduler()} if not args.no_throttle and mode != "replay" else {}
+    profiler = _profile(args)
+
+    started = time.perf_counter()
+    collected = collector.collect_reports([target], [args.command], snapshot=snapshot, mode=mode,
+                                          schedulers=schedulers, scope=_scope(args),
+                                          expand_prefix_lists=args.expand_prefix_lists)
+    for fmt in formats:
+        path = export.export_path(args.output, fmt) if args.output else None
+        with profiler.span("write", report=args.command, format=fmt):
+            collector.write_report(args.command, [target.label], collected[args.command], fmt, path, args.shard)
+    _finish(args, profiler, schedulers, started)
+
+# 여러 대상 x 리포트 (collector.render_all)
+def run_all(parser, args):
+    collector = _load_timed(args)
+    snapshot, mode = _snapshot(args)
+    profiler = _profile(args)
+    started = time.perf_counter()
+    collector.render_all(args.target or collector.TARGETS, args.report, throttle=not args.no_throttle,
+                         pipeline=not args.no_pipeline, formats=_formats(parser, args.format),
+                         shard_by=args.shard, snapshot=snapshot, mode=mode, scope=_scope(args),
+                         expand_prefix_lists=args.expand_prefix_lists)
+    if args.timing:
+        print(f"⏱ 실행: {time.perf_counter() - started:.2f}s")
+    if args.trace:
+        profiler.dump_json(args.trace)
+
+def run_serve(parser, args):
+    _load_timed(args)
+    import service
+    service.serve(args.target, args.host or service.HOST, args.port or service.PORT, _scope(args), args.synthetic,
+                  args.latency, not args.no_throttle, args.quiet)
+
+# 조회 명령용 카탈로그 (대상 1개, --from-snapshot 이면 AWS 호출 없이 스냅샷으로)
+def _query_catalog(args, scope=None):
+    from catalog import ResourceCatalog
+    from snapshot import SnapshotSession, SnapshotStore
+    if args.from_snapshot:
+        session = SnapshotSession(SnapshotStore(args.from_snapshot), args.label or args.profile, args.region,
+                                  mode="replay")
+    else:
+        import boto3
+        session = boto3.Session(profile_name=args.profile, region_name=args.region)
+    return ResourceCatalog(session, scope, args.expand_prefix_lists)
+
+def run_route(parser, args):
+    _load_timed(args)
+    from route_lookup import RouteIndex
+    index = RouteIndex.from_catalog(_query_catalog(args))
+    for dest, match in zip(args.destinations, index.lookup_many(args.source, args.destinations, args.vpc)):
+        if match is None:
+            print(f"{dest:<40} 일치 라우트 없음")
+        else:
+            print(f"{dest:<40} {match.route_table_id} ({match.association})  {match.destination} -> "
+                  f"{match.target} [{match.state}]")
+    if index.unresolved:
+        print(f"⚠ 펼치지 못한 prefix list: {', '.join(sorted(index.unresolved))}")
+
+def run_reach(parser, args):
+    _load_timed(args)
+    from scope import Scope
+    from sg_reach import ReachabilityIndex
+    if args.port == "-":
+        port = None
+    else:
+        lo, _, hi = args.port.partition("-")
+        if not (lo.isdigit() and (hi or lo).isdigit()):
+            parser.error(f"포트 형식 오류: {args.port!r} (예: 5432, 8000-8080, -)")
+        port = (int(lo), int(hi or lo))
+    index = ReachabilityIndex.from_catalog(_query_catalog(args, Scope.parse(vpc_ids=args.vpc)))
+    matches = index.query(args.protocol, port, args.source, "outbound" if args.outbound else "inbound",
+                          "overlaps" if args.overlaps else "contains", args.transitive)
+    for m in matches:
+        via = f"  (via {' -> '.join(m.via)})" if m.via else ""
+        print(f"{m.group_id:<22} {m.group_name:<32} {m.direction:<8} {m.type:<6} {m.port_range:<12} "
+              f"{m.source:<40} {m.remark}{via}")
+
+# -------------------------
+# 인자
+# -------------------------
+def _add_scope(p, report_filters=True):
+    p.add_argument("--vpc", action="append", metavar="VPC_ID", help="VPC 범위 (반복 지정 가능)")
+    p.add_argument("--tag", action="append", metavar="KEY[=V1,V2]", help="태그 범위 (반복 지정 시 AND)")
+    if report_filters:
+        p.add_argument("--sg-name", action="append", metavar="PATTERN", help="SG 이름 패턴 (* ? 와일드카드)")
+        p.add_argument("--service", action="append", metavar="NAME", help="엔드포인트 서비스명 범위")
+
+def _add_run_options(p):
+    p.add_argument("--format", default="xlsx", help=f"출력 형식 (쉼표 구분: {', '.join(FORMATS)})")
+    p.add_argument("--shard", choices=["account", "vpc"], help="xlsx 를 계정/VPC 단위 워크북으로 나눠 병렬 저장 (zip)")
+    p.add_argument("--expand-prefix-lists", action="store_true",
+                   help="SG 소스 / 라우트 목적지의 prefix list 를 CIDR(목록 이름)으로 펼침")
+    p.add_argument("--snapshot", nargs="?", const=SNAPSHOT_DB, metavar="DB",
+                   help="원본 응답을 스냅샷 DB에 저장 (TTL 안이면 재사용)")
+    p.add_argument("--from-snapshot", nargs="?", const=SNAPSHOT_DB, metavar="DB",
+                   help="AWS 호출 없이 스냅샷 DB만으로 렌더링")
+    p.add_argument("--refresh", action="store_true", help="--snapshot 사용 시 TTL 무시하고 다시 수집")
+    p.add_argument("--no-throttle", action="store_true", help="API 스케줄러 없이 호출")
+    p.add_argument("--stats", action="store_true", help="API 호출/단계별 계측 요약 출력")
+    p.add_argument("--trace-memory", action="store_true", help="단계별 tracemalloc 피크 포함 (계측 켬)")
+    p.add_argument("--trace", metavar="FILE", help="계측 결과 JSON 저장")
+    _add_scope(p)
+
+# 조회 명령 (route / reach) 공통: 대상 1개 + 스냅샷 재생
+def _add_query_options(p, expand_help):
+    p.add_argument("--profile", default=PROFILE, help=f"AWS 프로필 (기본 {PROFILE})")
+    p.add_argument("--region", default=REGION, help=f"리전 (기본 {REGION})")
+    p.add_argument("--label", help="--from-snapshot 의 계정 라벨 (기본 프로필 이름)")
+    p.add_argument("--from-snapshot", nargs="?", const=SNAPSHOT_DB, metavar="DB", help="AWS 호출 없이 스냅샷 DB로 조회")
+    p.add_argument("--expand-prefix-lists", action="store_true", help=expand_help)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="aws_resource", description="AWS 리소스 리포트 통합 CLI")
+    parser.add_argument("--timing", action="store_true", help="import / 실행 시간 출력")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    for name, help_text in REPORT_HELP.items():
+        p = commands.add_parser(name, help=help_text, description=help_text)
+        p.add_argument("--profile", default=PROFILE, help=f"AWS 프로필 (기본 {PROFILE})")
+        p.add_argument("--region", default=REGION, help=f"리전 (기본 {REGION})")
+        p.add_argument("--label", help="ACCOUNT 컬럼/시트명 (기본 프로필 이름)")
+        p.add_argument("-o", "--output", help="출력 파일 (기본 리포트별 파일명, 확장자는 --format 에 맞춤)")
+        _add_run_options(p)
+        p.set_defaults(run=run_report)
+
+    p = commands.add_parser("all", help="여러 대상 x 리포트 일괄 수집 (collector)")
+    p.add_argument("--target", action="append", metavar="PROFILE:REGION[:LABEL]",
+                   help="수집 대상 (반복 지정, 기본 collector.TARGETS)")
+    p.add_argument("--report", action="append", choices=list(REPORT_HELP), help="리포트 (반복 지정, 기본 전체)")
+    p.add_argument("--no-pipeline", action="store_true", help="전부 수집한 뒤 저장 (수집/저장 겹치지 않음)")
+    _add_run_options(p)
+    p.set_defaults(run=run_all)
+
+    p = commands.add_parser("serve", help="상주 서비스 (인벤토리 유지 + 로컬 HTTP 리포트/조회)")
+    p.add_argument("--host", help="기본 service.HOST (127.0.0.1)")
+    p.add_argument("--port", type=int, help="기본 service.PORT (8787)")
+    p.add_argument("--target", action="append", metavar="PROFILE:REGION[:LABEL]",
+                   help="수집 대상 (반복 지정, 기본 collector.TARGETS)")
+    p.add_argument("--synthetic", metavar="SCALE", help="AWS 대신 합성 계정 사용 (small / medium / large)")
+    p.add_argument("--latency", type=float, default=0.0, help="--synthetic 호출당 지연 (초)")
+    p.add_argument("--no-throttle", action="store_true", help="API 스케줄러 없이 호출")
+    p.add_argument("--quiet", action="store_true", help="요청 로그 생략")
+    _add_scope(p, report_filters=False)
+    p.set_defaults(run=run_serve)
+
+    p = commands.add_parser("route", help="서브넷/출발지 IP 기준 목적지 라우트 조회 (LPM)")
+    p.add_argument("source", help="출발지 서브넷 ID 또는 IP")
+    p.add_argument("destinations", nargs="+", help="목적지 IP")
+    p.add_argument("--vpc", metavar="VPC_ID", help="출발지 IP 가 여러 VPC 에 겹칠 때 VPC ID")
+    _add_query_options(p, "prefix list 목적지를 CIDR 로 펼쳐 조회")
+    p.set_defaults(run=run_route)
+
+    p = commands.add_parser("reach", help="보안그룹 도달성 조회 (프로토콜/포트/소스 → 허용 SG 룰)")
+    p.add_argument("protocol", help="tcp / udp / icmp / all / 프로토콜 번호")
+    p.add_argument("port", help="포트 또는 범위 (예: 5432, 8000-8080, '-' 는 포트 무관)")
+    p.add_argument("source", help="출발지 CIDR / IP / SG ID (outbound 면 목적지)")
+    p.add_argument("--outbound", action="store_true", help="아웃바운드 룰 조회")
+    p.add_argument("--overlaps", action="store_true", help="소스 범위가 일부만 겹쳐도 일치")
+    p.add_argument("--transitive", action="store_true", help="일치한 SG 를 참조하는 SG 까지 따라감")
+    p.add_argument("--vpc", action="append", metavar="VPC_ID", help="대상 VPC (반복 지정 가능)")
+    _add_query_options(p, "prefix list 소스를 CIDR 로 펼쳐 조회")
+    p.set_defaults(run=run_reach)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.run(parser, args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import contextlib
+import os
+import resource
+import tempfile
+import time
+
+import collector
+import get_permissionset
+import get_routetable
+import get_securitygroup
+import get_securitygroup2
+import get_ssouser
+import get_tgwroute
+import get_vpcendpoint
+from catalog import ResourceCatalog
+from synthetic import SCALES, SyntheticAccount, SyntheticSession, session_factory
+from throttle import RequestScheduler, ScheduledSession
+
+# ==========================================
+# 수집(API 조회) 벤치 (합성 계정)
+# - 리포트 x 단계 suite, 수집/저장 파이프라인, SSO 조회 캐시, 권한 세트 / TGW 라우트 동시 조회
+# ==========================================
+PIPELINE_LATENCY = 0.2    # 파이프라인 벤치의 합성 API 호출당 지연 (초)
+SSO_USERS = 4_000
+SSO_LATENCY = 0.05        # 합성 identitystore 호출당 지연 (초)
+SSO_CHANGED = 40          # warm 실행 전 Revision 을 올릴 사용자 수
+PERMISSION_SET_WORKERS = [1, 4, 16]
+TGW_LATENCY = 0.05        # 합성 search_transit_gateway_routes 호출당 지연 (초)
+TGW_WORKERS = [1, 4, 16]
+# ==========================================
+
+# -------------------------
+# 합성 계정 전체 리포트 벤치 (리포트 x 단계)
+# - 단계: fetch(API 조회) / transform(행 구성) / write(엑셀 저장)
+# - 단계별 벽시계 시간, API 호출 수(합성 세션 집계), 프로세스 최대 RSS
+#   RSS 는 getrusage 의 최고 수위라 단계별 값은 "그 단계까지의 피크",
+#   rss_growth_mb 는 그 단계에서 피크가 늘어난 양
+# -------------------------
+def max_rss_mb():
+    # Linux 는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_stage(session, fn):
+    calls = sum(session.calls.values())
+    rss = max_rss_mb()
+    started = time.perf_counter()
+    result = fn()
+    stage = {
+        'wall_s': round(time.perf_counter() - started, 3),
+        'api_calls': sum(session.calls.values()) - calls,
+        'peak_rss_mb': round(max_rss_mb(), 1),
+        'rss_growth_mb': round(max_rss_mb() - rss, 1),
+    }
+    return result, stage
+
+# 리포트별 단계 정의: [(단계명, fn(catalog, 이전 단계 결과, 출력 경로))]
+# - fetch 에서 카탈로그를 채워 두면 transform 은 캐시만 사용 (엔드포인트 ENI 조회는 transform 에 포함)
+# - SSO 는 조회와 행 구성이 한 함수라 collect 한 단계로 측정
+SUITE_REPORTS = {
+    "routetable": [
+        ("fetch", lambda c, _, out: (c.vpc_map(), c.resources("route_tables"))),
+        ("transform", lambda c, _, out: get_routetable.get_full_data(account_label="BENCH", catalog=c)),
+        ("write", lambda c, df, out: get_routetable.save_with_merging_centered(df, out)),
+    ],
+    "tgwroute": [
+        ("fetch", lambda c, _, out: (c.vpc_map(), c.resources("transit_gateway_route_tables"),
+                                     c.resources("transit_gateway_attachments"))),
+        ("transform", lambda c, _, out: get_tgwroute.get_tgw_route_data(account_label="BENCH", catalog=c)),
+        ("write", lambda c, df, out: get_tgwroute.save_tgw_routes(df, out)),
+    ],
+    "vpcendpoint": [
+        ("fetch", lambda c, _, out: (c.vpc_map(), c.subnet_names(), c.sg_tag_names(), c.resources("vpc_endpoints"))),
+        ("transform", lambda c, _, out: get_vpcendpoint.get_vpce_data_with_ip(account_label="BENCH", catalog=c)),
+        ("write", lambda c, df, out: get_vpcendpoint.save_with_styled_excel(df, out)),
+    ],
+    "ssouser": [
+        ("collect", lambda c, _, out: get_ssouser.get_sso_user_data(account_label="BENCH", catalog=c, cache_db=None)),
+        ("write", lambda c, df, out: get_ssouser.save_to_excel_final(df, out)),
+    ],
+    "permissionset": [
+        ("collect", lambda c, _, out: get_permissionset.get_permission_set_data(account_label="BENCH", catalog=c)),
+        ("write", lambda c, df, out: get_permissionset.save_permission_matrix(df, out)),
+    ],
+    "securitygroup": [
+        ("fetch", lambda c, _, out: get_securitygroup.get_sg_data(catalog=c)),
+        ("transform", lambda c, data, out: (data, sum(
+            len(get_securitygroup.expand_rules(sg.get(key) or [], c.sg_name_by_id()))
+            for sg in data[1] for key in ("IpPermissions", "IpPermissionsEgress")))),
+        ("write", lambda c, res, out: get_securitygroup.save_side_by_side([("BENCH", *res[0])], out)),
+    ],
+    "securitygroup2": [
+        ("fetch", lambda c, _, out: get_securitygroup2.get_sg_data(catalog=c)),
+        ("transform", lambda c, data, out: (data, sum(len(rows) for rows in get_securitygroup2.iter_sg_rows(*data)))),
+        ("write", lambda c, res, out: get_securitygroup2.save_centered([("BENCH", *res[0])], out)),
+    ],
+}
+
+def bench_suite(scales, reports=None, latency=0.0, throttle_rate=None):
+    results = []
+    for scale in scales:
+        account = SyntheticAccount.scale(scale)
+        session = SyntheticSession(account, latency=latency, throttle_rate=throttle_rate)
+        # 스로틀 흉내 시에는 collector 와 같이 스케줄러 경유 (재시도/속도 조절 포함 시간 측정)
+        scheduler = RequestScheduler() if throttle_rate else None
+        # 리포트 간 카탈로그 공유 (collector 와 동일): 뒤 리포트의 fetch 는 캐시 적중이면 호출 0
+        catalog = ResourceCatalog(ScheduledSession(session, scheduler) if scheduler else session)
+        for name in reports or SUITE_REPORTS:
+            stages, value = {}, None
+            with tempfile.TemporaryDirectory() as tmp:
+                out = os.path.join(tmp, f"{name}.xlsx")
+                for stage, fn in SUITE_REPORTS[name]:
+                    value, stages[stage] = run_stage(session, lambda: fn(catalog, value, out))
+            results.append({
+                'bench': f'suite_{name}',
+                'scale': scale,
+                **SCALES[scale],
+                'stages': stages,
+                'total_s': round(sum(s['wall_s'] for s in stages.values()), 3),
+            })
+        results.append({'bench': 'suite_api_calls', 'scale': scale, 'calls': dict(sorted(session.calls.items())),
+                        'throttled': dict(sorted(session.throttled.items())),
+                        'scheduler': scheduler.metrics() if scheduler else None})
+    return results
+
+# -------------------------
+# 수집/저장 파이프라인 벤치 (collector 전체 경로, 합성 계정 + 호출당 지연)
+# - sequential: collect_reports 후 save_reports (fetch_s + write_s)
+# - pipelined: collect_and_save (리포트별 수집이 끝나는 대로 저장)
+# -------------------------
+def bench_pipeline(scales, latency=PIPELINE_LATENCY):
+    results = []
+    targets = [("bench", "ap-northeast-2", "BENCH")]
+    for scale in scales:
+        account = SyntheticAccount.scale(scale)
+        row = {'bench': 'pipeline', 'scale': scale, 'latency_s': latency}
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            # collector 는 현재 디렉터리에 리포트 파일을 씀
+            os.chdir(tmp)
+            try:
+                started = time.perf_counter()
+                collected = collector.collect_reports(targets, session_factory=session_factory(account, latency=latency))
+                row['fetch_s'] = round(time.perf_counter() - started, 2)
+                started = time.perf_counter()
+                collector.save_reports(targets, collected)
+                row['write_s'] = round(time.perf_counter() - started, 2)
+                row['sequential_s'] = round(row['fetch_s'] + row['write_s'], 2)
+
+                started = time.perf_counter()
+                collector.collect_and_save(targets, session_factory=session_factory(account, latency=latency))
+                row['pipelined_s'] = round(time.perf_counter() - started, 2)
+            finally:
+                os.chdir(cwd)
+        row['max_stage_s'] = max(row['fetch_s'], row['write_s'])
+        row['speedup'] = round(row['sequential_s'] / row['pipelined_s'], 2)
+        results.append(row)
+    return results
+
+# SSO 사용자 상세(상태) 조회: 캐시 없음(cold) / 전부 캐시(warm) / 일부 사용자 변경 후
+def bench_sso_lookup(n_users=SSO_USERS, latency=SSO_LATENCY, n_changed=SSO_CHANGED):
+    account = SyntheticAccount(n_sgs=0, n_rtbs=0, n_vpce=0, n_users=n_users, n_groups=50)
+    row = {'bench': 'sso_lookup', 'users': n_users, 'latency_s': latency, 'workers': get_ssouser.LOOKUP_WORKERS}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_db = os.path.join(tmp, "lookup.db")
+        for label in ("cold", "warm", "changed"):
+            if label == "changed":
+                for user in account.users[:n_changed]:
+                    user['Revision'] += 1
+            session = SyntheticSession(account, latency=latency)
+            started = time.perf_counter()
+            get_ssouser.get_sso_user_data(catalog=ResourceCatalog(session), cache_db=cache_db)
+            row[f'{label}_s'] = round(time.perf_counter() - started, 2)
+            row[f'{label}_lookups'] = session.calls.get('identitystore.describe_user', 0)
+    return [row]
+
+# 권한 세트 할당 매트릭스: 동시 조회 스레드 수별 호출 수 / 시간 (1 = 순차 루프와 같은 호출 순서)
+def bench_permission_sets(scales, latency=SSO_LATENCY, worker_counts=PERMISSION_SET_WORKERS):
+    results = []
+    for scale in scales:
+        account = SyntheticAccount.scale(scale)
+        row = {'bench': 'permission_sets', 'scale': scale, 'latency_s': latency,
+               'accounts': SCALES[scale]['n_accounts'], 'permission_sets': SCALES[scale]['n_permission_sets'],
+               'pairs': len(account.assignments), 'wall_s': {}}
+        for workers in worker_counts:
+            session = SyntheticSession(account, latency=latency)
+            started = time.perf_counter()
+            df = get_permissionset.get_permission_set_data(catalog=ResourceCatalog(session), max_workers=workers)
+            row['wall_s'][workers] = round(time.perf_counter() - started, 2)
+            row['calls'] = dict(sorted(session.calls.items()))
+            row['rows'] = len(df)
+        results.append(row)
+    return results
+
+# -------------------------
+# TGW 라우트 검색 벤치 (합성 계정, 호출당 지연)
+# - 테이블별 search_transit_gateway_routes 동시 실행 워커 수별 소요 시간
+# - 허브 테이블(라우트 > MaxResults)은 범위 분할 검색 호출이 추가됨
+# -------------------------
+def bench_tgw_routes(scales, latency=TGW_LATENCY, worker_counts=TGW_WORKERS):
+    results = []
+    for scale in scales:
+        account = SyntheticAccount.scale(scale)
+        row = {'bench': 'tgw_routes', 'scale': scale, 'latency_s': latency,
+               'route_tables': len(account.tgw_route_tables), 'wall_s': {}}
+        for workers in worker_counts:
+            session = SyntheticSession(account, latency=latency)
+            started = time.perf_counter()
+            df = get_tgwroute.get_tgw_route_data(catalog=ResourceCatalog(session), max_workers=workers)
+            row['wall_s'][workers] = round(time.perf_counter() - started, 2)
+            row['calls'] = dict(sorted(session.calls.items()))
+            row['rows'] = len(df)
+        results.append(row)
+    return results
@@ -0,0 +1,243 @@
+import contextlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import collector
+import export
+import get_routetable
+import get_securitygroup
+import get_securitygroup2
+from merge_plan import plan_merges, write_planned
+from shard import render_sharded
+from sg_rules import RuleTable
+from synthetic import SyntheticAccount, SyntheticSession, synthetic_security_groups
+
+# ==========================================
+# 출력(엑셀/내보내기) 벤치 (합성 데이터)
+# - 병합 계획, SG 스트리밍 워크북, 룰 확장 엔진, CSV/JSONL/Parquet 내보내기, 샤드 병렬 저장
+# ==========================================
+DEFAULT_SIZES = [10_000, 100_000]
+SG_SIZES = [1_000, 4_000]
+RULE_SIZES = [10_000, 50_000]
+EXPORT_ROWS = [100_000]
+SHARD_ACCOUNTS = 8        # 샤드 렌더링 벤치의 합성 계정 수 (계정마다 seed 가 다른 데이터)
+SHARD_WORKER_COUNTS = [1, 2, 4, 8]
+SHARD_REPORTS = ["securitygroup", "routetable"]
+# ==========================================
+
+# 쓰기 호출만 세는 가짜 워크시트 (xlsxwriter 비용 제외, 병합 계산 비용만 측정)
+class NullSheet:
+    def __init__(self):
+        self.calls = 0
+
+    def merge_range(self, *args):
+        self.calls += 1
+
+    def write(self, *args):
+        self.calls += 1
+
+    def write_column(self, row, col, data, fmt=None):
+        self.calls += len(data)
+
+# 라우팅 테이블 리포트 형태의 정렬된 합성 프레임
+def synthetic_route_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    n_rtb = max(1, n_rows // 8)
+    rtb = np.sort(rng.integers(0, n_rtb, n_rows))
+    vpc = rtb // 20
+    df = pd.DataFrame({
+        'ACCOUNT': np.where(vpc % 4 == 0, 'DEV', 'PRD'),
+        'VPC Name': [f"vpc-name-{v}" for v in vpc],
+        'VPC ID': [f"vpc-{v:08x}" for v in vpc],
+        'Route Tables Name': [f"rtb-name-{r % 50}" for r in rtb],
+        'Route Tables ID': [f"rtb-{r:08x}" for r in rtb],
+        'Destination': [f"10.{i % 256}.{(i // 256) % 256}.0/24" for i in range(n_rows)],
+        'Target': np.where(rng.random(n_rows) < 0.1, 'local', 'tgw-0123456789'),
+    })
+    return df.sort_values(by=['ACCOUNT', 'VPC Name', 'Route Tables Name', 'Route Tables ID']).reset_index(drop=True)
+
+# 기존 방식 (셀 단위 df.iloc 루프) - 비교 기준
+def legacy_merge_write(worksheet, df, merge_cols, fmt=None):
+    for col in merge_cols:
+        start_row = 1
+        while start_row <= len(df):
+            end_row = start_row
+            current_val = df.iloc[start_row - 1, col]
+
+            while end_row < len(df) and df.iloc[end_row, col] == current_val:
+                end_row += 1
+
+            if end_row - start_row > 0:
+                worksheet.merge_range(start_row, col, end_row, col, current_val, fmt)
+            else:
+                worksheet.write(start_row, col, current_val, fmt)
+            start_row = end_row + 1
+
+    for r_idx in range(1, len(df) + 1):
+        for col in range(len(df.columns)):
+            if col not in merge_cols:
+                worksheet.write(r_idx, col, df.iloc[r_idx - 1, col], fmt)
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+def bench_merge_plan(sizes):
+    results = []
+    merge_cols = [0, 1, 2, 3, 4]
+    for n in sizes:
+        df = synthetic_route_frame(n)
+        before = timed(legacy_merge_write, NullSheet(), df, merge_cols)
+        after = timed(lambda: write_planned(NullSheet(), df, plan_merges(df, merge_cols), None))
+        results.append({
+            'bench': 'merge_plan',
+            'rows': n,
+            'legacy_s': round(before, 4),
+            'planned_s': round(after, 4),
+            'speedup': round(before / after, 1) if after else None,
+        })
+    return results
+
+# 함수 실행 중 tracemalloc 피크 (입력 데이터는 제외하고 실행 중 추가 할당만 측정)
+def peak_alloc(fn, *args):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return elapsed, peak
+
+# SG 스트리밍 writer: 셀 객체를 쌓지 않으므로 SG당 피크 증가분은 공유 문자열/병합 범위 정도
+# (셀 수에 비례하던 기존 일반 모드 워크북 대비 SG 수에 거의 평평)
+def bench_sg_stream(sizes):
+    results = []
+    for n in sizes:
+        vpc_map, sgs = synthetic_security_groups(n)
+        for name, save in (("side_by_side", get_securitygroup.save_side_by_side),
+                           ("centered", get_securitygroup2.save_centered)):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "sg.xlsx")
+                elapsed, peak = peak_alloc(save, [("SecurityGroups", vpc_map, sgs)], path)
+            results.append({
+                'bench': f'sg_stream_{name}',
+                'security_groups': n,
+                'write_s': round(elapsed, 3),
+                'peak_mb': round(peak / 1e6, 2),
+                'peak_bytes_per_sg': round(peak / n),
+            })
+    return results
+
+# 기존 방식 룰 확장 (행마다 튜플/f-string 생성) - 비교 기준
+def legacy_expand_rules(perms, sg_name_by_id):
+    out = []
+    for p in (perms or []):
+        proto = p.get("IpProtocol", "-1")
+        proto = "all" if proto == "-1" else str(proto)
+        fp, tp = p.get("FromPort"), p.get("ToPort")
+        pr = "-" if fp is None or tp is None else (str(fp) if fp == tp else f"{fp}-{tp}")
+        src_items = []
+        for r in (p.get("IpRanges") or []):
+            if r.get("CidrIp"):
+                src_items.append((r.get("CidrIp"), r.get("Description") or "-"))
+        for r in (p.get("Ipv6Ranges") or []):
+            if r.get("CidrIpv6"):
+                src_items.append((r.get("CidrIpv6"), r.get("Description") or "-"))
+        for g in (p.get("UserIdGroupPairs") or []):
+            gid = g.get("GroupId")
+            if gid:
+                src_items.append((f"{gid}({sg_name_by_id.get(gid, gid)})", g.get("Description") or "-"))
+        for pl in (p.get("PrefixListIds") or []):
+            if pl.get("PrefixListId"):
+                src_items.append((pl.get("PrefixListId"), pl.get("Description") or "-"))
+        if not src_items:
+            out.append((proto, pr, "-", "-"))
+        else:
+            for src, remark in src_items:
+                out.append((proto, pr, src, remark))
+    return out or [("-", "-", "-", "-")]
+
+def legacy_expand_all(vpc_map, sgs):
+    names = get_securitygroup.build_sg_name_map(sgs)
+    return [(legacy_expand_rules(sg.get("IpPermissions"), names),
+             legacy_expand_rules(sg.get("IpPermissionsEgress"), names)) for sg in sgs]
+
+# 전체 SG 룰 확장 결과를 메모리에 보관할 때의 할당 피크 / 보관 크기 (기존 튜플 목록 vs 컬럼형 RuleTable)
+def bench_rule_engine(sizes):
+    results = []
+    for n in sizes:
+        vpc_map, sgs = synthetic_security_groups(n)
+        row = {'bench': 'sg_rule_engine', 'security_groups': n}
+        for name, build in (("legacy", legacy_expand_all),
+                            ("table", lambda v, s: RuleTable.build(v, s, "side_by_side"))):
+            tracemalloc.start()
+            started = time.perf_counter()
+            kept = build(vpc_map, sgs)
+            elapsed = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            row[f'{name}_s'] = round(elapsed, 3)
+            row[f'{name}_retained_mb'] = round(current / 1e6, 2)
+            row[f'{name}_peak_mb'] = round(peak / 1e6, 2)
+            if name == "table":
+                row.update(kept.stats())
+            del kept
+        results.append(row)
+    return results
+
+# 스타일 엑셀 vs 기계 처리용 출력 (라우팅 테이블 프레임 / SG 비정규화 행)
+def bench_export(sizes):
+    results = []
+    for n in sizes:
+        df = synthetic_route_frame(n)
+        vpc_map, sgs = synthetic_security_groups(max(1, n // 15))
+        sheets = [("BENCH", vpc_map, sgs)]
+        with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull):
+            row = {'bench': 'export', 'route_rows': n, 'security_groups': len(sgs)}
+            row['routetable_xlsx_s'] = round(timed(get_routetable.save_with_merging_centered, df,
+                                                   os.path.join(tmp, "rt.xlsx")), 3)
+            row['sg_xlsx_s'] = round(timed(get_securitygroup.save_side_by_side, sheets,
+                                           os.path.join(tmp, "sg.xlsx")), 3)
+            for fmt in export.FORMATS[1:]:
+                row[f'routetable_{fmt}_s'] = round(timed(export.export_frame, df, os.path.join(tmp, f"rt.{fmt}"),
+                                                         fmt, "routetable"), 3)
+                row[f'sg_{fmt}_s'] = round(timed(export.export_sg, sheets, os.path.join(tmp, f"sg.{fmt}"), fmt), 3)
+                row[f'routetable_{fmt}_speedup'] = round(row['routetable_xlsx_s'] / row[f'routetable_{fmt}_s'], 1)
+                row[f'sg_{fmt}_speedup'] = round(row['sg_xlsx_s'] / row[f'sg_{fmt}_s'], 1)
+        results.append(row)
+    return results
+
+# 단일 워크북 저장 vs 계정 단위 샤드 병렬 저장 (워커 수별)
+# - 워커 수가 코어 수보다 많으면 빨라지지 않음 (cpus 같이 기록)
+def bench_shard_render(scales, n_accounts=SHARD_ACCOUNTS, worker_counts=SHARD_WORKER_COUNTS):
+    results = []
+    for scale in scales:
+        accounts = {f"acct{i}": SyntheticAccount.scale(scale, seed=i) for i in range(n_accounts)}
+        targets = [(profile, "ap-northeast-2", profile.upper()) for profile in accounts]
+        titles = collector.sheet_titles(targets)
+        collected = collector.collect_reports(
+            targets, SHARD_REPORTS,
+            session_factory=lambda profile_name=None, region_name=None: SyntheticSession(accounts[profile_name]))
+        for name in SHARD_REPORTS:
+            row = {'bench': f'shard_{name}', 'scale': scale, 'accounts': n_accounts, 'cpus': os.cpu_count()}
+            with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, \
+                    contextlib.redirect_stdout(devnull):
+                row['single_workbook_s'] = round(timed(collector.save_excel, name, titles, collected[name],
+                                                       os.path.join(tmp, f"{name}.xlsx")), 2)
+                row['sharded_s'] = {}
+                for workers in worker_counts:
+                    out = os.path.join(tmp, f"{name}_{workers}.zip")
+                    row['sharded_s'][workers] = round(timed(
+                        lambda: render_sharded(name, titles, collected[name], out, workers=workers)), 2)
+            row['speedup'] = {w: round(row['single_workbook_s'] / s, 2) for w, s in row['sharded_s'].items()}
+            results.append(row)
+    return results
@@ -0,0 +1,97 @@
+import ipaddress
+import time
+
+import numpy as np
+
+from route_lookup import RouteIndex
+from sg_reach import ReachabilityIndex, normalize_protocol
+from sg_rules import perm_sources
+from synthetic import SyntheticAccount
+
+# ==========================================
+# 조회 벤치 (합성 계정)
+# - 라우트 LPM 조회, SG 도달성 인덱스 조회 (선형 스캔 대비 지연)
+# ==========================================
+LOOKUP_COUNT = 100_000
+REACH_QUERIES = 10_000
+REACH_SCAN_QUERIES = 20   # 선형 스캔 기준값은 느려서 일부 질의만
+# ==========================================
+
+# 라우트 LPM 조회: 합성 계정 라우팅 테이블 컴파일 시간 + 서브넷별 일괄 조회 처리량
+def bench_route_lookup(scales, n_lookups=LOOKUP_COUNT, seed=0):
+    results = []
+    rng = np.random.default_rng(seed)
+    for scale in scales:
+        account = SyntheticAccount.scale(scale)
+        started = time.perf_counter()
+        index = RouteIndex(account.route_tables, account.subnets)
+        build = time.perf_counter() - started
+        subnets = [s['SubnetId'] for s in account.subnets]
+        ips = [f"{a}.{b}.{c}.{d}" for a, b, c, d in rng.integers(0, 256, (n_lookups, 4)).tolist()]
+        per_subnet = max(1, n_lookups // len(subnets))
+        started = time.perf_counter()
+        for i in range(0, n_lookups, per_subnet):
+            index.lookup_many(subnets[(i // per_subnet) % len(subnets)], ips[i:i + per_subnet])
+        elapsed = time.perf_counter() - started
+        results.append({
+            'bench': 'route_lookup', 'scale': scale,
+            'route_tables': len(account.route_tables),
+            'routes': sum(len(r['Routes']) for r in account.route_tables),
+            'build_s': round(build, 3),
+            'lookups': n_lookups,
+            'lookups_per_s': round(n_lookups / elapsed),
+        })
+    return results
+
+# 인덱스 없이 전체 룰을 훑는 도달성 조회 (inbound, contains, 직접 일치만) - 지연 비교 기준
+# (결과 일치 검증은 test_sg_reach.py)
+def linear_reach(sgs, proto, port, source):
+    query = ipaddress.ip_network(source, strict=False)
+    hits = 0
+    for sg in sgs:
+        for p in sg.get('IpPermissions') or []:
+            rule_proto = normalize_protocol(p.get('IpProtocol', '-1'))
+            if rule_proto != 'all' and (rule_proto != proto or not (p.get('FromPort', -1) <= port <= p.get('ToPort', -1))):
+                continue
+            for kind, value, _ in perm_sources(p):
+                if kind == 'cidr':
+                    net = ipaddress.ip_network(value, strict=False)
+                    hits += net.version == query.version and query.subnet_of(net)
+    return hits
+
+def bench_reachability(scales, n_queries=REACH_QUERIES, seed=0):
+    results = []
+    rng = np.random.default_rng(seed)
+    for scale in scales:
+        account = SyntheticAccount.scale(scale)
+        sgs = account.security_groups
+        started = time.perf_counter()
+        index = ReachabilityIndex(sgs)
+        build = time.perf_counter() - started
+        ports = rng.choice([22, 80, 443, 3306, 5432, 8080], n_queries).tolist()
+        # 합성 SG 소스(10.x.j.0/24)와 겹치는 /16, /24, /28 질의
+        sources = [f"10.{a}.0.0/16" if m == 16 else f"10.{a}.{b}.0/{m}" for a, b, m in
+                   zip(rng.integers(0, 256, n_queries).tolist(), rng.integers(0, 4, n_queries).tolist(),
+                       rng.choice([16, 24, 28], n_queries).tolist())]
+        timings, hits = [], 0
+        for port, source in zip(ports, sources):
+            started = time.perf_counter()
+            hits += len(index.query("tcp", port, source))
+            timings.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for port, source in zip(ports[:REACH_SCAN_QUERIES], sources[:REACH_SCAN_QUERIES]):
+            linear_reach(sgs, "tcp", port, source)
+        scan = (time.perf_counter() - started) / REACH_SCAN_QUERIES
+        timings.sort()
+        results.append({
+            'bench': 'sg_reachability', 'scale': scale,
+            'security_groups': len(sgs),
+            'rule_rows': len(index.rules),
+            'build_s': round(build, 3),
+            'queries': n_queries,
+            'avg_matches': round(hits / n_queries, 1),
+            'query_p50_ms': round(timings[len(timings) // 2] * 1e3, 4),
+            'query_p99_ms': round(timings[int(len(timings) * 0.99)] * 1e3, 4),
+            'linear_scan_ms': round(scan * 1e3, 2),
+        })
+    return results
@@ -0,0 +1,88 @@
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from service import Inventory, Service, make_server
+from synthetic import SyntheticAccount, session_factory
+
+# ==========================================
+# 상주 서비스 / CLI 시작 시간 벤치
+# ==========================================
+STARTUP_RUNS = 5
+# ==========================================
+
+# -------------------------
+# 상주 서비스 벤치 (합성 계정, 로컬 HTTP)
+# - load_s: 인벤토리 최초 적재, 이후 요청별 첫 응답(miss)과 캐시 응답(hit) 지연 (ms, HTTP 왕복 포함)
+# -------------------------
+def service_paths(account):
+    subnet = account.subnets[0]['SubnetId']
+    return {
+        'report_securitygroup_csv': "/reports/securitygroup?format=csv",
+        'report_routetable_xlsx': "/reports/routetable",
+        'query_sg': "/query/sg?protocol=tcp&port=5432&source=10.20.0.0/16&match=overlaps",
+        'query_route': f"/query/route?source={subnet}&dest=8.8.8.8,10.0.0.1",
+        'inventory_sg': f"/inventory/security_groups?id={account.security_groups[0]['GroupId']}",
+    }
+
+def _bench_service_scale(scale, latency):
+    account = SyntheticAccount.scale(scale)
+    inventory = Inventory([("bench", "ap-northeast-2", "BENCH")], session_factory(account, latency=latency),
+                          throttle=False)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        inventory.start()
+    row = {'bench': 'service', 'scale': scale, 'latency_s': latency,
+           'load_s': round(time.perf_counter() - started, 3)}
+    server = make_server(Service(inventory), port=0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for name, path in service_paths(account).items():
+            for attempt in ("miss", "hit"):
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(open(os.devnull, "w")), urllib.request.urlopen(base + path) as r:
+                    r.read()
+                row[f'{name}_{attempt}_ms'] = round((time.perf_counter() - started) * 1e3, 2)
+    finally:
+        server.shutdown()
+        server.server_close()
+        inventory.stop()
+    return row
+
+def bench_service(scales, latency=0.0):
+    return [_bench_service_scale(scale, latency) for scale in scales]
+
+# -------------------------
+# CLI 시작 시간 벤치 (새 프로세스, 중앙값 ms)
+# - help: aws_resource.py --help 전체 실행 시간
+# - import_<명령>: 명령 실행 전 로딩 (aws_resource.load) 시간
+# - import_all_reports: 모든 리포트 모듈 + boto3 를 한 번에 import (명령 구분 없이 전부 로딩하던 방식)
+# -------------------------
+def _median_ms(args, runs=STARTUP_RUNS, parse=False):
+    here = os.path.dirname(os.path.abspath(__file__))
+    values = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable] + args, cwd=here, capture_output=True, text=True, check=True).stdout
+        values.append(float(out.strip().splitlines()[-1]) if parse else (time.perf_counter() - started) * 1e3)
+    return round(statistics.median(values), 1)
+
+def bench_startup(runs=STARTUP_RUNS):
+    import aws_resource
+    timer = "import time; s = time.perf_counter(); {}; print((time.perf_counter() - s) * 1e3)"
+    row = {'bench': 'startup',
+           'python_ms': _median_ms(["-c", "pass"], runs),
+           'help_ms': _median_ms(["aws_resource.py", "--help"], runs)}
+    for command in list(aws_resource.REPORT_HELP) + ["all", "serve", "route", "reach"]:
+        code = timer.format(f"import aws_resource; aws_resource.load({command!r})")
+        row[f'import_{command}_ms'] = _median_ms(["-c", code], runs, parse=True)
+    modules = ("boto3, get_routetable, get_tgwroute, get_securitygroup, get_securitygroup2, get_vpcendpoint, "
+               "get_ssouser")
+    row['import_all_reports_ms'] = _median_ms(["-c", timer.format(f"import {modules}")], runs, parse=True)
+    return [row]
@@ -0,0 +1,70 @@
+import argparse
+import json
+
+from bench_collect import (PIPELINE_LATENCY, SUITE_REPORTS, bench_permission_sets, bench_pipeline, bench_sso_lookup,
+                           bench_suite, bench_tgw_routes)
+from bench_excel import (DEFAULT_SIZES, EXPORT_ROWS, RULE_SIZES, SG_SIZES, bench_export, bench_merge_plan,
+                         bench_rule_engine, bench_sg_stream, bench_shard_render)
+from bench_query import bench_reachability, bench_route_lookup
+from bench_service import bench_service, bench_startup
+from synthetic import SCALES
+
+# ==========================================
+# 벤치마크 (합성 데이터)
+# - 실행: python benchmark.py [행 수 ...] [--suite small,medium] [-o result.json]
+# - 결과는 JSON 으로 stdout (또는 -o 파일) 출력
+# - 영역별 벤치: bench_excel (출력) / bench_collect (API 수집) / bench_query (조회) / bench_service (서비스/시작)
+#   정확성 검증은 벤치가 아니라 test_*.py 에서
+# ==========================================
+SUITE_SCALES = ["small"]   # 합성 계정 전체 리포트 벤치 기본 규모 (synthetic.SCALES)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 데이터 벤치마크")
+    parser.add_argument("sizes", nargs="*", type=int, help="병합 계획 벤치 행 수")
+    parser.add_argument("--suite", default=",".join(SUITE_SCALES),
+                        help=f"합성 계정 규모 (쉼표 구분, {'/'.join(SCALES)}, 빈 값이면 생략)")
+    parser.add_argument("--reports", help=f"suite 대상 리포트 (쉼표 구분, 기본 전체: {','.join(SUITE_REPORTS)})")
+    parser.add_argument("--latency", type=float, default=0.0, help="합성 API 호출당 지연 (초)")
+    parser.add_argument("--throttle-rate", type=float, help="합성 API별 초당 허용 호출 수 (초과 시 스로틀 오류)")
+    parser.add_argument("--skip-micro", action="store_true", help="merge_plan / sg_stream / sg_rule_engine 벤치 생략")
+    parser.add_argument("--export", action="store_true", help="엑셀 vs CSV/JSONL/Parquet 출력 벤치")
+    parser.add_argument("--pipeline", action="store_true", help="수집/저장 파이프라인 벤치 (suite 규모, 호출당 지연 포함)")
+    parser.add_argument("--service", action="store_true", help="상주 서비스 요청 지연 벤치 (suite 규모)")
+    parser.add_argument("--startup", action="store_true", help="CLI 시작/import 시간 벤치")
+    parser.add_argument("--sso", action="store_true",
+                        help="SSO 사용자 상태 조회 캐시 벤치 (cold/warm) + 권한 세트 매트릭스 동시 조회 벤치 (suite 규모)")
+    parser.add_argument("--shard", action="store_true", help="샤드 병렬 엑셀 저장 벤치 (suite 규모, 다계정)")
+    parser.add_argument("--tgw", action="store_true", help="TGW 라우트 검색 동시 조회 벤치 (suite 규모)")
+    parser.add_argument("-o", "--output", help="JSON 결과 파일")
+    args = parser.parse_args()
+
+    results = []
+    if not args.skip_micro:
+        results += bench_merge_plan(args.sizes or DEFAULT_SIZES) + bench_sg_stream(SG_SIZES) + bench_rule_engine(RULE_SIZES)
+    if args.export:
+        results += bench_export(EXPORT_ROWS)
+    if args.startup:
+        results += bench_startup()
+    if args.sso:
+        results += bench_sso_lookup()
+    scales = [s for s in args.suite.split(",") if s]
+    if scales:
+        reports = args.reports.split(",") if args.reports else None
+        results += bench_suite(scales, reports, args.latency, args.throttle_rate)
+        results += bench_route_lookup(scales) + bench_reachability(scales)
+        if args.pipeline:
+            results += bench_pipeline(scales, args.latency or PIPELINE_LATENCY)
+        if args.service:
+            results += bench_service(scales, args.latency)
+        if args.shard:
+            results += bench_shard_render(scales)
+        if args.sso:
+            results += bench_permission_sets(scales)
+        if args.tgw:
+            results += bench_tgw_routes(scales)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
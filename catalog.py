@@ -0,0 +1,179 @@
+import threading
+
+from instrument import PROFILER
+from pipeline import prefetch
+from prefix_lists import PrefixListResolver
+from resources import iter_pages, iter_resources, name_map, tag_name
+from scope import FILTER_VALUE_LIMIT, ID_FILTERS, scope_params
+
+# 리소스 항목에서 파생된 캐시 (refresh 시 함께 버림)
+DERIVED_KEYS = {
+    "vpcs": ("vpc_map",),
+    "subnets": ("subnet_names",),
+    "security_groups": ("sg_name_by_id", "sg_tag_names"),
+}
+
+# ==========================================
+# 리소스 카탈로그 (계정/리전 1개 단위)
+# - 리소스 유형별 describe 는 카탈로그당 한 번만 호출하고 결과를 공유
+# - ID -> Name 인덱스(vpc_map, SG 이름, 서브넷 이름)도 한 번만 생성
+# - 여러 리포트가 스레드풀에서 동시에 요청해도 같은 키는 한 스레드만 조회
+# - scope(scope.Scope) 지정 시 describe_* 에 EC2 Filters 를 붙여 범위 안의 리소스만 조회하고,
+#   서브넷/SG 이름 같은 마스터 데이터는 리포트가 참조한 ID 만 조회
+# - expand_prefix_lists=True 면 리포트가 pl-xxxx 대신 CIDR(목록 이름)으로 표기 (prefix_lists.py)
+# - cache_db 지정 시 리포트의 항목별 조회 결과(SSO 사용자 상세 등)를 LookupCache 로 실행 간 재사용
+#   (--snapshot 을 준 실행만 스냅샷 DB 경로가 들어옴, 기본 None 이면 파일을 만들지 않음)
+# ==========================================
+class ResourceCatalog:
+    def __init__(self, session, scope=None, expand_prefix_lists=False, cache_db=None):
+        # 계측이 켜져 있으면 세션에 botocore 이벤트 훅 등록 (꺼져 있으면 그대로 반환)
+        self.session = PROFILER.attach(session)
+        self.scope = scope or None
+        self.expand_prefix_lists = expand_prefix_lists
+        self.cache_db = cache_db
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._data = {}
+        self._loading = {}
+        self._by_id = {}
+
+    # 서비스별 client (boto3 session은 스레드 안전하지 않으므로 생성은 잠금 안에서)
+    def client(self, service):
+        with self._lock:
+            if service not in self._clients:
+                self._clients[service] = self.session.client(service)
+            return self._clients[service]
+
+    def _cached(self, key, loader):
+        with self._lock:
+            if key in self._data:
+                return self._data[key]
+            lock = self._loading.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                if key in self._data:
+                    return self._data[key]
+            value = loader()
+            with self._lock:
+                self._data[key] = value
+            return value
+
+    def _load(self, resource):
+        return list(iter_resources(self.client("ec2"), resource, **scope_params(self.scope, resource)))
+
+    # 리소스 전체 목록 (범위 지정 시 범위 안의 목록, 최초 1회 조회 후 재사용)
+    def resources(self, resource):
+        return self._cached(resource, lambda: self._load(resource))
+
+    # 리소스 외 항목 캐시 (예: 서비스 모드의 리포트 단위 결과)
+    def cached(self, key, loader):
+        return self._cached(key, loader)
+
+    # 캐시 항목 버림 (다음 사용 때 다시 조회)
+    def forget(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    # 캐시에 있으면 값, 없으면 None (조회하지 않음)
+    def peek(self, key):
+        with self._lock:
+            return self._data.get(key)
+
+    # -------------------------
+    # 항목 다시 조회 후 교체 (서비스 모드 주기 갱신)
+    # - 조회는 잠금 밖에서 진행 → 조회 중에도 다른 스레드는 기존 값으로 리포트 생성
+    # - 교체 시 파생 캐시(이름 맵, ID 캐시)도 버려 다음 사용 때 새 값으로 다시 만듦
+    # - loader 미지정 시 EC2 리소스 목록 조회
+    # 반환: (이전 값 또는 None, 새 값)
+    # -------------------------
+    def refresh(self, key, loader=None):
+        value = loader() if loader else self._load(key)
+        with self._lock:
+            previous = self._data.get(key)
+            self._data[key] = value
+            for derived in DERIVED_KEYS.get(key, ()):
+                self._data.pop(derived, None)
+            self._by_id.pop(key, None)
+        return previous, value
+
+    # 한 리포트만 쓰는 리소스는 캐시에 있으면 재사용, 없으면 페이지 단위로 흘려보냄
+    # - 다음 페이지 조회는 백그라운드에서 미리 진행 (리포트의 행 변환과 네트워크 대기가 겹침)
+    def stream(self, resource):
+        cached = self.peek(resource)
+        if cached is not None:
+            return iter(cached)
+        pages = iter_pages(self.client("ec2"), resource, **scope_params(self.scope, resource))
+        return (item for page in prefetch(pages) for item in page)
+
+    # -------------------------
+    # 참조된 ID 만 조회 (범위 지정 시 마스터 데이터 축소용)
+    # - 범위가 없으면 전체 목록 캐시에서 골라냄 (다른 리포트와 조회 공유)
+    # - 범위가 있으면 아직 받지 않은 ID 만 ID 필터(200개 단위)로 조회해 ID별로 캐시
+    # -------------------------
+    def lookup(self, resource, ids):
+        filter_name, id_key = ID_FILTERS[resource]
+        wanted = {i for i in ids if i}
+        if self.scope is None:
+            return [item for item in self.resources(resource) if item[id_key] in wanted]
+
+        with self._lock:
+            known = self._by_id.setdefault(resource, {})
+            missing = sorted(wanted - known.keys())
+        for i in range(0, len(missing), FILTER_VALUE_LIMIT):
+            chunk = missing[i:i + FILTER_VALUE_LIMIT]
+            found = {item[id_key]: item for item in iter_resources(
+                self.client("ec2"), resource, Filters=[{'Name': filter_name, 'Values': chunk}])}
+            with self._lock:
+                known.update(found)
+        with self._lock:
+            return [known[i] for i in sorted(wanted) if i in known]
+
+    def vpcs(self):
+        return self.resources("vpcs")
+
+    def subnets(self):
+        return self.resources("subnets")
+
+    def security_groups(self):
+        return self.resources("security_groups")
+
+    # VPC ID -> Name 태그 (없으면 ID)
+    def vpc_map(self):
+        return self._cached("vpc_map", lambda: name_map(self.vpcs(), "VpcId"))
+
+    # Subnet ID -> Name 태그 (없으면 ID)
+    # - ids 지정 + 범위 지정 시 참조된 서브넷만 조회
+    def subnet_names(self, ids=None):
+        if ids is not None and self.scope is not None:
+            return name_map(self.lookup("subnets", ids), "SubnetId")
+        return self._cached("subnet_names", lambda: name_map(self.subnets(), "SubnetId"))
+
+    # SG ID -> GroupName (SG 참조 표기용)
+    # - 범위 지정 시 범위 안 SG + 룰에서 참조하는 범위 밖 SG (ID 로 추가 조회)
+    def sg_name_by_id(self):
+        def load():
+            sgs = self.security_groups()
+            if self.scope is not None:
+                have = {sg["GroupId"] for sg in sgs}
+                refs = {pair.get("GroupId") for sg in sgs
+                        for key in ("IpPermissions", "IpPermissionsEgress") for perm in sg.get(key) or []
+                        for pair in perm.get("UserIdGroupPairs") or []}
+                sgs = list(sgs) + self.lookup("security_groups", refs - have)
+            return {sg["GroupId"]: sg.get("GroupName") or sg["GroupId"] for sg in sgs}
+        return self._cached("sg_name_by_id", load)
+
+    # SG ID -> Name 태그 (VPC 엔드포인트 리포트 표기용)
+    # - ids 지정 + 범위 지정 시 참조된 SG만 조회 (SG 범위 필터와 무관하게 ID 로 조회)
+    def sg_tag_names(self, ids=None):
+        if ids is not None and self.scope is not None:
+            return {sg["GroupId"]: tag_name(sg, sg["GroupId"]) for sg in self.lookup("security_groups", ids)}
+        return self._cached("sg_tag_names", lambda: {
+            sg["GroupId"]: tag_name(sg, sg["GroupId"]) for sg in self.security_groups()})
+
+    # PrefixListId -> prefix_lists.PrefixList (펼치기 모드가 아니면 None → 리포트는 ID 그대로 표기)
+    # - 카탈로그당 resolver 1개: 리포트가 몇 개든 같은 ID 는 실행당 한 번만 조회
+    def prefix_lists(self, ids):
+        if not self.expand_prefix_lists:
+            return None
+        return self._cached("prefix_list_resolver", lambda: PrefixListResolver(self)).resolve(ids)
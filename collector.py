@@ -0,0 +1,310 @@
+import importlib
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import export
+from catalog import ResourceCatalog
+from instrument import PROFILER
+from pipeline import Stage
+from prefix_lists import sg_prefix_list_ids
+from snapshot import SnapshotSession
+from throttle import RequestScheduler, ScheduledSession
+
+# ==========================================
+# 1. 설정 (수집 대상 계정/리전 및 동시성)
+# ==========================================
+# (Profile, Region, ACCOUNT 라벨) - 라벨은 리포트의 ACCOUNT 컬럼 / 시트명으로 사용
+TARGETS = [
+    ("default", "ap-northeast-2", "DEV"),
+]
+MAX_WORKERS = 16
+THROTTLE = True   # 대상별 API 스케줄러(토큰 버킷 + AIMD + 지터 재시도) 사용
+PIPELINE = True   # 리포트별 수집이 끝나는 대로 저장 (수집과 엑셀 저장을 겹침)
+FORMATS = ("xlsx",)   # 출력 형식: xlsx / csv / jsonl / parquet (export.FORMATS)
+EXPAND_PREFIX_LISTS = False   # SG 소스 / 라우트 목적지의 pl-xxxx 를 CIDR(목록 이름)으로 펼침 (prefix_lists.py)
+SHARD_BY = None   # xlsx 샤드 병렬 저장: None / "account" / "vpc" (shard.py, 샤드별 워크북 zip)
+# ==========================================
+
+Target = namedtuple("Target", ["profile", "region", "label"])
+
+# -------------------------
+# 대상 파싱
+# - ("profile", "region", "label") 튜플 또는 "profile:region[:label]" 문자열
+# - 라벨 생략 시 profile 이름 사용
+# -------------------------
+def parse_targets(specs):
+    targets = []
+    for spec in specs:
+        if isinstance(spec, Target):
+            targets.append(spec)
+            continue
+        parts = spec.split(":") if isinstance(spec, str) else list(spec)
+        if len(parts) not in (2, 3):
+            raise ValueError(f"잘못된 대상 형식: {spec!r} (profile:region[:label])")
+        profile, region = parts[0], parts[1]
+        label = parts[2] if len(parts) == 3 else profile
+        targets.append(Target(profile, region, label))
+    return targets
+
+# -------------------------
+# 세션 캐시
+# - boto3.Session 은 스레드 안전하지 않음 → 세션 생성/사용은 (호출 스레드, profile, region) 단위로 재사용
+# - 수집 시에는 대상마다 세션 1개로 ResourceCatalog 를 만들고, client 생성은 카탈로그 잠금 안에서만 진행
+#   만들어진 client 는 스레드 안전하므로 워커 풀의 리포트들이 공유 (boto3 문서의 권장 방식)
+# - session_factory는 테스트에서 Stubber 기반 가짜 세션으로 교체 가능
+# -------------------------
+_local = threading.local()
+
+def get_session(target, session_factory=None):
+    if session_factory is None:
+        import boto3   # 스냅샷 재생/합성 세션만 쓰는 실행은 boto3 로딩 생략
+        session_factory = boto3.Session
+    cache = getattr(_local, "sessions", None)
+    if cache is None:
+        cache = _local.sessions = {}
+    key = (id(session_factory), target.profile, target.region)
+    if key not in cache:
+        cache[key] = session_factory(profile_name=target.profile, region_name=target.region)
+    return cache[key]
+
+# -------------------------
+# 스냅샷 경유 세션
+# - snapshot(SnapshotStore) 지정 시 응답을 저장/재사용
+# - replay 모드는 boto3 세션을 만들지 않음 (자격증명 없이 캐시만으로 렌더링)
+# - scheduler 지정 시 실제 AWS 호출만 스케줄러 경유 (캐시 적중은 제한 없음)
+# -------------------------
+def open_session(target, session_factory=None, snapshot=None, mode="auto", scheduler=None):
+    base = None
+    if snapshot is None or mode != "replay":
+        base = get_session(target, session_factory)
+        if scheduler is not None:
+            base = ScheduledSession(base, scheduler)
+    if snapshot is None:
+        return base
+    return SnapshotSession(snapshot, target.label, target.region, base=base, mode=mode)
+
+# 시트명 (엑셀 31자 제한, 같은 라벨이 여러 리전에 있으면 리전 붙임)
+def sheet_titles(targets):
+    targets = parse_targets(targets)
+    labels = [t.label for t in targets]
+    titles = []
+    for t in targets:
+        title = t.label if labels.count(t.label) == 1 else f"{t.label}-{t.region}"
+        titles.append(title[:31])
+    return titles
+
+# SG 리포트 결과: (vpc_map, sgs) + 범위 조회면 범위 밖 참조 SG 이름 맵 + 펼치기 모드면 prefix list
+def sg_report(module, catalog):
+    data = module.get_sg_data(catalog=catalog)
+    ref_names = catalog.sg_name_by_id() if catalog.scope else None
+    if catalog.expand_prefix_lists:
+        return data + (ref_names, catalog.prefix_lists(sg_prefix_list_ids(data[1])))
+    return data + (ref_names,) if ref_names is not None else data
+
+# -------------------------
+# 리포트 모듈 (처음 쓸 때 import)
+# - 리포트 하나만 실행하면 다른 리포트의 pandas / openpyxl 로딩을 건너뜀
+# (모듈명, 기본 출력 파일 속성)
+# -------------------------
+REPORT_MODULES = {
+    "routetable": ("get_routetable", "OUTPUT_FILE"),
+    "tgwroute": ("get_tgwroute", "OUTPUT_FILE"),
+    "vpcendpoint": ("get_vpcendpoint", "OUTPUT_FILE"),
+    "ssouser": ("get_ssouser", "OUTPUT_FILE"),
+    "permissionset": ("get_permissionset", "OUTPUT_FILE"),
+    "securitygroup": ("get_securitygroup", "OUTFILE"),
+    "securitygroup2": ("get_securitygroup2", "OUTFILE"),
+}
+
+def report_module(name):
+    return importlib.import_module(REPORT_MODULES[name][0])
+
+def report_file(name):
+    return getattr(report_module(name), REPORT_MODULES[name][1])
+
+# -------------------------
+# 리포트별 수집 함수 (catalog, target) -> 결과
+# -------------------------
+REPORTS = {
+    "routetable": lambda c, t: report_module("routetable").get_full_data(account_label=t.label, catalog=c),
+    "tgwroute": lambda c, t: report_module("tgwroute").get_tgw_route_data(account_label=t.label, catalog=c),
+    "vpcendpoint": lambda c, t: report_module("vpcendpoint").get_vpce_data_with_ip(account_label=t.label, catalog=c),
+    "ssouser": lambda c, t: report_module("ssouser").get_sso_user_data(account_label=t.label, catalog=c),
+    "permissionset": lambda c, t: report_module("permissionset").get_permission_set_data(account_label=t.label,
+                                                                                          catalog=c),
+    "securitygroup": lambda c, t: sg_report(report_module("securitygroup"), c),
+    "securitygroup2": lambda c, t: sg_report(report_module("securitygroup2"), c),
+}
+
+# -------------------------
+# 전체 리포트 수집
+# - 대상마다 카탈로그 1개: VPC/SG/서브넷 등은 리포트가 몇 개든 대상당 한 번만 조회
+# - (대상 x 리포트) 조합을 하나의 풀에 펼쳐 describe 호출을 동시에 진행
+# - scope(scope.Scope) 지정 시 모든 대상에 같은 범위 필터 적용
+# 반환: {리포트명: [대상별 결과, ...]}
+# -------------------------
+def collect_reports(targets, reports=None, max_workers=MAX_WORKERS, session_factory=None, snapshot=None, mode="auto",
+                    schedulers=None, scope=None, expand_prefix_lists=EXPAND_PREFIX_LISTS):
+    targets = parse_targets(targets)
+    reports = list(reports or REPORTS)
+    schedulers = schedulers or {}
+    catalogs = {t: ResourceCatalog(open_session(t, session_factory, snapshot, mode, schedulers.get(t)), scope,
+                                   expand_prefix_lists, snapshot.path if snapshot else None)
+                for t in targets}
+    jobs = [(name, t) for name in reports for t in targets]
+
+    def run(job):
+        name, target = job
+        with PROFILER.span("collect", report=name, target=target.label):
+            return REPORTS[name](catalogs[target], target)
+
+    workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, jobs))
+
+    merged = {name: [] for name in reports}
+    for (name, _), result in zip(jobs, results):
+        merged[name].append(result)
+    return merged
+
+# DataFrame 결과 병합 (대상 순서대로 이어 붙임, 실패/빈 결과는 제외)
+def concat_frames(frames):
+    import pandas as pd   # DataFrame 리포트에서만 필요 (SG 리포트만 실행하면 로딩 생략)
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+# 리포트 1개 저장 (results: 대상 순서대로의 수집 결과)
+# - formats: "xlsx"(스타일 적용 엑셀) / "csv" / "jsonl" / "parquet" (병합 없는 비정규화 행)
+# - shard_by: xlsx 를 계정/VPC 단위 워크북으로 나눠 프로세스 풀에서 저장 (기본 파일명의 .zip)
+def save_report(name, titles, results, formats=FORMATS, shard_by=SHARD_BY):
+    for fmt in formats:
+        with PROFILER.span("write", report=name, format=fmt):
+            write_report(name, titles, results, fmt, shard_by=shard_by)
+
+# 리포트 1개를 형식 1개로 저장 (path 미지정 시 기본 파일명, 결과가 비면 파일을 만들지 않음)
+def write_report(name, titles, results, fmt, path=None, shard_by=None):
+    if fmt == "xlsx" and shard_by:
+        import shard
+        shard.render_sharded(name, titles, results, export.export_path(path or report_file(name), "zip"), shard_by)
+    elif fmt == "xlsx":
+        save_excel(name, titles, results, path)
+    elif name in ("securitygroup", "securitygroup2"):
+        sheets = [(title, *data) for title, data in zip(titles, results)]
+        dialect = "side_by_side" if name == "securitygroup" else "centered"
+        export.export_sg(sheets, path or export.export_path(report_file(name), fmt), fmt, dialect)
+    else:
+        df = concat_frames(results)
+        if not df.empty:
+            export.export_frame(df, path or export.export_path(report_file(name), fmt), fmt, name)
+
+def save_excel(name, titles, results, path=None):
+    path = path or report_file(name)
+    module = report_module(name)
+    if name == "routetable":
+        df = concat_frames(results)
+        if not df.empty:
+            module.save_with_merging_centered(df, path)
+
+    elif name == "tgwroute":
+        df = concat_frames(results)
+        if not df.empty:
+            module.save_tgw_routes(df, path)
+
+    elif name == "vpcendpoint":
+        df = concat_frames(results)
+        if not df.empty:
+            module.save_with_styled_excel(df, path)
+
+    elif name == "ssouser":
+        df = concat_frames(results)
+        if not df.empty:
+            module.save_to_excel_final(df, path)
+
+    elif name == "permissionset":
+        df = concat_frames(results)
+        if not df.empty:
+            module.save_permission_matrix(df, path)
+
+    elif name == "securitygroup":
+        sheets = [(title, *data) for title, data in zip(titles, results)]
+        module.save_side_by_side(sheets, path)
+
+    elif name == "securitygroup2":
+        sheets = [(title, *data) for title, data in zip(titles, results)]
+        module.save_centered(sheets, path)
+
+def save_reports(targets, collected, formats=FORMATS, shard_by=SHARD_BY):
+    titles = sheet_titles(targets)
+    for name, results in collected.items():
+        save_report(name, titles, results, formats, shard_by)
+
+# -------------------------
+# 수집/저장 겹치기 (파이프라인)
+# - 리포트 하나의 모든 대상 수집이 끝나는 즉시 저장 스테이지(별도 스레드)로 넘김
+#   → 다른 리포트의 describe 대기 중에 먼저 끝난 리포트의 엑셀 저장이 진행됨
+# - 저장 대기열은 WRITE_QUEUE 개로 제한 (수집이 앞서가도 대기 결과는 그만큼만 보유)
+# - 전체 시간 ≈ max(수집, 저장) + 마지막 리포트 저장 시간
+# -------------------------
+WRITE_QUEUE = 2
+
+def collect_and_save(targets, reports=None, max_workers=MAX_WORKERS, session_factory=None, snapshot=None,
+                     mode="auto", schedulers=None, scope=None, formats=FORMATS, shard_by=SHARD_BY,
+                     expand_prefix_lists=EXPAND_PREFIX_LISTS):
+    targets = parse_targets(targets)
+    reports = list(reports or REPORTS)
+    schedulers = schedulers or {}
+    titles = sheet_titles(targets)
+    catalogs = {t: ResourceCatalog(open_session(t, session_factory, snapshot, mode, schedulers.get(t)), scope,
+                                   expand_prefix_lists, snapshot.path if snapshot else None)
+                for t in targets}
+    jobs = [(name, i) for name in reports for i in range(len(targets))]
+    merged = {name: [None] * len(targets) for name in reports}
+    pending = {name: len(targets) for name in reports}
+
+    def run(job):
+        name, i = job
+        with PROFILER.span("collect", report=name, target=targets[i].label):
+            return REPORTS[name](catalogs[targets[i]], targets[i])
+
+    with Stage(lambda item: save_report(item[0], titles, item[1], formats, shard_by), maxsize=WRITE_QUEUE, name="writer") as writer:
+        workers = max(1, min(max_workers, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run, job): job for job in jobs}
+            for future in as_completed(futures):
+                name, i = futures[future]
+                merged[name][i] = future.result()
+                pending[name] -= 1
+                if pending[name] == 0:
+                    writer.submit((name, merged[name]))
+    return merged
+
+# 단일 진입점: 모든 대상/리포트를 한 번에 수집하고 저장
+# - pipeline=True 면 수집과 저장을 겹쳐 진행, False 면 전부 수집한 뒤 저장
+def render_all(targets, reports=None, throttle=THROTTLE, pipeline=PIPELINE, formats=FORMATS, shard_by=SHARD_BY,
+               **kwargs):
+    targets = parse_targets(targets)
+    schedulers = {t: RequestScheduler() for t in targets} if throttle else {}
+    started = time.perf_counter()
+    if pipeline:
+        collected = collect_and_save(targets, reports, schedulers=schedulers, formats=formats, shard_by=shard_by,
+                                     **kwargs)
+        print(f"⏱ 수집/저장 완료: 대상 {len(targets)}개, {time.perf_counter() - started:.1f}s")
+    else:
+        collected = collect_reports(targets, reports, schedulers=schedulers, **kwargs)
+        print(f"⏱ 수집 완료: 대상 {len(targets)}개, {time.perf_counter() - started:.1f}s")
+        save_reports(targets, collected, formats, shard_by)
+    for t, scheduler in schedulers.items():
+        scheduler.print_metrics(f"[{t.label} {t.region}]")
+    PROFILER.print_summary()
+    return collected
+
+# 단독 실행은 통합 CLI 의 all 명령과 같음 (옵션은 aws_resource.py all --help)
+if __name__ == "__main__":
+    import sys
+
+    import aws_resource
+    sys.exit(aws_resource.main(["all", *sys.argv[1:]]))
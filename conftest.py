@@ -0,0 +1,32 @@
+import pytest
+
+from synthetic import SyntheticAccount, SyntheticSession
+
+# ==========================================
+# 테스트 공통 (합성 백엔드)
+# - 실제 AWS 대신 synthetic.SyntheticSession: 호출 수를 API별로 집계 (session.calls)
+# - 기본 규모는 작게 (테스트마다 필요한 항목만 키움)
+# ==========================================
+TINY = dict(n_sgs=50, n_rtbs=40, n_vpce=20, n_users=30, n_groups=5, n_accounts=3, n_permission_sets=2,
+            n_tgw_rtbs=4)
+
+# 리포트/캐시 파일이 저장소에 남지 않도록 테스트마다 임시 디렉터리에서 실행
+@pytest.fixture(autouse=True)
+def _workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+def tiny_account(seed=0, **overrides):
+    return SyntheticAccount(seed=seed, **{**TINY, **overrides})
+
+# 규모를 바꿔 여러 개 만들 때: make_account(n_vpce=300)
+@pytest.fixture
+def make_account():
+    return tiny_account
+
+@pytest.fixture
+def account():
+    return tiny_account()
+
+@pytest.fixture
+def session(account):
+    return SyntheticSession(account)
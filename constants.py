@@ -0,0 +1,7 @@
+# ==========================================
+# 공용 상수 (import 없음)
+# - CLI(aws_resource.py) 인자 정의에 필요한 값만 모아 둠 → --help 는 argparse 만 로딩
+# - export / snapshot 은 여기 값을 그대로 다시 내보냄 (기존 import 경로 유지)
+# ==========================================
+FORMATS = ("xlsx", "csv", "jsonl", "parquet")   # 리포트 출력 형식 (xlsx 는 스타일 엑셀, 나머지는 export.py)
+SNAPSHOT_DB = "aws_snapshot.db"                 # 스냅샷 DB 기본 파일 (--snapshot / --from-snapshot 값 생략 시)
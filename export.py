@@ -0,0 +1,125 @@
+import csv
+import json
+import os
+
+from constants import FORMATS
+from instrument import PROFILER
+from sg_rules import iter_sg_rules
+
+# ==========================================
+# 기계 처리용 출력 (CSV / JSON Lines / Parquet)
+# - 병합/스타일 없이 행마다 모든 값을 채운 비정규화 형태
+# - 행 단위 스트리밍: CSV/JSONL 은 한 줄씩, Parquet 은 BATCH_ROWS 행씩 RecordBatch 로 기록
+# - Parquet 은 반복 값이 많은 컬럼(VPC Name, Route Tables ID 등)을 사전(dictionary) 인코딩
+# ==========================================
+BATCH_ROWS = 50_000
+
+# 리포트별 사전 인코딩 컬럼 (없는 컬럼은 무시)
+DICTIONARY_COLUMNS = {
+    "routetable": ['ACCOUNT', 'VPC Name', 'VPC ID', 'Route Tables Name', 'Route Tables ID', 'Target'],
+    "tgwroute": ['ACCOUNT', 'TGW ID', 'TGW Route Table Name', 'TGW Route Table ID', 'Target', 'Attachment ID',
+                 'Resource Type', 'Route Type', 'State'],
+    "vpcendpoint": ['ACCOUNT', 'Service Name', 'Type', 'VPC', 'Subnet', 'Security Group'],
+    "ssouser": ['ACCOUNT', 'UserStatus', 'MFA', 'Group'],
+    "permissionset": ['ACCOUNT', 'Account ID', 'Account Name', 'Permission Set', 'Assigned Via'],
+    "securitygroup": ['ACCOUNT', 'VPC Name', 'Security Groups Name', 'Group ID', 'Direction', 'Type',
+                      'Port Range', 'Source', 'Remark'],
+}
+DICTIONARY_COLUMNS["securitygroup2"] = DICTIONARY_COLUMNS["securitygroup"]
+
+SG_COLUMNS = ['ACCOUNT', 'VPC Name', 'Security Groups Name', 'Group ID', 'Direction',
+              'Type', 'Port Range', 'Source', 'Remark']
+
+def export_path(filename, fmt):
+    return f"{os.path.splitext(filename)[0]}.{fmt}"
+
+# Parquet 출력 시에만 import (없으면 Parquet 만 비활성, CSV/JSONL 은 표준 라이브러리로 동작)
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 출력에는 pyarrow 가 필요합니다 (pip install pyarrow)") from None
+    return pa, pq
+
+# -------------------------
+# 행 스트림 출력
+# rows: 컬럼 순서대로의 값 시퀀스 iterable
+# -------------------------
+def write_rows(rows, columns, path, fmt, dictionary_columns=()):
+    if fmt == "csv":
+        # utf-8-sig: 엑셀에서 열어도 한글이 깨지지 않도록 BOM 포함
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+    elif fmt == "jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str))
+                f.write("\n")
+    elif fmt == "parquet":
+        _write_parquet(rows, columns, path, dictionary_columns)
+    else:
+        raise ValueError(f"지원하지 않는 출력 형식: {fmt!r} ({', '.join(FORMATS[1:])})")
+
+def _write_parquet(rows, columns, path, dictionary_columns):
+    pa, pq = _pyarrow()
+    dict_cols = set(dictionary_columns)
+    schema = pa.schema([(c, pa.dictionary(pa.int32(), pa.string()) if c in dict_cols else pa.string())
+                        for c in columns])
+
+    def batch(chunk):
+        arrays = []
+        for i, col in enumerate(columns):
+            values = [None if r[i] is None else str(r[i]) for r in chunk]
+            array = pa.array(values, type=pa.string())
+            arrays.append(array.dictionary_encode() if col in dict_cols else array)
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    with pq.ParquetWriter(path, schema) as writer:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= BATCH_ROWS:
+                writer.write_batch(batch(chunk))
+                chunk = []
+        if chunk:
+            writer.write_batch(batch(chunk))
+
+# DataFrame 리포트 출력 (라우팅 테이블 / VPC 엔드포인트 / SSO 사용자)
+# - 이미 메모리에 있는 프레임이라 pandas / pyarrow 의 컬럼 단위 writer 를 그대로 사용
+def export_frame(df, path, fmt, report=None):
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    elif fmt == "jsonl":
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    elif fmt == "parquet":
+        pa, pq = _pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for col in DICTIONARY_COLUMNS.get(report, ()):
+            if col in table.column_names:
+                i = table.column_names.index(col)
+                table = table.set_column(i, col, table.column(i).cast(pa.string()).dictionary_encode())
+        pq.write_table(table, path)
+    else:
+        raise ValueError(f"지원하지 않는 출력 형식: {fmt!r} ({', '.join(FORMATS[1:])})")
+
+# -------------------------
+# 보안그룹 비정규화 행 (룰 1개 = 1행, 방향은 Direction 컬럼)
+# sheets: [(ACCOUNT, vpc_map, sgs[, ref_names]), ...]
+# dialect: "side_by_side"(securitygroup) / "centered"(securitygroup2) 표기
+# -------------------------
+def iter_sg_rows(sheets, dialect="side_by_side"):
+    for account, vpc_map, sgs, *extra in sheets:
+        sgs = sorted(sgs, key=lambda x: (x.get("GroupName") or "").lower())
+        expanded = PROFILER.timed("expand", iter_sg_rules(vpc_map, sgs, dialect, *extra),
+                                  report="securitygroup" if dialect == "side_by_side" else "securitygroup2")
+        for vpc_name, sg_name, sg_id, in_rules, out_rules in expanded:
+            for direction, rules in (("Inbound", in_rules), ("Outbound", out_rules)):
+                for rule in rules:
+                    yield (account, vpc_name, sg_name, sg_id, direction) + rule
+
+def export_sg(sheets, path, fmt, dialect="side_by_side"):
+    report = "securitygroup" if dialect == "side_by_side" else "securitygroup2"
+    write_rows(iter_sg_rows(sheets, dialect), SG_COLUMNS, path, fmt, DICTIONARY_COLUMNS[report])
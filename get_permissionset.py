@@ -0,0 +1,179 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from catalog import ResourceCatalog
+from get_ssouser import SHARED_KEYS, sso_group_map, sso_group_members, sso_instance, sso_users
+from instrument import PROFILER
+from merge_plan import plan_merges, write_planned
+
+# ==========================================
+# 1. 설정 (Profile 및 기본 정보)
+# ==========================================
+AWS_PROFILE = "default"
+REGION_NAME = "ap-northeast-2"
+OUTPUT_FILE = "aws_sso_permission_sets.xlsx"
+MAX_WORKERS = 16   # 권한 세트 / (계정, 권한 세트) 조회 동시 스레드 수
+# ==========================================
+
+# 계정 x 권한 세트 x 사용자 (그룹 할당은 그룹 멤버로 펼치고 Assigned Via 에 그룹명)
+COLUMNS = ['Account ID', 'Account Name', 'Permission Set', 'User Name', 'DisplayName', 'Assigned Via']
+
+# -------------------------
+# 조회 도우미
+# -------------------------
+def _pages(client, operation, key, **params):
+    items = []
+    for page in client.get_paginator(operation).paginate(**params):
+        items.extend(page.get(key, []))
+    return items
+
+# items 마다 fn 을 스레드풀로 실행 (입력 순서대로 결과 반환)
+def fan_out(fn, items, max_workers=MAX_WORKERS):
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        return list(pool.map(fn, items))
+
+# 조직 계정 이름 (Organizations 조회 권한이 없으면 빈 맵 → Account Name "-")
+def load_account_names(catalog):
+    try:
+        accounts = _pages(catalog.client('organizations'), 'list_accounts', 'Accounts')
+    except ClientError as e:
+        print(f"⚠️ 계정 이름 조회 생략 ({e.response['Error']['Code']})")
+        return {}
+    return {a['Id']: a.get('Name', '-') for a in accounts}
+
+# -------------------------
+# 권한 세트 할당 수집
+# - 권한 세트별 (이름 + 프로비저닝된 계정) 조회를 동시에 실행
+# - (계정, 권한 세트) 쌍마다 list_account_assignments 를 동시에 페이지 끝까지 조회
+# - 그룹 할당은 그룹별 멤버(list_group_memberships, 그룹 단위 1회)로 사용자 행을 펼침
+# - SSO 인스턴스 / 그룹 / 멤버 / 사용자 목록은 get_ssouser 의 카탈로그 공유 조회 사용
+# -------------------------
+def get_permission_set_data(session=None, account_label=None, catalog=None, max_workers=MAX_WORKERS):
+    # session 미지정 시 설정값으로 생성 (멀티 계정 수집 시 collector에서 카탈로그 주입)
+    if catalog is None:
+        if session is None:
+            import boto3   # 단독 실행 시에만 필요 (collector/CLI 는 세션·카탈로그를 주입)
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
+        catalog = ResourceCatalog(session)
+    sso_admin = catalog.client('sso-admin')
+
+    # 1. SSO 인스턴스 정보 확인 (ssouser 리포트와 카탈로그 공유)
+    instance = sso_instance(catalog)
+    if instance is None:
+        print("❌ [오류] SSO 인스턴스를 찾을 수 없습니다.")
+        return None
+    instance_arn = instance['InstanceArn']
+    identity_store_id = instance['IdentityStoreId']
+
+    # 2. 권한 세트 이름 + 프로비저닝된 계정
+    def permission_set_name(arn):
+        return sso_admin.describe_permission_set(
+            InstanceArn=instance_arn, PermissionSetArn=arn)['PermissionSet'].get('Name', arn)
+
+    def fetch_permission_set(arn):
+        name = permission_set_name(arn)
+        account_ids = _pages(sso_admin, 'list_accounts_for_provisioned_permission_set', 'AccountIds',
+                             InstanceArn=instance_arn, PermissionSetArn=arn)
+        return arn, name, account_ids
+
+    with PROFILER.span("permission-sets", report="permissionset"):
+        arns = _pages(sso_admin, 'list_permission_sets', 'PermissionSets', InstanceArn=instance_arn)
+        permission_sets = fan_out(fetch_permission_set, arns, max_workers)
+    ps_names = {arn: name for arn, name, _ in permission_sets}
+
+    # 3. (계정, 권한 세트) 쌍별 할당
+    def fetch_assignments(pair):
+        account_id, arn = pair
+        return _pages(sso_admin, 'list_account_assignments', 'AccountAssignments',
+                      InstanceArn=instance_arn, AccountId=account_id, PermissionSetArn=arn)
+
+    pairs = [(account_id, arn) for arn, _, account_ids in permission_sets for account_id in account_ids]
+    with PROFILER.span("account-assignments", report="permissionset"):
+        assignments = [a for chunk in fan_out(fetch_assignments, pairs, max_workers) for a in chunk]
+
+    # 목록 조회에 없던 권한 세트의 할당 (조회 사이에 생성/삭제 등): 이름만 따로 조회, 없으면 ARN 그대로
+    def missing_name(arn):
+        try:
+            return permission_set_name(arn)
+        except ClientError:
+            return arn
+
+    missing = sorted({a['PermissionSetArn'] for a in assignments} - ps_names.keys())
+    ps_names.update(zip(missing, fan_out(missing_name, missing, max_workers)))
+
+    # 4. 주체 이름: 그룹 / 그룹 멤버 / 사용자는 ssouser 리포트와 카탈로그 공유, 계정 이름 맵
+    group_map = sso_group_map(catalog, identity_store_id)
+    members = sso_group_members(catalog, identity_store_id, max_workers)
+    users = {u['UserId']: u for u in sso_users(catalog, identity_store_id)}
+    account_names = load_account_names(catalog)
+
+    # 5. 행 생성 (그룹 할당은 멤버 수만큼, 멤버가 없으면 "-" 1행)
+    rows = []
+    for a in assignments:
+        account_id, ps_name = a['AccountId'], ps_names[a['PermissionSetArn']]
+        if a['PrincipalType'] == 'GROUP':
+            via = f"Group: {group_map.get(a['PrincipalId'], a['PrincipalId'])}"
+            user_ids = members.get(a['PrincipalId']) or [None]
+        else:
+            via, user_ids = "Direct", [a['PrincipalId']]
+        for user_id in user_ids:
+            user = users.get(user_id, {})
+            rows.append((account_id, account_names.get(account_id, '-'), ps_name,
+                         user.get('UserName', user_id or '-'), user.get('DisplayName', '-'), via))
+
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df = df.sort_values(by=['Account Name', 'Account ID', 'Permission Set', 'User Name', 'Assigned Via'],
+                        kind='stable').reset_index(drop=True)
+    if account_label:
+        df.insert(0, 'ACCOUNT', account_label)
+    return df
+
+# -------------------------
+# 엑셀 저장 (계정 / 권한 세트 세로 병합, 가운데 정렬)
+# -------------------------
+def save_permission_matrix(df, filename):
+    writer = pd.ExcelWriter(filename, engine='xlsxwriter')
+    df.head(0).to_excel(writer, index=False, sheet_name='PermissionSets')
+    workbook = writer.book
+    worksheet = writer.sheets['PermissionSets']
+
+    header_format = workbook.add_format({
+        'bold': True, 'bg_color': '#D3D3D3', 'border': 1,
+        'align': 'center', 'valign': 'vcenter'
+    })
+    center_format = workbook.add_format({
+        'border': 1, 'align': 'center', 'valign': 'vcenter'
+    })
+
+    for col_num, value in enumerate(df.columns.values):
+        worksheet.write(0, col_num, value, header_format)
+
+    # 병합: (ACCOUNT,) Account ID, Account Name, Permission Set - 계층 병합
+    merge_names = ['ACCOUNT', 'Account ID', 'Account Name', 'Permission Set']
+    merge_cols = [df.columns.get_loc(c) for c in merge_names if c in df.columns]
+    with PROFILER.span("merge-plan", report="permissionset"):
+        plan = plan_merges(df, merge_cols)
+    write_planned(worksheet, df, plan, center_format)
+
+    # 열 너비 (ACCOUNT 컬럼이 있으면 한 칸씩 밀림)
+    off = 1 if 'ACCOUNT' in df.columns else 0
+    if off:
+        worksheet.set_column(0, 0, 15)
+    worksheet.set_column(off, off, 16)
+    worksheet.set_column(off + 1, off + 2, 30)
+    worksheet.set_column(off + 3, off + 4, 28)
+    worksheet.set_column(off + 5, off + 5, 36)
+    worksheet.freeze_panes(1, 0)
+
+    writer.close()
+    print(f"✅ 권한 세트 할당 리포트 생성 완료: {filename}")
+
+if __name__ == "__main__":
+    df = get_permission_set_data()
+    if df is not None:
+        save_permission_matrix(df, OUTPUT_FILE)
@@ -1,6 +1,11 @@
-import boto3
 import pandas as pd
 
+from catalog import ResourceCatalog
+from instrument import PROFILER
+from merge_plan import plan_merges, write_planned
+from prefix_lists import display_sources, route_prefix_list_ids
+from resources import route_target, tag_name
+
 # ==========================================
 # 1. 설정 (Profile 및 기본 정보)
 # ==========================================
@@ -10,55 +15,72 @@ ACCOUNT_LABEL = "DEV"
 OUTPUT_FILE = "aws_route_table_final.xlsx"
 # ==========================================
 
-def get_full_data():
-    session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
-    ec2 = session.client('ec2')
-    
-    # VPC 정보 수집
-    vpcs = ec2.describe_vpcs()['Vpcs']
-    vpc_map = {v['VpcId']: next((t['Value'] for t in v.get('Tags', []) if t['Key'] == 'Name'), v['VpcId']) for v in vpcs}
+COLUMNS = ['ACCOUNT', 'VPC Name', 'VPC ID', 'Route Tables Name', 'Route Tables ID', 'Destination', 'Target']
+
+def get_full_data(session=None, account_label=ACCOUNT_LABEL, catalog=None):
+    # session 미지정 시 설정값으로 생성 (멀티 계정 수집 시 collector에서 카탈로그 주입)
+    if catalog is None:
+        if session is None:
+            import boto3   # 단독 실행 시에만 필요 (collector/CLI 는 세션·카탈로그를 주입)
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
+        catalog = ResourceCatalog(session)
     
-    # Route Table 정보 수집
-    rtbs = ec2.describe_route_tables()['RouteTables']
+    # VPC 정보 수집 (카탈로그 공유)
+    vpc_map = catalog.vpc_map()
     
+    # Route Table 정보 수집 (페이지 단위로 흘려보내며 행 생성)
+    # - prefix list 펼치기 모드면 전체 목록에서 참조 ID 를 먼저 모아 한 번에 해석 (목적지 CIDR 마다 1행)
+    route_tables = catalog.stream('route_tables')
+    prefix_lists = None
+    if catalog.expand_prefix_lists:
+        route_tables = catalog.resources('route_tables')
+        prefix_lists = catalog.prefix_lists(route_prefix_list_ids(route_tables))
+
     rows = []
-    for rtb in rtbs:
+    for rtb in route_tables:
         vpc_id = rtb['VpcId']
         vpc_name = vpc_map.get(vpc_id, 'N/A')
         rtb_id = rtb['RouteTableId']
-        rtb_name = next((tag['Value'] for tag in rtb.get('Tags', []) if tag['Key'] == 'Name'), 'Unused')
+        rtb_name = tag_name(rtb, 'Unused')
         
         for route in rtb.get('Routes', []):
-            dest = route.get('DestinationCidrBlock') or route.get('DestinationPrefixListId') or '-'
-            target = route.get('GatewayId') or route.get('TransitGatewayId') or \
-                     route.get('NatGatewayId') or route.get('NetworkInterfaceId') or \
-                     route.get('VpcPeeringConnectionId') or '-'
-            
-            if 'GatewayId' in route and route['GatewayId'] == 'local':
-                target = 'local'
+            pl_id = route.get('DestinationPrefixListId')
+            if route.get('DestinationCidrBlock') or not pl_id:
+                dests = [route.get('DestinationCidrBlock') or '-']
+            else:
+                dests = display_sources(prefix_lists, pl_id)
+            target = route_target(route)
 
-            rows.append({
-                'ACCOUNT': ACCOUNT_LABEL,
-                'VPC Name': vpc_name,
-                'VPC ID': vpc_id,
-                'Route Tables Name': rtb_name,
-                'Route Tables ID': rtb_id,
-                'Destination': dest,
-                'Target': target
-            })
+            for dest in dests:
+                rows.append({
+                    'ACCOUNT': account_label,
+                    'VPC Name': vpc_name,
+                    'VPC ID': vpc_id,
+                    'Route Tables Name': rtb_name,
+                    'Route Tables ID': rtb_id,
+                    'Destination': dest,
+                    'Target': target
+                })
     
-    df = pd.DataFrame(rows)
-    # 정렬 가중치: local을 0순위로
-    df['Target_Priority'] = df['Target'].apply(lambda x: 0 if x == 'local' else 1)
-    df = df.sort_values(by=['VPC Name', 'Route Tables Name', 'Target_Priority', 'Destination'])
-    return df.drop(columns=['Target_Priority'])
+    if not rows:
+        return pd.DataFrame(columns=COLUMNS)
+
+    with PROFILER.span("sort", report="routetable"):
+        df = pd.DataFrame(rows)
+        # 정렬 가중치: local을 0순위로
+        df['Target_Priority'] = df['Target'].apply(lambda x: 0 if x == 'local' else 1)
+        df = df.sort_values(by=['VPC Name', 'Route Tables Name', 'Target_Priority', 'Destination'])
+        return df.drop(columns=['Target_Priority'])
 
-def save_with_merging_centered(df, filename):
+# merge_cols / sheet_name 은 같은 레이아웃을 쓰는 리포트용 (get_tgwroute)
+def save_with_merging_centered(df, filename, merge_cols=(0, 1, 2, 3, 4), sheet_name='RouteTables',
+                               report="routetable"):
     writer = pd.ExcelWriter(filename, engine='xlsxwriter')
-    df.to_excel(writer, index=False, sheet_name='RouteTables')
+    # 헤더만 pandas로 만들고 데이터는 병합 계획에 따라 직접 기록
+    df.head(0).to_excel(writer, index=False, sheet_name=sheet_name)
     
     workbook = writer.book
-    worksheet = writer.sheets['RouteTables']
+    worksheet = writer.sheets[sheet_name]
     
     # ---------------------------------------------------------
     # 공통 스타일 정의 (가운데 정렬 추가)
@@ -79,29 +101,14 @@ def save_with_merging_centered(df, filename):
         worksheet.write(0, col_num, value, header_format)
 
     # 병합 로직 (0~4번 컬럼: ACCOUNT, VPC Name, VPC ID, RT Name, RT ID)
-    merge_cols = [0, 1, 2, 3, 4]
-    for col in merge_cols:
-        start_row = 1
-        while start_row <= len(df):
-            end_row = start_row
-            current_val = df.iloc[start_row - 1, col]
-            
-            while end_row < len(df) and df.iloc[end_row, col] == current_val:
-                end_row += 1
-            
-            if end_row - start_row > 0:
-                worksheet.merge_range(start_row, col, end_row, col, current_val, center_format)
-            else:
-                worksheet.write(start_row, col, current_val, center_format)
-            start_row = end_row + 1
-
-    # Destination(5) / Target(6) 열에도 가운데 정렬 스타일 적용
-    for r_idx in range(1, len(df) + 1):
-        worksheet.write(r_idx, 5, df.iloc[r_idx-1, 5], center_format)
-        worksheet.write(r_idx, 6, df.iloc[r_idx-1, 6], center_format)
+    # - 계층 병합: 하위 컬럼은 상위 컬럼 경계를 넘어 병합하지 않음
+    # Destination(5) / Target(6) 열은 병합 없이 가운데 정렬 스타일만 적용
+    with PROFILER.span("merge-plan", report=report):
+        plan = plan_merges(df, list(merge_cols))
+    write_planned(worksheet, df, plan, center_format)
 
     # 열 너비 조정
-    worksheet.set_column('A:G', 25)
+    worksheet.set_column(0, len(df.columns) - 1, 25)
     
     writer.close()
     print(f"✨ 모든 셀 가운데 정렬 완료: {filename}")
@@ -1,69 +1,211 @@
-import boto3
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from catalog import ResourceCatalog
+from snapshot import SNAPSHOT_TTL, LookupCache
+
 # ==========================================
 # 1. 설정 (Profile 및 기본 정보)
 # ==========================================
 AWS_PROFILE = "default"
 REGION_NAME = "ap-northeast-2"
 OUTPUT_FILE = "aws_sso_users_sorted_groups.xlsx"
+MAX_WORKERS = 8   # 그룹 멤버십 조회 동시 스레드 수
+LOOKUP_WORKERS = 16   # 사용자별 상세(상태/MFA) 조회 동시 스레드 수
+USER_CACHE_DB = None   # 사용자별 조회 결과 캐시 파일 (None 이면 카탈로그 cache_db = --snapshot 지정 시에만 캐시)
+USER_CACHE_TTL = SNAPSHOT_TTL
+# MFA 장치 조회 함수 (catalog, identity_store_id, user_id) -> 장치 수
+# - Identity Center 사용자 MFA 장치 목록은 Identity Store / sso-admin 공개 API 로 조회할 수 없음
+#   → 기본 None 이면 MFA 컬럼은 "-" (확인 불가, README 참고)
+# - IdP / 사내 인벤토리 등 조회 경로가 있으면 연결 (상태 조회와 같은 동시 실행/캐시 경로 사용)
+MFA_LOOKUP = None
 # ==========================================
 
-def get_sso_user_data():
-    session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
-    sso_admin = session.client('sso-admin')
-    identity_store = session.client('identitystore')
+# 그룹 마스터 데이터 (GroupId -> DisplayName)
+def load_group_map(identity_store, identity_store_id):
+    group_map = {}
+    paginator = identity_store.get_paginator('list_groups')
+    for page in paginator.paginate(IdentityStoreId=identity_store_id):
+        for group in page['Groups']:
+            group_map[group['GroupId']] = group['DisplayName']
+    return group_map
+
+# -------------------------
+# 그룹별 멤버 (GroupId -> [UserId, ...])
+# - 사용자마다 list_group_memberships_for_member 를 부르지 않고
+#   그룹 단위로 list_group_memberships 를 페이지 끝까지 조회 (그룹 수 << 사용자 수)
+# - 그룹별 조회는 스레드풀로 동시 실행 (client는 스레드 간 공유 가능)
+# -------------------------
+def fetch_group_members(identity_store, identity_store_id, group_ids, max_workers=MAX_WORKERS):
+    def fetch(group_id):
+        user_ids = []
+        paginator = identity_store.get_paginator('list_group_memberships')
+        for page in paginator.paginate(IdentityStoreId=identity_store_id, GroupId=group_id):
+            for member in page['GroupMemberships']:
+                user_id = member.get('MemberId', {}).get('UserId')
+                if user_id:
+                    user_ids.append(user_id)
+        return group_id, user_ids
+
+    group_ids = list(group_ids)
+    if not group_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(group_ids)))) as pool:
+        return dict(pool.map(fetch, group_ids))
+
+# 그룹 멤버십 인덱스 (UserId -> [그룹명, ...])
+def _index_members(group_map, members):
+    index = defaultdict(list)
+    for group_id, user_ids in members.items():
+        for user_id in user_ids:
+            index[user_id].append(group_map[group_id])
+    return index
+
+def build_membership_index(identity_store, identity_store_id, group_map, max_workers=MAX_WORKERS):
+    return _index_members(group_map, fetch_group_members(identity_store, identity_store_id, group_map, max_workers))
+
+# -------------------------
+# 카탈로그 공유 조회 (SSO 인스턴스 / 그룹 / 그룹 멤버 / 사용자 목록)
+# - ssouser / permissionset 리포트가 같은 카탈로그로 실행되면 한 번만 조회하고 결과를 공유
+# - 그룹 멤버는 전체 그룹 기준 (permissionset 은 할당된 그룹만 골라 씀)
+# - 카탈로그당 SSO 인스턴스 1개 기준 키 (서비스 모드는 리포트 갱신 전에 SHARED_KEYS 를 버리고 다시 조회)
+# -------------------------
+SHARED_KEYS = ("sso_instances", "sso_groups", "sso_group_members", "sso_users")
+
+def sso_instance(catalog):
+    instances = catalog.cached("sso_instances", lambda: catalog.client('sso-admin').list_instances()['Instances'])
+    return instances[0] if instances else None
+
+def sso_group_map(catalog, identity_store_id):
+    return catalog.cached("sso_groups",
+                          lambda: load_group_map(catalog.client('identitystore'), identity_store_id))
+
+def sso_group_members(catalog, identity_store_id, max_workers=MAX_WORKERS):
+    group_map = sso_group_map(catalog, identity_store_id)
+    return catalog.cached("sso_group_members", lambda: fetch_group_members(
+        catalog.client('identitystore'), identity_store_id, group_map, max_workers))
+
+def sso_users(catalog, identity_store_id):
+    def load():
+        users = []
+        paginator = catalog.client('identitystore').get_paginator('list_users')
+        for page in paginator.paginate(IdentityStoreId=identity_store_id):
+            users.extend(page['Users'])
+        return users
+    return catalog.cached("sso_users", load)
+
+# -------------------------
+# 사용자별 상세 조회 (UserStatus / MFA)
+# - list_users 응답에 UserStatus 가 있으면 그대로 쓰고, 없을 때만 describe_user 호출
+# - 결과는 LookupCache 에 (IdentityStoreId, UserId) 로 저장: 다음 실행은 TTL 안이고
+#   사용자 Revision(없으면 UpdatedAt)이 같으면 호출 없이 재사용 → 바뀐 사용자만 다시 조회
+# - 조회는 LOOKUP_WORKERS 개 스레드로 동시 실행 (API 속도 조절은 세션의 스케줄러가 담당)
+# -------------------------
+def _user_version(user):
+    return user.get('Revision') or user.get('UpdatedAt')
+
+def lookup_user_details(catalog, identity_store_id, users, mfa_lookup=None, cache=None,
+                        max_workers=LOOKUP_WORKERS):
+    identity_store = catalog.client('identitystore')
 
-    # 1. SSO 인스턴스 정보 확인
-    instances = sso_admin.list_instances()['Instances']
-    if not instances:
+    def fetch(user):
+        status = user.get('UserStatus')
+        if status is None:
+            status = identity_store.describe_user(
+                IdentityStoreId=identity_store_id, UserId=user['UserId']).get('UserStatus')
+        mfa = mfa_lookup(catalog, identity_store_id, user['UserId']) if mfa_lookup else None
+        return {'status': status, 'mfa': mfa}
+
+    versions = {user['UserId']: _user_version(user) for user in users}
+    details = cache.get_many("sso_user", identity_store_id, versions) if cache else {}
+    # MFA 조회를 새로 연결한 경우 MFA 없이 저장된 캐시는 다시 조회
+    if mfa_lookup:
+        details = {uid: d for uid, d in details.items() if d.get('mfa') is not None}
+    missing = [user for user in users if user['UserId'] not in details]
+
+    if missing:
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+            for user, detail in zip(missing, pool.map(fetch, missing)):
+                fetched[user['UserId']] = detail
+        details.update(fetched)
+        if cache:
+            cache.put_many("sso_user", identity_store_id,
+                           {uid: (versions[uid], detail) for uid, detail in fetched.items()})
+    return details
+
+def _mfa_display(count):
+    if count is None:
+        return "-"
+    return f"{count} device" if count == 1 else f"{count} devices"
+
+# 대표 이메일 (Primary 우선, 없으면 첫 번째)
+def _primary_email(user):
+    emails = user.get('Emails') or []
+    for email in emails:
+        if email.get('Primary'):
+            return email.get('Value', '-')
+    return emails[0].get('Value', '-') if emails else '-'
+
+def get_sso_user_data(session=None, account_label=None, catalog=None, mfa_lookup=None, cache_db=USER_CACHE_DB):
+    # session 미지정 시 설정값으로 생성 (멀티 계정 수집 시 collector에서 카탈로그 주입)
+    if catalog is None:
+        if session is None:
+            import boto3   # 단독 실행 시에만 필요 (collector/CLI 는 세션·카탈로그를 주입)
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
+        catalog = ResourceCatalog(session)
+
+    # 1. SSO 인스턴스 정보 확인 (카탈로그 공유)
+    instance = sso_instance(catalog)
+    if instance is None:
         print("❌ [오류] SSO 인스턴스를 찾을 수 없습니다.")
         return None
     
-    identity_store_id = instances[0]['IdentityStoreId']
+    identity_store_id = instance['IdentityStoreId']
 
     # 2. 그룹 마스터 데이터 수집 (ID -> Name 매핑)
-    group_map = {}
-    paginator = identity_store.get_paginator('list_groups')
-    for page in paginator.paginate(IdentityStoreId=identity_store_id):
-        for group in page['Groups']:
-            group_map[group['GroupId']] = group['DisplayName']
+    group_map = sso_group_map(catalog, identity_store_id)
+
+    # 그룹 -> 사용자 방향으로 멤버십 인덱스 구성
+    membership_index = _index_members(group_map, sso_group_members(catalog, identity_store_id))
+
+    # 3. 사용자 목록 + 사용자별 상세 (상태/MFA, 캐시 우선)
+    users = sso_users(catalog, identity_store_id)
+
+    cache_db = cache_db or catalog.cache_db
+    cache = LookupCache(cache_db, USER_CACHE_TTL) if cache_db else None
+    details = lookup_user_details(catalog, identity_store_id, users, mfa_lookup or MFA_LOOKUP, cache)
 
-    # 3. 사용자 정보 및 그룹 소속 확인
+    # 4. 사용자 정보 및 그룹 소속 확인
     all_users = []
-    user_paginator = identity_store.get_paginator('list_users')
-    
     user_count = 1
-    for page in user_paginator.paginate(IdentityStoreId=identity_store_id):
-        for user in page['Users']:
-            user_id = user['UserId']
-            
-            # 그룹 목록 가져오기 및 이름 변환
-            user_groups = []
-            memberships = identity_store.list_group_memberships_for_member(
-                IdentityStoreId=identity_store_id,
-                MemberId={'UserId': user_id}
-            )
-            for member in memberships.get('GroupMemberships', []):
-                g_name = group_map.get(member['GroupId'], member['GroupId'])
-                user_groups.append(g_name)
-
-            # ---------------------------------------------------------
-            # 그룹 리스트 정렬 수행 (추가된 부분)
-            # ---------------------------------------------------------
-            sorted_groups = sorted(user_groups) 
-            group_display = ", ".join(sorted_groups) if sorted_groups else "-"
-
-            all_users.append({
-                'No.': user_count,
-                'DisplayName': user.get('DisplayName', '-'),
-                'User Name': user.get('UserName', '-'),
-                'Email': user.get('Emails', [{}])[0].get('Value', '-'),
-                'UserStatus': "ENABLED",
-                'MFA': "1 device",
-                'Group': group_display
-            })
-            user_count += 1
+    for user in users:
+        user_id = user['UserId']
+        detail = details[user_id]
+
+        # 멤버십 인덱스에서 그룹명 목록 조회
+        user_groups = membership_index.get(user_id, [])
+
+        # ---------------------------------------------------------
+        # 그룹 리스트 정렬 수행 (추가된 부분)
+        # ---------------------------------------------------------
+        sorted_groups = sorted(user_groups) 
+        group_display = ", ".join(sorted_groups) if sorted_groups else "-"
+
+        row = {'ACCOUNT': account_label} if account_label else {}
+        row.update({
+            'No.': user_count,
+            'DisplayName': user.get('DisplayName', '-'),
+            'User Name': user.get('UserName', '-'),
+            'Email': _primary_email(user),
+            'UserStatus': detail['status'] or "-",
+            'MFA': _mfa_display(detail['mfa']),
+            'Group': group_display
+        })
+        all_users.append(row)
+        user_count += 1
 
     return pd.DataFrame(all_users)
 
@@ -87,11 +229,14 @@ def save_to_excel_final(df, filename):
         for c_idx in range(len(df.columns)):
             worksheet.write(r_idx, c_idx, df.iloc[r_idx-1, c_idx], center_fmt)
 
-    # 열 너비 설정
-    worksheet.set_column('A:A', 6)
-    worksheet.set_column('B:D', 28)
-    worksheet.set_column('E:F', 15)
-    worksheet.set_column('G:G', 45) # 그룹명이 많을 수 있어 넓게 설정
+    # 열 너비 설정 (ACCOUNT 컬럼이 있으면 한 칸씩 밀림)
+    off = 1 if 'ACCOUNT' in df.columns else 0
+    if off:
+        worksheet.set_column(0, 0, 15)
+    worksheet.set_column(off, off, 6)
+    worksheet.set_column(off + 1, off + 3, 28)
+    worksheet.set_column(off + 4, off + 5, 15)
+    worksheet.set_column(off + 6, off + 6, 45) # 그룹명이 많을 수 있어 넓게 설정
     
     writer.close()
     print(f"✅ 그룹 정렬이 적용된 리포트 생성 완료: {filename}")
@@ -0,0 +1,173 @@
+import ipaddress
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from catalog import ResourceCatalog
+from get_routetable import save_with_merging_centered
+from instrument import PROFILER
+from resources import tag_name
+from scope import FILTER_VALUE_LIMIT
+
+# ==========================================
+# 1. 설정 (Profile 및 기본 정보)
+# ==========================================
+AWS_PROFILE = "default"
+REGION_NAME = "ap-northeast-2"
+ACCOUNT_LABEL = "DEV"
+OUTPUT_FILE = "aws_tgw_route_table.xlsx"
+MAX_WORKERS = 16             # TGW 라우팅 테이블별 라우트 검색 동시 스레드 수
+ROUTE_SEARCH_LIMIT = 1000    # search_transit_gateway_routes MaxResults 상한
+ROUTE_STATES = ["active", "blackhole"]
+# ==========================================
+
+# TGW 라우팅 테이블 x 라우트 (ECMP 처럼 attachment 가 여러 개면 attachment 마다 1행)
+COLUMNS = ['ACCOUNT', 'TGW ID', 'TGW Route Table Name', 'TGW Route Table ID', 'Destination', 'Target',
+           'Attachment ID', 'Resource Type', 'Route Type', 'State']
+MERGE_COLS = [0, 1, 2, 3]   # ACCOUNT, TGW ID, RT Name, RT ID (get_routetable 과 같은 계층 병합)
+
+# -------------------------
+# 라우트 검색
+# - search_transit_gateway_routes 는 페이지네이션이 없고 MaxResults 에서 잘림 (AdditionalRoutesAvailable)
+# - 잘리면 목적지 CIDR 범위를 반씩 나눠 subnet-of-match 로 다시 검색 (범위와 같은 목적지는 exact-match 로 조회)
+#   → 라우트가 많은 허브 테이블도 빠짐없이 조회, 일반 테이블은 호출 1회
+# - 나눈 범위 검색도 같은 풀에 작업으로 넣음 (허브 테이블 하나가 스레드 하나에서 순서대로 도는 것을 피함)
+# - prefix list 목적지 라우트는 CIDR 범위 검색에 걸리지 않음 → 잘린 테이블은 prefix-list-id 필터로 한 번 더 검색
+#   (ID 목록은 잘린 테이블이 있을 때만 조회, ID 목록이 없거나 그 검색도 잘리면 누락 가능 경고)
+# -------------------------
+ROOT_RANGES = [ipaddress.ip_network("0.0.0.0/0"), ipaddress.ip_network("::/0")]
+
+def _search(ec2, rtb_id, filters, limit):
+    response = ec2.search_transit_gateway_routes(
+        TransitGatewayRouteTableId=rtb_id, MaxResults=limit,
+        Filters=[{'Name': 'state', 'Values': ROUTE_STATES}] + filters)
+    return response.get('Routes', []), response.get('AdditionalRoutesAvailable', False)
+
+# 검색 1단계: step = (검색 종류, 범위) → (라우트, 이어서 검색할 step 목록)
+# - (None, None) 테이블 전체 / ("subnet-of", 범위) 범위 안 라우트 / ("exact", 범위) 범위와 같은 목적지
+# - ("prefix-list", ID 묶음) 해당 prefix list 목적지 라우트 (묶음이 None 이면 ID 목록이 없어 경고만)
+# - 잘린 범위의 exact 검색과 절반 범위 검색은 서로 독립 → 각각 작업으로 넣어 동시에 실행
+def _search_step(ec2, rtb_id, step, limit):
+    kind, network = step
+    if kind is None:
+        routes, truncated = _search(ec2, rtb_id, [], limit)
+        return routes, ([("subnet-of", n) for n in ROOT_RANGES] + [("prefix-list", None)] if truncated else [])
+    if kind == "prefix-list":
+        if not network:
+            print(f"⚠️ {rtb_id}: 라우트가 {limit}개를 넘어 잘림 - prefix list 목적지 라우트 일부 누락 가능")
+            return [], []
+        routes, truncated = _search(ec2, rtb_id, [{'Name': 'prefix-list-id', 'Values': list(network)}], limit)
+        if truncated:
+            print(f"⚠️ {rtb_id}: prefix list 라우트 검색도 잘림 - 일부 누락 가능")
+        return routes, []
+    routes, truncated = _search(ec2, rtb_id, [{'Name': f"route-search.{kind}-match", 'Values': [str(network)]}],
+                                limit)
+    if kind == "exact" or not truncated or network.prefixlen == network.max_prefixlen:
+        return routes, []
+    return routes, [("exact", network)] + [("subnet-of", half) for half in network.subnets(prefixlen_diff=1)]
+
+def _route_key(route):
+    return route.get('DestinationCidrBlock') or route.get('PrefixListId')
+
+# rtb_ids -> {TGW 라우팅 테이블 ID: [라우트, ...]} (목적지 기준 중복 제거)
+# prefix_list_ids: 잘린 테이블의 prefix list 라우트 검색에 쓸 ID 목록을 돌려주는 함수 (처음 필요할 때 1회 호출)
+def search_routes(ec2, rtb_ids, max_workers=MAX_WORKERS, limit=ROUTE_SEARCH_LIMIT, prefix_list_ids=None):
+    found = {rtb_id: {} for rtb_id in rtb_ids}
+    if not found:
+        return {}
+    pl_ids = None
+
+    # ("prefix-list", None) → ID 를 필터 값 개수 단위로 나눈 검색 step (ID 가 없으면 그대로 두어 경고)
+    # - 결과 처리 루프(메인 스레드)에서만 호출
+    def expand(step):
+        nonlocal pl_ids
+        if step != ("prefix-list", None):
+            return [step]
+        if pl_ids is None:
+            pl_ids = sorted(set(prefix_list_ids())) if prefix_list_ids else []
+        size = min(limit, FILTER_VALUE_LIMIT)
+        return [("prefix-list", tuple(pl_ids[i:i + size])) for i in range(0, len(pl_ids), size)] or [step]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(found)))) as pool:
+        pending = {pool.submit(_search_step, ec2, rtb_id, (None, None), limit): rtb_id for rtb_id in found}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rtb_id = pending.pop(future)
+                routes, steps = future.result()
+                for route in routes:
+                    found[rtb_id].setdefault(_route_key(route), route)
+                for step in (part for step in steps for part in expand(step)):
+                    pending[pool.submit(_search_step, ec2, rtb_id, step, limit)] = rtb_id
+    return {rtb_id: list(routes.values()) for rtb_id, routes in found.items()}
+
+# -------------------------
+# attachment 표기: VPC 는 vpc_map 이름 (다른 계정 VPC 는 attachment Name 태그 / ID), 그 외는 Name 태그 / 리소스 ID
+# -------------------------
+def attachment_names(attachments, vpc_map):
+    names = {}
+    for att in attachments:
+        resource_id = att.get('ResourceId') or att['TransitGatewayAttachmentId']
+        if att.get('ResourceType') == 'vpc':
+            names[att['TransitGatewayAttachmentId']] = vpc_map.get(resource_id) or tag_name(att, resource_id)
+        else:
+            names[att['TransitGatewayAttachmentId']] = tag_name(att, resource_id)
+    return names
+
+def _target(att, names):
+    att_id = att.get('TransitGatewayAttachmentId')
+    return names.get(att_id) or att.get('ResourceId') or att_id or '-'
+
+# -------------------------
+# TGW 라우트 수집
+# - 라우팅 테이블 / attachment 목록은 카탈로그 (페이지 끝까지, 계정당 1회)
+# - 테이블별 라우트 검색(+ 잘린 테이블의 범위 분할 검색)을 스레드풀로 동시 실행
+# - scope(VPC/태그) 는 TGW 리소스에 적용하지 않음 (TGW 라우팅은 계정 단위)
+# -------------------------
+def get_tgw_route_data(session=None, account_label=ACCOUNT_LABEL, catalog=None, max_workers=MAX_WORKERS):
+    # session 미지정 시 설정값으로 생성 (멀티 계정 수집 시 collector에서 카탈로그 주입)
+    if catalog is None:
+        if session is None:
+            import boto3   # 단독 실행 시에만 필요 (collector/CLI 는 세션·카탈로그를 주입)
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
+        catalog = ResourceCatalog(session)
+    ec2 = catalog.client('ec2')
+
+    route_tables = [rtb for rtb in catalog.resources('transit_gateway_route_tables')
+                    if rtb.get('State') not in ('deleting', 'deleted')]
+    names = attachment_names(catalog.resources('transit_gateway_attachments'), catalog.vpc_map())
+
+    def prefix_list_ids():
+        return [pl['PrefixListId'] for pl in catalog.resources('managed_prefix_lists')]
+
+    with PROFILER.span("route-search", report="tgwroute"):
+        searched = search_routes(ec2, [rtb['TransitGatewayRouteTableId'] for rtb in route_tables], max_workers,
+                                 prefix_list_ids=prefix_list_ids)
+
+    rows = []
+    for rtb in route_tables:
+        rtb_id = rtb['TransitGatewayRouteTableId']
+        routes = searched[rtb_id]
+        base = (account_label, rtb.get('TransitGatewayId', '-'), tag_name(rtb, '-'), rtb_id)
+        for route in routes:
+            dest = route.get('DestinationCidrBlock') or route.get('PrefixListId') or '-'
+            tail = (route.get('Type', '-'), route.get('State', '-'))
+            for att in route.get('TransitGatewayAttachments') or [{}]:
+                rows.append(base + (dest, _target(att, names), att.get('TransitGatewayAttachmentId', '-'),
+                                    att.get('ResourceType', '-')) + tail)
+
+    if not rows:
+        return pd.DataFrame(columns=COLUMNS)
+
+    with PROFILER.span("sort", report="tgwroute"):
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        return df.sort_values(by=['TGW ID', 'TGW Route Table Name', 'TGW Route Table ID', 'Destination',
+                                  'Attachment ID'], kind='stable').reset_index(drop=True)
+
+# 엑셀 저장: 라우팅 테이블 리포트와 같은 병합 + 가운데 정렬 레이아웃
+def save_tgw_routes(df, filename):
+    save_with_merging_centered(df, filename, MERGE_COLS, sheet_name='TGWRouteTables', report="tgwroute")
+
+if __name__ == "__main__":
+    final_df = get_tgw_route_data()
+    save_tgw_routes(final_df, OUTPUT_FILE)
@@ -1,27 +1,73 @@
-import boto3
 import pandas as pd
 
+from catalog import ResourceCatalog
+from instrument import PROFILER
+from merge_plan import plan_merges, write_planned
+from resources import iter_resources, tag_name
+
 # ==========================================
 # 1. 설정 (Profile 및 기본 정보)
 # ==========================================
 AWS_PROFILE = "default"
 REGION_NAME = "ap-northeast-2"
 OUTPUT_FILE = "aws_vpce_with_eni_ip.xlsx"
+ENI_CHUNK_SIZE = 200   # ID 필터 1회당 값 개수 (EC2 필터 값 최대 200)
 # ==========================================
 
-def get_vpce_data_with_ip():
-    session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
-    ec2 = session.client('ec2')
+# -------------------------
+# ENI 인덱스 (ENI ID -> (SubnetId, PrivateIpAddress))
+# - 엔드포인트마다 describe_network_interfaces 를 부르지 않고
+#   interface-type=vpc_endpoint 필터로 한 번에 페이지 조회
+# - 필터에서 빠진 ENI만 ID 묶음(200개) 단위로 추가 조회
+# - 호출 수는 엔드포인트 수가 아니라 ENI 페이지 수에 비례
+# - filters: 범위 조회 시 추가 필터 (예: vpc-id)
+# - enis: 이미 받아 둔 ENI 목록이 있으면 (서비스 모드 카탈로그) 일괄 조회 대신 사용
+# -------------------------
+def build_eni_index(ec2, eni_ids, filters=None, enis=None):
+    wanted = set(eni_ids)
+    index = {}
+    if not wanted:
+        return index
+
+    if enis is None:
+        type_filter = [{'Name': 'interface-type', 'Values': ['vpc_endpoint']}]
+        enis = iter_resources(ec2, "network_interfaces", Filters=type_filter + list(filters or []))
+    for eni in enis:
+        if eni['NetworkInterfaceId'] in wanted:
+            index[eni['NetworkInterfaceId']] = (eni['SubnetId'], eni['PrivateIpAddress'])
+
+    missing = sorted(wanted - index.keys())
+    for i in range(0, len(missing), ENI_CHUNK_SIZE):
+        chunk = missing[i:i + ENI_CHUNK_SIZE]
+        for eni in iter_resources(ec2, "network_interfaces",
+                                  Filters=[{'Name': 'network-interface-id', 'Values': chunk}]):
+            index[eni['NetworkInterfaceId']] = (eni['SubnetId'], eni['PrivateIpAddress'])
+
+    return index
 
-    # 이름 매핑용 마스터 데이터 수집
-    vpcs = {v['VpcId']: next((t['Value'] for t in v.get('Tags', []) if t['Key'] == 'Name'), v['VpcId']) 
-            for v in ec2.describe_vpcs()['Vpcs']}
-    subnets = {s['SubnetId']: next((t['Value'] for t in s.get('Tags', []) if t['Key'] == 'Name'), s['SubnetId']) 
-               for s in ec2.describe_subnets()['Subnets']}
-    sgs = {g['GroupId']: next((t['Value'] for t in g.get('Tags', []) if t['Key'] == 'Name'), g['GroupId']) 
-           for g in ec2.describe_security_groups()['SecurityGroups']}
+def get_vpce_data_with_ip(session=None, account_label=None, catalog=None):
+    # session 미지정 시 설정값으로 생성 (멀티 계정 수집 시 collector에서 카탈로그 주입)
+    if catalog is None:
+        if session is None:
+            import boto3   # 단독 실행 시에만 필요 (collector/CLI 는 세션·카탈로그를 주입)
+            session = boto3.Session(profile_name=AWS_PROFILE, region_name=REGION_NAME)
+        catalog = ResourceCatalog(session)
+    ec2 = catalog.client('ec2')
 
-    vpces = ec2.describe_vpc_endpoints()['VpcEndpoints']
+    # ENI 일괄 조회를 위해 엔드포인트 목록은 먼저 모두 받음 (범위 지정 시 서버 측 필터)
+    vpces = list(catalog.stream('vpc_endpoints'))
+
+    # Interface 엔드포인트 ENI를 미리 모아 일괄 조회
+    scope = catalog.scope
+    eni_index = build_eni_index(ec2, [
+        eni_id for vpce in vpces if vpce['VpcEndpointType'] == 'Interface'
+        for eni_id in vpce.get('NetworkInterfaceIds', [])
+    ], scope.filters('network_interfaces') if scope else None, catalog.peek('network_interfaces'))
+
+    # 이름 매핑용 마스터 데이터 (카탈로그 공유, 범위 지정 시 참조된 서브넷/SG만 조회)
+    vpcs = catalog.vpc_map()
+    subnets = catalog.subnet_names({subnet_id for subnet_id, _ in eni_index.values()})
+    sgs = catalog.sg_tag_names({g['GroupId'] for vpce in vpces for g in vpce.get('Groups', [])})
     all_rows = []
 
     for idx, vpce in enumerate(vpces, 1):
@@ -29,26 +75,27 @@ def get_vpce_data_with_ip():
         vpce_type = vpce['VpcEndpointType']
         
         # 공통 기본 정보 (No, Name, Service, ID, Type, VPC, SG)
-        base_info = {
+        base_info = {'ACCOUNT': account_label} if account_label else {}
+        base_info.update({
             'No.': idx,
-            'Name': next((t['Value'] for t in vpce.get('Tags', []) if t['Key'] == 'Name'), '-'),
+            'Name': tag_name(vpce, '-'),
             'Service Name': vpce['ServiceName'],
             'Endpoint ID': vpce_id,
             'Type': vpce_type,
             'VPC': vpcs.get(vpce['VpcId'], vpce['VpcId']),
             'Security Group': "\n".join([sgs.get(g['GroupId'], g['GroupId']) for g in vpce.get('Groups', [])]) or '-'
-        }
+        })
 
         # Interface 타입: 서브넷별 ENI IP 추출
         if vpce_type == 'Interface' and vpce.get('NetworkInterfaceIds'):
-            # ENI 상세 정보 조회 (Subnet ID와 Private IP 매핑 목적)
-            eni_list = ec2.describe_network_interfaces(NetworkInterfaceIds=vpce['NetworkInterfaceIds'])['NetworkInterfaces']
-            
-            for eni in eni_list:
+            # ENI 인덱스에서 Subnet ID와 Private IP 매핑
+            # (ENI 가 하나도 조회되지 않으면 - 삭제 중 등 - 엔드포인트 행은 Subnet/IP "-" 로 유지)
+            resolved = [eni_index[eni_id] for eni_id in vpce['NetworkInterfaceIds'] if eni_id in eni_index]
+            for subnet_id, private_ip in resolved or [('-', '-')]:
                 row = base_info.copy()
                 row.update({
-                    'Subnet': subnets.get(eni['SubnetId'], eni['SubnetId']),
-                    'Private IP': eni['PrivateIpAddress']
+                    'Subnet': subnets.get(subnet_id, subnet_id),
+                    'Private IP': private_ip
                 })
                 all_rows.append(row)
         
@@ -62,11 +109,15 @@ def get_vpce_data_with_ip():
 
 def save_with_styled_excel(df, filename):
     # 컬럼 순서 조정 (Subnet 뒤에 Private IP 배치)
+    # (멀티 계정 수집 결과면 ACCOUNT 컬럼을 맨 앞에 둔다)
     col_order = ['No.', 'Name', 'Service Name', 'Endpoint ID', 'Type', 'VPC', 'Subnet', 'Private IP', 'Security Group']
-    df = df[col_order]
+    if 'ACCOUNT' in df.columns:
+        col_order = ['ACCOUNT'] + col_order
+    df = df.reindex(columns=col_order)
 
     writer = pd.ExcelWriter(filename, engine='xlsxwriter')
-    df.to_excel(writer, index=False, sheet_name='VPCEndpoints')
+    # 헤더만 pandas로 만들고 데이터는 병합 계획에 따라 직접 기록
+    df.head(0).to_excel(writer, index=False, sheet_name='VPCEndpoints')
     workbook, worksheet = writer.book, writer.sheets['VPCEndpoints']
     
     # 공통 스타일 (가운데 정렬 + 테두리 + 텍스트 줄바꿈)
@@ -78,34 +129,23 @@ def save_with_styled_excel(df, filename):
         worksheet.write(0, col_num, value, header_fmt)
 
     # 병합 로직 (Endpoint ID 기준)
-    # 병합할 열: No(0), Name(1), Service(2), ID(3), Type(4), VPC(5), Security Group(8)
-    merge_cols = [0, 1, 2, 3, 4, 5, 8]
-    
-    for col in merge_cols:
-        start_row = 1
-        while start_row <= len(df):
-            end_row = start_row
-            # Endpoint ID(3번 컬럼)가 같으면 병합 대상으로 판단
-            while end_row < len(df) and df.iloc[end_row, 3] == df.iloc[start_row - 1, 3]:
-                end_row += 1
-            
-            val = df.iloc[start_row - 1, col]
-            if end_row - start_row > 0:
-                worksheet.merge_range(start_row, col, end_row, col, val, fmt)
-            else:
-                worksheet.write(start_row, col, val, fmt)
-            start_row = end_row + 1
-
-    # Subnet(6) 및 Private IP(7) 열 개별 스타일 적용
-    for r_idx in range(1, len(df) + 1):
-        worksheet.write(r_idx, 6, df.iloc[r_idx-1, 6], fmt)
-        worksheet.write(r_idx, 7, df.iloc[r_idx-1, 7], fmt)
-
-    # 열 너비 최적화
-    worksheet.set_column('A:A', 6)   # No.
-    worksheet.set_column('B:D', 35)  # Name, Service, ID
-    worksheet.set_column('E:F', 15)  # Type, VPC
-    worksheet.set_column('G:I', 25)  # Subnet, IP, SG
+    # 병합할 열: (ACCOUNT), No, Name, Service, ID, Type, VPC, Security Group
+    # Subnet 및 Private IP 열은 병합 없이 개별 스타일만 적용
+    merge_names = ['ACCOUNT', 'No.', 'Name', 'Service Name', 'Endpoint ID', 'Type', 'VPC', 'Security Group']
+    merge_cols = [df.columns.get_loc(c) for c in merge_names if c in df.columns]
+    key_col = df.columns.get_loc('Endpoint ID')
+    with PROFILER.span("merge-plan", report="vpcendpoint"):
+        plan = plan_merges(df, merge_cols, key_cols=[key_col])
+    write_planned(worksheet, df, plan, fmt)
+
+    # 열 너비 최적화 (ACCOUNT 컬럼이 있으면 한 칸씩 밀림)
+    off = 1 if 'ACCOUNT' in df.columns else 0
+    if off:
+        worksheet.set_column(0, 0, 15)          # ACCOUNT
+    worksheet.set_column(off, off, 6)           # No.
+    worksheet.set_column(off + 1, off + 3, 35)  # Name, Service, ID
+    worksheet.set_column(off + 4, off + 5, 15)  # Type, VPC
+    worksheet.set_column(off + 6, off + 8, 25)  # Subnet, IP, SG
     
     writer.close()
     print(f"✨ 추출 완료! 파일명: {filename}")
@@ -0,0 +1,202 @@
+import bisect
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# ==========================================
+# 계측 (API 호출 / 단계별 시간·메모리)
+# - botocore 이벤트 훅(before-call / after-call)으로 API별 호출 수, 지연 히스토그램,
+#   다음 페이지 토큰이 있던 응답 수(truncated), 응답 바이트 집계
+# - span("collect" / "expand" / "sort" / "merge-plan" / "write" ...)으로 단계별 시간 (+ 옵션 tracemalloc)
+# - 꺼져 있으면 attach 는 즉시 반환, span 은 공유 nullcontext (오버헤드 거의 없음)
+# ==========================================
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+PAGE_TOKEN_KEYS = ("NextToken", "Marker", "NextMarker", "ContinuationToken")
+
+_NULL_SPAN = nullcontext()
+
+# 응답 크기: content-length 헤더 우선, 없으면 이미 읽은 본문 길이 (Stubber 등 본문 없는 응답은 0)
+def _response_bytes(http_response):
+    if http_response is None:
+        return 0
+    length = http_response.headers.get("content-length")
+    if length:
+        return int(length)
+    try:
+        return len(http_response.content or b"")
+    except AttributeError:
+        return 0
+
+class Profiler:
+    def __init__(self, enabled=False, trace_memory=False):
+        self.enabled = False
+        self.trace_memory = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+        if enabled:
+            self.enable(trace_memory)
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.spans = []
+            self._active_spans = 0
+
+    def enable(self, trace_memory=False):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    # -------------------------
+    # botocore 이벤트 훅
+    # - 래퍼 세션(ScheduledSession.session / SnapshotSession.base)을 따라 events 를 가진 세션에 등록
+    # - 세션 이벤트는 이후 생성되는 client 에 적용 (카탈로그는 client 를 지연 생성)
+    # - unique_id 로 같은 세션에 여러 번 attach 해도 한 번만 등록
+    # -------------------------
+    def attach(self, session):
+        if not self.enabled:
+            return session
+        target = session
+        while target is not None and not hasattr(target, "events"):
+            target = getattr(target, "session", None) or getattr(target, "base", None)
+        if target is not None:
+            target.events.register("before-call", self._before_call, unique_id=f"profiler-before-{id(self)}")
+            target.events.register("after-call", self._after_call, unique_id=f"profiler-after-{id(self)}")
+        return session
+
+    def _before_call(self, model=None, params=None, context=None, **kwargs):
+        if context is not None:
+            context["profiler_started"] = time.perf_counter()
+
+    def _after_call(self, event_name=None, model=None, http_response=None, parsed=None, context=None, **kwargs):
+        if not self.enabled:
+            return
+        started = (context or {}).get("profiler_started")
+        latency_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        service = event_name.split(".")[1] if event_name and event_name.count(".") >= 2 else "?"
+        name = f"{service}.{getattr(model, 'name', '?')}"
+        size = _response_bytes(http_response)
+        truncated = bool(parsed) and any(parsed.get(k) for k in PAGE_TOKEN_KEYS)
+
+        with self._lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = {"calls": 0, "truncated": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                            "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+            stats["calls"] += 1
+            stats["truncated"] += truncated
+            stats["bytes"] += size
+            stats["total_ms"] += latency_ms
+            stats["max_ms"] = max(stats["max_ms"], latency_ms)
+            stats["histogram"][bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    # -------------------------
+    # 단계 span
+    # - tracemalloc 피크는 프로세스 전역이라, 다른 span 이 열려 있지 않을 때만 피크를 초기화
+    #   (동시에 열린 span 들의 peak_mb 는 서로의 할당을 포함할 수 있음)
+    # -------------------------
+    def span(self, stage, **labels):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(stage, labels)
+
+    @contextmanager
+    def _span(self, stage, labels):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        memory = self.trace_memory and tracemalloc.is_tracing()
+        with self._lock:
+            if memory and self._active_spans == 0:
+                tracemalloc.reset_peak()
+            self._active_spans += 1
+        base = tracemalloc.get_traced_memory()[0] if memory else 0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {"stage": stage, **labels, "depth": depth, "thread": threading.current_thread().name,
+                      "wall_s": round(time.perf_counter() - started, 4)}
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record["alloc_mb"] = round((current - base) / 1e6, 2)
+                record["peak_mb"] = round(max(0, peak - base) / 1e6, 2)
+            with self._lock:
+                self._active_spans -= 1
+                self.spans.append(record)
+            self._local.depth = depth
+
+    # -------------------------
+    # 지연 이터레이터 단계 (예: SG 단위 룰 확장이 쓰기와 번갈아 진행될 때)
+    # - 항목을 꺼내는 데 걸린 시간만 합쳐 다 돌고 나면 span 1개로 기록 (소비 측 시간 제외)
+    # -------------------------
+    def timed(self, stage, iterable, **labels):
+        if not self.enabled:
+            return iterable
+        return self._timed(stage, iterable, labels)
+
+    def _timed(self, stage, iterable, labels):
+        depth = getattr(self._local, "depth", 0)
+        spent = 0.0
+        iterator = iter(iterable)
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    spent += time.perf_counter() - started
+                yield item
+        finally:
+            with self._lock:
+                self.spans.append({"stage": stage, **labels, "depth": depth,
+                                   "thread": threading.current_thread().name, "wall_s": round(spent, 4)})
+
+    # -------------------------
+    # 결과 출력
+    # -------------------------
+    def summary(self):
+        with self._lock:
+            calls = {name: dict(stats, histogram=list(stats["histogram"])) for name, stats in self.calls.items()}
+            spans = list(self.spans)
+        for stats in calls.values():
+            stats["avg_ms"] = round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0
+            stats["total_ms"] = round(stats["total_ms"], 2)
+            stats["max_ms"] = round(stats["max_ms"], 2)
+        return {"latency_buckets_ms": LATENCY_BUCKETS_MS, "api": dict(sorted(calls.items())), "spans": spans}
+
+    def print_summary(self):
+        if not self.enabled:
+            return
+        data = self.summary()
+        if data["api"]:
+            print("📊 API 호출 계측")
+            print(f"  {'API':<48}{'calls':>7}{'trunc':>7}{'KB':>10}{'avg ms':>9}{'max ms':>9}")
+            for name, s in data["api"].items():
+                print(f"  {name:<48}{s['calls']:>7}{s['truncated']:>7}{s['bytes'] / 1024:>10.1f}"
+                      f"{s['avg_ms']:>9.1f}{s['max_ms']:>9.1f}")
+        if data["spans"]:
+            print("⏱ 단계별 시간")
+            for span in data["spans"]:
+                labels = " ".join(f"{k}={v}" for k, v in span.items()
+                                  if k not in ("stage", "depth", "thread", "wall_s", "alloc_mb", "peak_mb"))
+                memory = f"  peak {span['peak_mb']:.1f}MB" if "peak_mb" in span else ""
+                print(f"  {'  ' * span['depth']}{span['stage']:<14}{span['wall_s']:>9.3f}s{memory}  {labels}")
+
+    def dump_json(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+# 프로세스 전역 인스턴스 (기본 꺼짐, aws_resource --stats 또는 PROFILER.enable() 로 켬)
+PROFILER = Profiler()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 세로 병합 계획 (Run-Length Encoding)
+# - 셀 단위 df.iloc 루프 대신 컬럼을 정수 코드로 바꿔 한 번에 경계 계산
+# - 병합 범위는 (컬럼, 시작행 배열, 끝행 배열) 로 미리 계산해 writer에 전달
+# ==========================================
+
+# 값이 바뀌는 위치 (첫 행은 항상 경계)
+def _changes(series):
+    codes = pd.factorize(series, use_na_sentinel=False)[0]
+    changed = np.empty(len(codes), dtype=bool)
+    changed[:1] = True
+    np.not_equal(codes[1:], codes[:-1], out=changed[1:])
+    return changed
+
+# 경계 배열 -> (시작, 끝) 인덱스 배열 (0-based, 끝 포함)
+def _runs(boundary):
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], len(boundary)) - 1
+    return starts, ends
+
+# -------------------------
+# 병합 계획 생성
+# - merge_cols: 병합 대상 컬럼 위치 (부모 -> 자식 순서)
+# - key_cols 미지정: 계층 병합 (자식 컬럼은 부모 경계를 넘어 병합되지 않음)
+# - key_cols 지정: 모든 merge_cols를 key 컬럼 값이 같은 구간 기준으로 병합
+# 반환: [(col, starts, ends), ...]
+# -------------------------
+def plan_merges(df, merge_cols, key_cols=None):
+    plan = []
+    if len(df) == 0:
+        return plan
+
+    boundary = np.zeros(len(df), dtype=bool)
+    if key_cols is not None:
+        for col in key_cols:
+            boundary |= _changes(df.iloc[:, col])
+        starts, ends = _runs(boundary)
+        return [(col, starts, ends) for col in merge_cols]
+
+    for col in merge_cols:
+        boundary = boundary | _changes(df.iloc[:, col])
+        starts, ends = _runs(boundary)
+        plan.append((col, starts, ends))
+    return plan
+
+# -------------------------
+# 계획대로 시트에 쓰기 (xlsxwriter)
+# - 병합 컬럼: 구간 길이 > 1 이면 merge_range, 아니면 단일 셀
+# - 나머지 컬럼: write_column 으로 한 번에 기록
+# - first_row: 데이터 시작 행 (헤더 1줄이면 1)
+# -------------------------
+def write_planned(worksheet, df, plan, fmt, first_row=1):
+    merged = set()
+    for col, starts, ends in plan:
+        merged.add(col)
+        values = df.iloc[:, col].to_numpy(dtype=object)[starts].tolist()
+        for start, end, val in zip(starts.tolist(), ends.tolist(), values):
+            if end > start:
+                worksheet.merge_range(first_row + start, col, first_row + end, col, val, fmt)
+            else:
+                worksheet.write(first_row + start, col, val, fmt)
+
+    for col in range(len(df.columns)):
+        if col not in merged:
+            worksheet.write_column(first_row, col, df.iloc[:, col].to_numpy(dtype=object).tolist(), fmt)
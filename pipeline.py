@@ -0,0 +1,93 @@
+import queue
+import threading
+
+# ==========================================
+# 생산자/소비자 파이프라인 (bounded queue)
+# - prefetch: 페이지 조회(네트워크 대기)를 백그라운드 스레드에서 미리 진행하고
+#   소비 측은 받은 페이지부터 행 변환 → 조회와 변환이 겹침
+# - 큐 크기 제한으로 생산이 앞서가도 메모리는 maxsize 개 항목까지만 보유
+# - 생산 측 예외는 소비 측에서 그대로 다시 발생, 소비 측이 중간에 멈추면 생산 스레드도 종료
+# ==========================================
+PREFETCH_PAGES = 4
+_DONE = object()
+
+class _Failure:
+    def __init__(self, exc):
+        self.exc = exc
+
+def prefetch(iterable, maxsize=PREFETCH_PAGES):
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        # 소비 측이 멈췄으면(stop) 대기 중인 put 을 포기
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as exc:
+            put(_Failure(exc))
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name="prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+
+# -------------------------
+# 결과 소비 스레드
+# - submit(item) 으로 넣으면 consumer(item) 을 별도 스레드에서 순서대로 실행
+# - close() 는 남은 항목 처리를 기다리고, 소비 중 난 예외를 다시 발생
+# -------------------------
+class Stage:
+    def __init__(self, consumer, maxsize=PREFETCH_PAGES, name="stage"):
+        self._consumer = consumer
+        self._items = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._items.get()
+            if item is _DONE:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._consumer(item)
+            except BaseException as exc:
+                self._error = exc
+
+    def submit(self, item):
+        self._items.put(item)
+
+    def close(self):
+        self._items.put(_DONE)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
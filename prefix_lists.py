@@ -0,0 +1,111 @@
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from resources import iter_resources
+from scope import FILTER_VALUE_LIMIT
+from snapshot import LookupCache
+
+# ==========================================
+# 관리형 Prefix list 펼치기 (PrefixListId -> 이름 + CIDR 목록)
+# - 리포트가 참조하는 ID 를 먼저 모아 한 번에 해석: describe_managed_prefix_lists 는 ID 필터(200개 단위)로,
+#   항목(get_managed_prefix_list_entries)은 목록마다 페이지 끝까지 스레드풀로 동시 조회
+# - 실행 중에는 ID 마다 한 번만 조회 (카탈로그당 resolver 1개, 리포트 여러 개가 공유)
+# - 실행 간에는 (--snapshot 지정 시) LookupCache 에 (OwnerId, PrefixListId) + Version 으로 보관
+#   → 버전이 그대로면 항목 조회 없이 재사용, 목록이 바뀌면(Version 증가) 다시 조회
+# - 조회되지 않는 ID(권한 없음 / 삭제됨)는 결과에서 빠지고 리포트에는 pl-xxxx 그대로 표기
+# ==========================================
+PREFIX_LIST_CACHE_DB = None   # None 이면 카탈로그 cache_db (--snapshot 지정 시에만 실행 간 캐시, 없으면 매번 조회)
+PREFIX_LIST_TTL = 7 * 24 * 3600      # 버전 키라 길게 유지 (버전이 바뀌면 TTL 과 무관하게 다시 조회)
+MAX_WORKERS = 8
+
+PrefixList = namedtuple("PrefixList", ["id", "name", "version", "cidrs"])
+
+# -------------------------
+# 참조된 ID 모으기
+# -------------------------
+def sg_prefix_list_ids(sgs):
+    return {pl["PrefixListId"] for sg in sgs for key in ("IpPermissions", "IpPermissionsEgress")
+            for perm in sg.get(key) or [] for pl in perm.get("PrefixListIds") or [] if pl.get("PrefixListId")}
+
+def route_prefix_list_ids(route_tables):
+    return {route["DestinationPrefixListId"] for rtb in route_tables for route in rtb.get("Routes", [])
+            if route.get("DestinationPrefixListId")}
+
+# 리포트 표기: 펼친 목록은 CIDR 마다 "CIDR(목록 이름)", 항목이 없으면 "pl-xxxx(이름)", 모르는 ID 는 그대로
+def display_sources(prefix_lists, pl_id):
+    pl = (prefix_lists or {}).get(pl_id)
+    if pl is None:
+        return [pl_id]
+    return [f"{cidr}({pl.name})" for cidr in pl.cidrs] or [f"{pl_id}({pl.name})"]
+
+# RouteIndex / ReachabilityIndex 의 prefix_lists 입력 형태 ({PrefixListId: [CIDR, ...]})
+def cidr_map(prefix_lists):
+    return {pl_id: list(pl.cidrs) for pl_id, pl in (prefix_lists or {}).items()}
+
+# -------------------------
+# 해석기 (카탈로그 1개 단위)
+# -------------------------
+class PrefixListResolver:
+    def __init__(self, catalog, cache_db=PREFIX_LIST_CACHE_DB, max_workers=MAX_WORKERS):
+        self.catalog = catalog
+        cache_db = cache_db or catalog.cache_db
+        self.cache = LookupCache(cache_db, PREFIX_LIST_TTL) if cache_db else None
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._resolved = {}
+        self._requested = set()   # 조회를 시도한 ID (없는 ID 도 다시 조회하지 않음)
+
+    # ids -> {PrefixListId: PrefixList} (요청한 ID 중 해석된 것만)
+    # - 동시에 여러 리포트가 불러도 잠금으로 한 번에 하나씩 → 같은 ID 를 두 번 조회하지 않음
+    def resolve(self, ids):
+        wanted = {i for i in ids if i}
+        with self._lock:
+            missing = sorted(wanted - self._requested)
+            if missing:
+                self._resolved.update(self._fetch(missing))
+                self._requested.update(missing)
+            return {i: self._resolved[i] for i in sorted(wanted) if i in self._resolved}
+
+    def _fetch(self, ids):
+        ec2 = self.catalog.client("ec2")
+        headers = []
+        for i in range(0, len(ids), FILTER_VALUE_LIMIT):
+            chunk = ids[i:i + FILTER_VALUE_LIMIT]
+            headers.extend(iter_resources(ec2, "managed_prefix_lists",
+                                          Filters=[{"Name": "prefix-list-id", "Values": chunk}]))
+
+        # 버전이 같은 캐시는 그대로 사용 (OwnerId 단위로 묶어 조회)
+        resolved = {}
+        if self.cache:
+            by_owner = {}
+            for h in headers:
+                by_owner.setdefault(h.get("OwnerId", ""), {})[h["PrefixListId"]] = h.get("Version")
+            for owner, versions in by_owner.items():
+                for pl_id, value in self.cache.get_many("prefix_list", owner, versions).items():
+                    resolved[pl_id] = PrefixList(pl_id, value["name"], versions[pl_id], value["cidrs"])
+
+        stale = [h for h in headers if h["PrefixListId"] not in resolved]
+        if stale:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(stale)))) as pool:
+                fetched = list(pool.map(lambda h: self._entries(ec2, h), stale))
+            resolved.update((pl.id, pl) for pl in fetched)
+            if self.cache:
+                by_owner = {}
+                for h, pl in zip(stale, fetched):
+                    by_owner.setdefault(h.get("OwnerId", ""), {})[pl.id] = (
+                        pl.version, {"name": pl.name, "cidrs": pl.cidrs})
+                for owner, items in by_owner.items():
+                    self.cache.put_many("prefix_list", owner, items)
+        return resolved
+
+    @staticmethod
+    def _entries(ec2, header):
+        params = {"PrefixListId": header["PrefixListId"]}
+        if header.get("Version") is not None:
+            params["TargetVersion"] = header["Version"]
+        cidrs = []
+        for page in ec2.get_paginator("get_managed_prefix_list_entries").paginate(**params):
+            cidrs.extend(entry["Cidr"] for entry in page.get("Entries", []))
+        return PrefixList(header["PrefixListId"], header.get("PrefixListName") or header["PrefixListId"],
+                          header.get("Version"), cidrs)
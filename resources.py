@@ -0,0 +1,46 @@
+# ==========================================
+# EC2 리소스 이터레이터 (페이지 단위 지연 조회)
+# - describe_* 를 paginator로 끝까지 조회 (대형 계정 잘림 방지)
+# - 리소스를 하나씩 yield → 메모리는 계정 크기가 아닌 페이지 크기에 비례
+# - page_size 로 MaxResults 조정, 나머지 인자(Filters 등)는 그대로 전달
+# ==========================================
+
+# 리소스별 (API, 응답 키, 기본 페이지 크기) - MaxResults 상한은 API마다 다름
+RESOURCE_SPECS = {
+    "vpcs": ("describe_vpcs", "Vpcs", 1000),
+    "subnets": ("describe_subnets", "Subnets", 1000),
+    "route_tables": ("describe_route_tables", "RouteTables", 100),
+    "security_groups": ("describe_security_groups", "SecurityGroups", 1000),
+    "vpc_endpoints": ("describe_vpc_endpoints", "VpcEndpoints", 1000),
+    "network_interfaces": ("describe_network_interfaces", "NetworkInterfaces", 1000),
+    "managed_prefix_lists": ("describe_managed_prefix_lists", "PrefixLists", 100),
+    "transit_gateway_route_tables": ("describe_transit_gateway_route_tables", "TransitGatewayRouteTables", 1000),
+    "transit_gateway_attachments": ("describe_transit_gateway_attachments", "TransitGatewayAttachments", 1000),
+}
+
+def iter_pages(ec2, resource, page_size=None, **params):
+    operation, key, default_size = RESOURCE_SPECS[resource]
+    paginator = ec2.get_paginator(operation)
+    config = {"PageSize": page_size or default_size}
+    for page in paginator.paginate(PaginationConfig=config, **params):
+        yield page[key]
+
+def iter_resources(ec2, resource, page_size=None, **params):
+    for items in iter_pages(ec2, resource, page_size, **params):
+        yield from items
+
+# Name 태그 값 (없으면 default)
+def tag_name(resource, default=None):
+    return next((t['Value'] for t in resource.get('Tags', []) if t['Key'] == 'Name'), default)
+
+# 라우트 대상 표기 (local 게이트웨이는 "local", 대상 없음은 "-")
+def route_target(route):
+    if route.get('GatewayId') == 'local':
+        return 'local'
+    return route.get('GatewayId') or route.get('TransitGatewayId') or \
+        route.get('NatGatewayId') or route.get('NetworkInterfaceId') or \
+        route.get('VpcPeeringConnectionId') or '-'
+
+# ID -> Name 태그 맵 (Name 없으면 ID)
+def name_map(items, id_key):
+    return {item[id_key]: tag_name(item, item[id_key]) for item in items}
@@ -0,0 +1,194 @@
+import ipaddress
+from collections import namedtuple
+
+from prefix_lists import cidr_map, route_prefix_list_ids
+from resources import route_target
+
+# ==========================================
+# 라우트 조회 (Longest Prefix Match)
+# - "이 서브넷에서 이 목적지 IP로 가면 어느 라우팅 테이블의 어떤 대상으로 가는가?"
+# - 라우팅 테이블마다 IPv4/IPv6 목적지를 이진 radix trie 로 컴파일
+#   → 조회는 목적지 주소 비트 수(32/128)에 비례, 라우트 수와 무관
+# - 서브넷 → 라우팅 테이블: 명시적 연결 우선, 없으면 VPC 메인 라우팅 테이블
+# - blackhole 라우트도 일치 대상 (AWS 와 동일하게 더 구체적인 라우트가 없으면 해당 라우트에서 폐기)
+# - Prefix list 목적지는 prefix_lists 로 CIDR 목록을 넘기면 펼쳐서 포함 (없으면 unresolved 에 기록)
+# ==========================================
+# route_target 에 없는 대상 (조회 결과에서만 사용)
+EXTRA_TARGET_KEYS = ('EgressOnlyInternetGatewayId', 'InstanceId', 'CarrierGatewayId',
+                     'LocalGatewayId', 'CoreNetworkArn')
+
+RouteMatch = namedtuple("RouteMatch", ["route_table_id", "destination", "target", "state", "association"])
+
+class RadixTrie:
+    # 노드: [0 자식, 1 자식, 값]
+    def __init__(self, bits):
+        self.bits = bits
+        self.root = [None, None, None]
+        self.size = 0
+
+    # 같은 프리픽스가 이미 있으면 먼저 넣은 값 유지 (CIDR 라우트가 prefix list 보다 우선)
+    def insert(self, network, prefixlen, value):
+        node = self.root
+        for shift in range(self.bits - 1, self.bits - 1 - prefixlen, -1):
+            bit = (network >> shift) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, None]
+            node = child
+        if node[2] is None:
+            node[2] = value
+            self.size += 1
+
+    def longest_match(self, address):
+        node = self.root
+        best = node[2]
+        shift = self.bits - 1
+        while shift >= 0:
+            node = node[(address >> shift) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                best = node[2]
+            shift -= 1
+        return best
+
+# -------------------------
+# 라우팅 테이블 1개 컴파일
+# -------------------------
+class CompiledRouteTable:
+    def __init__(self, rtb, prefix_lists=None):
+        self.route_table_id = rtb['RouteTableId']
+        self.vpc_id = rtb.get('VpcId')
+        self.tries = {4: RadixTrie(32), 6: RadixTrie(128)}
+        self.unresolved = set()
+
+        expanded = []
+        for route in rtb.get('Routes', []):
+            target = route_target(route)
+            if target == '-':
+                target = next((route[k] for k in EXTRA_TARGET_KEYS if route.get(k)), '-')
+            state = route.get('State', 'active')
+            for key in ('DestinationCidrBlock', 'DestinationIpv6CidrBlock'):
+                if route.get(key):
+                    self._insert(route[key], (route[key], target, state))
+            pl_id = route.get('DestinationPrefixListId')
+            if pl_id:
+                cidrs = _resolve(prefix_lists, pl_id)
+                if cidrs is None:
+                    self.unresolved.add(pl_id)
+                else:
+                    expanded.extend((cidr, (pl_id, target, state)) for cidr in cidrs)
+        # 같은 CIDR 이면 직접 지정한 CIDR 라우트 우선
+        for cidr, value in expanded:
+            self._insert(cidr, value)
+
+    def _insert(self, cidr, value):
+        net = ipaddress.ip_network(cidr, strict=False)
+        self.tries[net.version].insert(int(net.network_address), net.prefixlen, value)
+
+    # 반환: (목적지, 대상, 상태) 또는 None
+    def lookup(self, address):
+        address = _address(address)
+        return self.tries[address.version].longest_match(int(address))
+
+def _resolve(prefix_lists, pl_id):
+    if prefix_lists is None:
+        return None
+    if callable(prefix_lists):
+        return prefix_lists(pl_id)
+    return prefix_lists.get(pl_id)
+
+def _address(value):
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return value
+    return ipaddress.ip_address(value)
+
+# -------------------------
+# 서브넷 연결 + 라우트 조회 인덱스
+# route_tables: describe_route_tables 결과, subnets: describe_subnets 결과 (메인 테이블 폴백/IP → 서브넷용)
+# -------------------------
+class RouteIndex:
+    def __init__(self, route_tables, subnets=(), prefix_lists=None):
+        self.tables = {}
+        self.explicit = {}      # SubnetId -> RouteTableId
+        self.main = {}          # VpcId -> RouteTableId
+        for rtb in route_tables:
+            table = CompiledRouteTable(rtb, prefix_lists)
+            self.tables[table.route_table_id] = table
+            for assoc in rtb.get('Associations', []):
+                if assoc.get('Main'):
+                    self.main[rtb.get('VpcId')] = table.route_table_id
+                elif assoc.get('SubnetId'):
+                    self.explicit[assoc['SubnetId']] = table.route_table_id
+
+        # 서브넷 CIDR trie (VPC 별): 출발지를 IP 로 지정할 때 서브넷 찾기
+        self.subnet_vpc = {}
+        self.subnet_tries = {}
+        for subnet in subnets:
+            self.subnet_vpc[subnet['SubnetId']] = subnet.get('VpcId')
+            for cidr in [subnet.get('CidrBlock')] + [a.get('Ipv6CidrBlock') for a in
+                                                     subnet.get('Ipv6CidrBlockAssociationSet', [])]:
+                if cidr:
+                    net = ipaddress.ip_network(cidr, strict=False)
+                    tries = self.subnet_tries.setdefault(subnet.get('VpcId'), {4: RadixTrie(32), 6: RadixTrie(128)})
+                    tries[net.version].insert(int(net.network_address), net.prefixlen, subnet['SubnetId'])
+
+    # prefix_lists 미지정 + 카탈로그가 펼치기 모드면 참조된 prefix list 를 해석해 사용
+    @classmethod
+    def from_catalog(cls, catalog, prefix_lists=None):
+        route_tables = catalog.resources('route_tables')
+        if prefix_lists is None and catalog.expand_prefix_lists:
+            prefix_lists = cidr_map(catalog.prefix_lists(route_prefix_list_ids(route_tables)))
+        return cls(route_tables, catalog.subnets(), prefix_lists)
+
+    @property
+    def unresolved(self):
+        return set().union(*(t.unresolved for t in self.tables.values())) if self.tables else set()
+
+    # 출발지 IP 가 속한 서브넷 (vpc_id 지정 시 해당 VPC 안에서만)
+    def subnet_for(self, address, vpc_id=None):
+        address = _address(address)
+        vpcs = [vpc_id] if vpc_id else list(self.subnet_tries)
+        matches = {self.subnet_tries[v][address.version].longest_match(int(address))
+                   for v in vpcs if v in self.subnet_tries}
+        matches.discard(None)
+        if len(matches) > 1:
+            raise ValueError(f"{address} 가 여러 VPC 서브넷에 속함: {sorted(matches)} (vpc_id 지정 필요)")
+        return matches.pop() if matches else None
+
+    # 서브넷의 라우팅 테이블: (RouteTableId, "explicit" | "main")
+    def table_for(self, subnet_id):
+        if subnet_id in self.explicit:
+            return self.explicit[subnet_id], "explicit"
+        main = self.main.get(self.subnet_vpc.get(subnet_id))
+        if main is None:
+            raise KeyError(f"라우팅 테이블을 찾을 수 없는 서브넷: {subnet_id}")
+        return main, "main"
+
+    # source: 서브넷 ID 또는 출발지 IP
+    def lookup(self, source, destination, vpc_id=None):
+        return self.lookup_many(source, [destination], vpc_id)[0]
+
+    # 같은 출발지에서 여러 목적지 조회 (서브넷/테이블 결정은 한 번만)
+    def lookup_many(self, source, destinations, vpc_id=None):
+        subnet_id = source if str(source).startswith("subnet-") else self.subnet_for(source, vpc_id)
+        if subnet_id is None:
+            raise KeyError(f"출발지 IP 가 속한 서브넷이 없음: {source}")
+        rtb_id, association = self.table_for(subnet_id)
+        table = self.tables[rtb_id]
+        results = []
+        for destination in destinations:
+            match = table.lookup(destination)
+            if match is None:
+                results.append(None)
+            else:
+                dest, target, state = match
+                results.append(RouteMatch(rtb_id, dest, target, state, association))
+        return results
+
+# 단독 실행은 통합 CLI 의 route 명령과 같음 (옵션은 aws_resource.py route --help)
+if __name__ == "__main__":
+    import sys
+
+    import aws_resource
+    sys.exit(aws_resource.main(["route", *sys.argv[1:]]))
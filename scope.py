@@ -0,0 +1,75 @@
+# ==========================================
+# 리포트 범위 (서버 측 필터 pushdown)
+# - VPC ID / 태그 / SG 이름 패턴 / 엔드포인트 서비스명을 describe_* 의 EC2 Filters 로 변환
+#   → AWS 가 범위 안의 리소스만 반환 (전송/처리량이 범위에 비례)
+# - 태그·이름·서비스 조건은 리포트 대상 리소스(라우팅 테이블, SG, 엔드포인트)에 적용
+#   VPC/서브넷 같은 마스터 데이터는 VPC ID 범위 또는 참조된 ID 로만 좁힘 (catalog.lookup)
+# - 같은 필터 안의 값은 OR, 서로 다른 필터는 AND (EC2 Filters 규칙 그대로)
+# ==========================================
+FILTER_VALUE_LIMIT = 200   # EC2 필터 1개당 값 최대 개수
+
+# 리소스별 적용할 범위 조건 -> EC2 필터 이름
+SCOPE_FILTERS = {
+    "vpcs": {"vpc_ids": "vpc-id"},
+    "subnets": {"vpc_ids": "vpc-id"},
+    "route_tables": {"vpc_ids": "vpc-id", "tags": "tag"},
+    "security_groups": {"vpc_ids": "vpc-id", "tags": "tag", "sg_names": "group-name"},
+    "vpc_endpoints": {"vpc_ids": "vpc-id", "tags": "tag", "services": "service-name"},
+    "network_interfaces": {"vpc_ids": "vpc-id"},
+}
+
+# ID 목록 조회용 필터 이름 (참조된 ID만 가져올 때)
+ID_FILTERS = {
+    "vpcs": ("vpc-id", "VpcId"),
+    "subnets": ("subnet-id", "SubnetId"),
+    "security_groups": ("group-id", "GroupId"),
+    "network_interfaces": ("network-interface-id", "NetworkInterfaceId"),
+}
+
+class Scope:
+    # tags: {Key: [Value, ...]} (값 목록이 비어 있으면 키 존재만 검사)
+    # sg_names: GroupName 패턴 (EC2 필터 와일드카드 * ? 지원)
+    def __init__(self, vpc_ids=None, tags=None, sg_names=None, services=None):
+        self.vpc_ids = sorted(set(vpc_ids or []))
+        self.tags = {k: sorted(set(v or [])) for k, v in (tags or {}).items()}
+        self.sg_names = sorted(set(sg_names or []))
+        self.services = sorted(set(services or []))
+        for name, values in (("vpc-id", self.vpc_ids), ("group-name", self.sg_names), ("service-name", self.services)):
+            if len(values) > FILTER_VALUE_LIMIT:
+                raise ValueError(f"{name} 범위 값은 {FILTER_VALUE_LIMIT}개까지 지정 가능: {len(values)}")
+
+    # CLI 인자 파싱: tags 는 "Key=V1,V2" 또는 "Key" 문자열 목록
+    @classmethod
+    def parse(cls, vpc_ids=None, tags=None, sg_names=None, services=None):
+        tag_map = {}
+        for spec in tags or []:
+            key, _, values = spec.partition("=")
+            tag_map.setdefault(key, []).extend(v for v in values.split(",") if v)
+        scope = cls(vpc_ids, tag_map, sg_names, services)
+        return scope if scope else None
+
+    def __bool__(self):
+        return bool(self.vpc_ids or self.tags or self.sg_names or self.services)
+
+    def __repr__(self):
+        return (f"Scope(vpc_ids={self.vpc_ids}, tags={self.tags}, "
+                f"sg_names={self.sg_names}, services={self.services})")
+
+    # describe_* 에 넘길 Filters (범위 조건이 없는 리소스는 빈 목록)
+    def filters(self, resource):
+        filters = []
+        for attr, name in SCOPE_FILTERS.get(resource, {}).items():
+            if attr == "tags":
+                for key, values in self.tags.items():
+                    if values:
+                        filters.append({'Name': f"tag:{key}", 'Values': values})
+                    else:
+                        filters.append({'Name': "tag-key", 'Values': [key]})
+            elif getattr(self, attr):
+                filters.append({'Name': name, 'Values': getattr(self, attr)})
+        return filters
+
+# scope 가 없거나 조건이 없으면 추가 인자 없음 (스냅샷 캐시 키도 기존과 동일)
+def scope_params(scope, resource):
+    filters = scope.filters(resource) if scope else []
+    return {'Filters': filters} if filters else {}
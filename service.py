@@ -0,0 +1,483 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import collector
+import export
+from catalog import ResourceCatalog
+from resources import iter_resources
+from route_lookup import RouteIndex
+from sg_reach import ReachabilityIndex
+from throttle import RequestScheduler
+
+# ==========================================
+# 수집 서비스 (상주 모드)
+# - 대상별 카탈로그를 메모리에 유지하고 리소스 유형마다 주기적으로 다시 조회
+#   (조회는 백그라운드, 교체는 한 번에 → 조회 중에도 기존 인벤토리로 응답)
+# - 다시 조회한 결과가 이전과 같으면 버전을 올리지 않음 → 응답 캐시 유지
+# - 로컬 HTTP 로 리포트(xlsx/csv/jsonl/parquet)와 JSON 조회 제공
+#   응답은 (응답이 읽는 항목들의 대상별 버전, 경로, 쿼리) 키로 캐시
+#   → 관련 항목이 바뀌면 새로 생성, 다른 항목 갱신은 캐시에 영향 없음 (SG 갱신이 라우팅 리포트 캐시를 버리지 않음)
+# - 요청마다 처리 시간(ms)을 로그/Server-Timing 헤더/상태 API 로 노출
+#
+# GET  /status                                 인벤토리 항목별 버전·갱신 시각·건수, 요청 지연 통계
+# GET  /reports/<리포트>?format=xlsx&target=DEV  리포트 파일 (collector.REPORTS)
+# GET  /inventory/<리소스>?target=&id=           원본 describe 결과 (JSON)
+# GET  /query/sg?protocol=tcp&port=5432&source=10.20.0.0/16[&direction=&match=&transitive=1]
+# GET  /query/route?source=subnet-..|IP&dest=IP[,IP...][&vpc=]
+# POST /refresh[?target=&resource=&wait=1]      즉시 다시 조회 (대상/리소스 생략 시 전체)
+# ==========================================
+HOST = "127.0.0.1"
+PORT = 8787
+MAX_WORKERS = 8
+CACHE_ENTRIES = 128
+SCHEDULER_TICK = 1.0   # 갱신 주기 확인 간격 (초)
+
+# 항목별 갱신 주기 (초) - EC2 리소스는 카탈로그 리소스명, ssouser / permissionset / tgwroute 는 리포트 결과 자체
+# (tgwroute 리포트가 읽는 TGW 라우팅 테이블 / attachment 목록도 따로 갱신)
+REFRESH_INTERVALS = {
+    "vpcs": 3600,
+    "subnets": 3600,
+    "route_tables": 300,
+    "security_groups": 120,
+    "vpc_endpoints": 600,
+    "network_interfaces": 300,
+    "transit_gateway_route_tables": 300,
+    "transit_gateway_attachments": 300,
+    "ssouser": 1800,
+    "permissionset": 1800,
+    "tgwroute": 300,
+}
+
+# 갱신 시 범위 필터에 더할 필터: ENI 는 엔드포인트 리포트가 쓰는 엔드포인트 ENI 만 (계정 전체 ENI 를 받지 않음)
+REFRESH_FILTERS = {
+    "network_interfaces": [{'Name': 'interface-type', 'Values': ['vpc_endpoint']}],
+}
+
+# 응답 캐시 키에 넣을 항목 (응답이 읽는 항목의 버전만 비교)
+# - 리포트 단위로 갱신하는 항목(ssouser 등)은 항목 자신, 목록에 없는 리포트는 전체 인벤토리 버전
+REPORT_DEPENDENCIES = {
+    "routetable": ("vpcs", "route_tables"),
+    "securitygroup": ("vpcs", "security_groups"),
+    "securitygroup2": ("vpcs", "security_groups"),
+    "vpcendpoint": ("vpcs", "subnets", "security_groups", "vpc_endpoints", "network_interfaces"),
+}
+QUERY_DEPENDENCIES = {
+    "sg": ("security_groups",),
+    "route": ("route_tables", "subnets"),
+}
+
+CONTENT_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+class NotFound(Exception):
+    pass
+
+# 이전 값과 같은지 (DataFrame 은 equals 로 비교)
+def _same(previous, value):
+    if previous is None or value is None:
+        return previous is value
+    if hasattr(value, "equals"):
+        return value.equals(previous)
+    return previous == value
+
+# -------------------------
+# 인벤토리
+# - 대상마다 ResourceCatalog 1개 (리포트 생성 코드는 collector 와 동일하게 카탈로그를 읽음)
+# - 항목 상태: 버전, 마지막 갱신 시각/소요, 건수, 오류, 다음 갱신 시각
+# -------------------------
+class Inventory:
+    def __init__(self, targets, session_factory=None, scope=None, throttle=collector.THROTTLE,
+                 intervals=None, max_workers=MAX_WORKERS):
+        self.targets = collector.parse_targets(targets)
+        self.titles = dict(zip(self.targets, collector.sheet_titles(self.targets)))
+        self.intervals = {**REFRESH_INTERVALS, **(intervals or {})}
+        self.schedulers = {t: RequestScheduler() for t in self.targets} if throttle else {}
+        self.catalogs = {t: ResourceCatalog(collector.open_session(t, session_factory,
+                                                                   scheduler=self.schedulers.get(t)), scope)
+                         for t in self.targets}
+        self.version = 0
+        self.state = {(t, name): {"version": 0, "refreshed_at": None, "duration_ms": None, "items": None,
+                                  "error": None, "next_due": 0.0}
+                      for t in self.targets for name in self.intervals}
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._stop = threading.Event()
+        self._ticker = None
+
+    # 대상 선택: 시트명(라벨) 목록, 없으면 전체
+    def select(self, names=None):
+        if not names:
+            return list(self.targets)
+        wanted = set(names)
+        selected = [t for t in self.targets if self.titles[t] in wanted or t.label in wanted]
+        if not selected:
+            raise NotFound(f"대상 없음: {', '.join(sorted(wanted))}")
+        return selected
+
+    # 항목 1개 다시 조회 (이미 진행 중이면 그 작업을 공유) -> Future
+    def refresh(self, target, name):
+        key = (target, name)
+        if key not in self.state:
+            raise NotFound(f"갱신 항목 없음: {name}")
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = self._pool.submit(self._load, target, name)
+        return future
+
+    def _load(self, target, name):
+        key = (target, name)
+        catalog = self.catalogs[target]
+        if name in collector.REPORTS:
+            # 리포트끼리 공유하는 카탈로그 조회(SHARED_KEYS)는 버리고 새로 조회
+            catalog.forget(*getattr(collector.report_module(name), "SHARED_KEYS", ()))
+            loader = lambda: collector.REPORTS[name](catalog, target)
+        elif name in REFRESH_FILTERS:
+            scope_filters = catalog.scope.filters(name) if catalog.scope else []
+            loader = lambda: list(iter_resources(catalog.client("ec2"), name,
+                                                 Filters=REFRESH_FILTERS[name] + scope_filters))
+        else:
+            loader = None
+        started = time.perf_counter()
+        error, previous, value = None, None, None
+        try:
+            previous, value = catalog.refresh(name, loader)
+        except Exception as exc:   # 항목 1개 실패가 서비스 전체를 멈추지 않도록 상태에만 기록
+            error = f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            state = self.state[key]
+            state.update(refreshed_at=time.time(), duration_ms=round((time.perf_counter() - started) * 1e3, 1),
+                         error=error, next_due=time.monotonic() + self.intervals[name])
+            if error is None:
+                state["items"] = len(value) if value is not None else 0
+                if state["version"] == 0 or not _same(previous, value):
+                    self.version += 1
+                    state["version"] = self.version
+            del self._inflight[key]
+            return state["version"]
+
+    def refresh_all(self, targets=None, names=None):
+        return [self.refresh(t, name) for t in (targets or self.targets) for name in (names or self.intervals)]
+
+    # 주기 갱신 스레드 (start 시 전체 1회 조회 후 시작)
+    def start(self, wait=True):
+        futures = self.refresh_all()
+        if wait:
+            for future in futures:
+                future.result()
+        self._ticker = threading.Thread(target=self._tick, name="inventory", daemon=True)
+        self._ticker.start()
+
+    def _tick(self):
+        while not self._stop.wait(SCHEDULER_TICK):
+            now = time.monotonic()
+            with self._lock:
+                due = [key for key, state in self.state.items()
+                       if state["next_due"] <= now and key not in self._inflight]
+            for target, name in due:
+                self.refresh(target, name)
+
+    def stop(self):
+        self._stop.set()
+        self._pool.shutdown(wait=True)
+
+    # 항목 버전 (조회 인덱스 캐시 키)
+    def versions(self, target, *names):
+        with self._lock:
+            return tuple(self.state[(target, name)]["version"] for name in names)
+
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            items = []
+            for (target, name), state in self.state.items():
+                row = {"target": self.titles[target], "region": target.region, "resource": name,
+                       **{k: v for k, v in state.items() if k != "next_due"},
+                       "next_refresh_s": max(0.0, round(state["next_due"] - now, 1)),
+                       "refreshing": (target, name) in self._inflight}
+                items.append(row)
+            return {"version": self.version, "items": items}
+
+# 응답 캐시 (LRU, 키에 관련 항목 버전 포함)
+class ResponseCache:
+    def __init__(self, size=CACHE_ENTRIES):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+# -------------------------
+# 요청 처리 (HTTP 와 분리: 벤치/테스트에서 직접 호출 가능)
+# handle() -> (상태 코드, Content-Type, 본문 bytes, 추가 헤더)
+# -------------------------
+class Service:
+    def __init__(self, inventory, cache_entries=CACHE_ENTRIES):
+        self.inventory = inventory
+        self.cache = ResponseCache(cache_entries)
+        self._indexes = {}
+        self._index_lock = threading.Lock()
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def handle(self, method, path, params):
+        parts = [p for p in path.split("/") if p]
+        if method == "POST":
+            if parts != ["refresh"]:
+                raise NotFound(path)
+            return self._json(self.refresh(params)) + ({"X-Cache": "bypass"},)
+        if parts == ["status"]:
+            return self._json(self.status()) + ({"X-Cache": "bypass"},)
+
+        key = (self._versions(parts, params), path, tuple(sorted(params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached + ({"X-Cache": "hit"},)
+        if len(parts) == 2 and parts[0] == "reports":
+            response = self.report(parts[1], params)
+        elif len(parts) == 2 and parts[0] == "inventory":
+            response = self._json(self.resources(parts[1], params))
+        elif parts == ["query", "sg"]:
+            response = self._json(self.query_sg(params))
+        elif parts == ["query", "route"]:
+            response = self._json(self.query_route(params))
+        else:
+            raise NotFound(path)
+        self.cache.put(key, response)
+        return response + ({"X-Cache": "miss"},)
+
+    @staticmethod
+    def _json(data):
+        return 200, "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False, default=str).encode()
+
+    def _targets(self, params):
+        return self.inventory.select([v for v in params.get("target", "").split(",") if v])
+
+    # 응답이 읽는 항목들의 대상별 버전 (알 수 없는 경로는 전체 인벤토리 버전)
+    def _versions(self, parts, params):
+        names = None
+        if len(parts) == 2 and parts[0] == "reports":
+            names = (parts[1],) if parts[1] in REFRESH_INTERVALS else REPORT_DEPENDENCIES.get(parts[1])
+        elif len(parts) == 2 and parts[0] == "inventory" and parts[1] in REFRESH_INTERVALS:
+            names = (parts[1],)
+        elif len(parts) == 2 and parts[0] == "query":
+            names = QUERY_DEPENDENCIES.get(parts[1])
+        if names is None:
+            return self.inventory.version
+        return tuple(self.inventory.versions(t, *names) for t in self._targets(params))
+
+    def report(self, name, params):
+        if name not in collector.REPORTS:
+            raise NotFound(f"리포트 없음: {name} ({', '.join(collector.REPORTS)})")
+        fmt = params.get("format", "xlsx")
+        if fmt not in CONTENT_TYPES:
+            raise ValueError(f"지원하지 않는 출력 형식: {fmt!r} ({', '.join(export.FORMATS)})")
+        targets = self._targets(params)
+        if name in REFRESH_INTERVALS:   # 리포트 단위로 갱신하는 항목은 카탈로그 값 그대로
+            results = [self.inventory.catalogs[t].peek(name) for t in targets]
+        else:
+            results = [collector.REPORTS[name](self.inventory.catalogs[t], t) for t in targets]
+        titles = [self.inventory.titles[t] for t in targets]
+        filename = os.path.basename(export.export_path(collector.report_file(name), fmt))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, filename)
+            collector.write_report(name, titles, results, fmt, path)
+            if not os.path.exists(path):
+                raise NotFound(f"{name}: 데이터 없음")
+            with open(path, "rb") as f:
+                body = f.read()
+        return 200, CONTENT_TYPES[fmt], body
+
+    def resources(self, name, params):
+        if name not in REFRESH_INTERVALS or name in collector.REPORTS:
+            raise NotFound(f"리소스 없음: {name}")
+        ids = {v for v in params.get("id", "").split(",") if v}
+        out = {}
+        for t in self._targets(params):
+            items = self.inventory.catalogs[t].resources(name)
+            if ids:
+                items = [item for item in items if ids & {v for v in item.values() if isinstance(v, str)}]
+            out[self.inventory.titles[t]] = items
+        return out
+
+    # 대상별 조회 인덱스 (관련 항목 버전이 같으면 재사용)
+    # - 요청 스레드가 동시에 읽고 쓰므로 사전 접근은 잠금 안에서, 생성은 잠금 밖에서
+    #   (같은 버전을 두 스레드가 동시에 만들면 결과가 같으므로 나중 것으로 덮어써도 무방)
+    def _index(self, kind, target, names, build):
+        versions = self.inventory.versions(target, *names)
+        with self._index_lock:
+            cached = self._indexes.get((kind, target))
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        index = build(self.inventory.catalogs[target])
+        with self._index_lock:
+            self._indexes[(kind, target)] = (versions, index)
+        return index
+
+    def query_sg(self, params):
+        for required in ("protocol", "source"):
+            if not params.get(required):
+                raise ValueError(f"{required} 파라미터 필요")
+        port = params.get("port")
+        if port:
+            lo, _, hi = port.partition("-")
+            port = (int(lo), int(hi or lo))
+        out = []
+        for t in self._targets(params):
+            index = self._index("sg", t, QUERY_DEPENDENCIES["sg"], ReachabilityIndex.from_catalog)
+            matches = index.query(params["protocol"], port or None, params["source"],
+                                  params.get("direction", "inbound"), params.get("match", "contains"),
+                                  params.get("transitive") in ("1", "true", "yes"))
+            out.extend({"target": self.inventory.titles[t], **m._asdict()} for m in matches)
+        return out
+
+    def query_route(self, params):
+        for required in ("source", "dest"):
+            if not params.get(required):
+                raise ValueError(f"{required} 파라미터 필요")
+        destinations = [v for v in params["dest"].split(",") if v]
+        out = []
+        for t in self._targets(params):
+            index = self._index("route", t, QUERY_DEPENDENCIES["route"], RouteIndex.from_catalog)
+            try:
+                matches = index.lookup_many(params["source"], destinations, params.get("vpc"))
+            except KeyError:   # 이 대상에 없는 서브넷/IP
+                continue
+            # dest: 조회한 주소, destination: 일치한 라우트의 목적지 CIDR
+            out.extend({"target": self.inventory.titles[t], "dest": d,
+                        **(m._asdict() if m else {"route_table_id": None})}
+                       for d, m in zip(destinations, matches))
+        return out
+
+    def refresh(self, params):
+        targets = self._targets(params)
+        names = [v for v in params.get("resource", "").split(",") if v] or None
+        started = time.perf_counter()
+        futures = self.inventory.refresh_all(targets, names)
+        if params.get("wait", "1") in ("1", "true", "yes"):
+            for future in futures:
+                future.result()
+        return {"version": self.inventory.version, "refreshed": len(futures),
+                "elapsed_ms": round((time.perf_counter() - started) * 1e3, 1)}
+
+    # 요청 지연 통계 (경로 종류별)
+    def record(self, route, elapsed_ms, cache):
+        with self._stats_lock:
+            stats = self._stats.setdefault(route, {"requests": 0, "hits": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["requests"] += 1
+            stats["hits"] += cache == "hit"
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def status(self):
+        with self._stats_lock:
+            requests = {route: {"requests": s["requests"], "hits": s["hits"],
+                                "avg_ms": round(s["total_ms"] / s["requests"], 2), "max_ms": round(s["max_ms"], 2)}
+                        for route, s in sorted(self._stats.items())}
+        return {**self.inventory.status(), "requests": requests}
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        service = self.server.service
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            status, ctype, body, headers = service.handle(method, url.path, params)
+        except NotFound as exc:
+            status, ctype, body = Service._json({"error": str(exc)})
+            status, headers = 404, {}
+        except (ValueError, KeyError) as exc:
+            status, ctype, body = Service._json({"error": str(exc)})
+            status, headers = 400, {}
+        except Exception as exc:   # 요청 1건 오류로 연결만 끊기지 않도록 500 으로 응답
+            status, ctype, body = Service._json({"error": f"{type(exc).__name__}: {exc}"})
+            status, headers = 500, {}
+        elapsed_ms = (time.perf_counter() - started) * 1e3
+        parts = url.path.strip("/").split("/")
+        route = "/".join(parts[:2])
+        service.record(route, elapsed_ms, headers.get("X-Cache"))
+
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Inventory-Version", str(service.inventory.version))
+        self.send_header("Server-Timing", f"app;dur={elapsed_ms:.2f}")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if not self.server.quiet:
+            print(f"{method} {self.path} {status} {elapsed_ms:.2f}ms {headers.get('X-Cache', '-')}")
+
+    def log_message(self, format, *args):   # 기본 접근 로그 대신 _dispatch 의 지연 로그 사용
+        pass
+
+def make_server(service, host=HOST, port=PORT, quiet=False):
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    return server
+
+# -------------------------
+# 인벤토리 적재 후 HTTP 서비스 실행 (Ctrl+C 로 종료)
+# synthetic: AWS 대신 합성 계정 규모 (synthetic.SCALES) - 로컬 확인/벤치용
+# -------------------------
+def serve(targets=None, host=HOST, port=PORT, scope=None, synthetic=None, latency=0.0, throttle=collector.THROTTLE,
+          quiet=False):
+    factory = None
+    if synthetic:
+        from synthetic import SyntheticAccount, session_factory
+        factory = session_factory(SyntheticAccount.scale(synthetic), latency=latency)
+    inventory = Inventory(targets or collector.TARGETS, factory, scope, throttle=throttle)
+    started = time.perf_counter()
+    inventory.start()
+    print(f"⏱ 인벤토리 적재: 대상 {len(inventory.targets)}개, {time.perf_counter() - started:.1f}s "
+          f"(버전 {inventory.version})")
+    server = make_server(Service(inventory), host, port, quiet)
+    print(f"🌐 http://{host}:{server.server_address[1]}/status")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        inventory.stop()
+
+# 단독 실행은 통합 CLI 의 serve 명령과 같음 (옵션은 aws_resource.py serve --help)
+if __name__ == "__main__":
+    import sys
+
+    import aws_resource
+    sys.exit(aws_resource.main(["serve", *sys.argv[1:]]))
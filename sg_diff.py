@@ -0,0 +1,146 @@
+import argparse
+import json
+
+import pandas as pd
+
+from get_securitygroup import build_sg_name_map, expand_rules, get_sg_data
+from snapshot import SnapshotSession, SnapshotStore
+
+# ==========================================
+# 1. 설정 (비교 대상)
+# ==========================================
+ACCOUNT_LABEL = "DEV"
+REGION_NAME = "ap-northeast-2"
+OUTPUT_FILE = "security_groups_changes.xlsx"
+# ==========================================
+
+COLUMNS = ['Change', 'VPC Name', 'Security Groups Name', 'Group ID', 'Direction',
+           'Type', 'Port Range', 'Source', '비고 (이전)', '비고 (현재)']
+
+# -------------------------
+# 스냅샷에서 SG 목록 로드 (AWS 호출 없이 replay)
+# -------------------------
+def load_sgs(db_path, account=ACCOUNT_LABEL, region=REGION_NAME):
+    session = SnapshotSession(SnapshotStore(db_path), account, region, mode="replay")
+    return get_sg_data(session)
+
+# -------------------------
+# 룰 인덱스: {GroupId: {(Direction, Type, PortRange, Source): (Remark, ...)}}
+# - expand_rules 와 같은 정규화 (proto "all", 포트 범위 문자열, 소스 분리)
+# - 해시 키(dict)로 두 스냅샷을 O(n) 비교
+# - SG 참조 표기는 양쪽 모두 같은 이름 맵을 써서 SG 이름 변경이 룰 변경으로 잡히지 않게 함
+# - 같은 키로 펼쳐지는 룰이 여럿이면 (예: 펼친 prefix list CIDR 와 같은 CIDR 룰) 비고를 모두 보관 (정렬 튜플)
+# -------------------------
+def index_rules(sgs, sg_name_by_id):
+    index = {}
+    for sg in sgs:
+        rules = {}
+        for direction, key in (("Inbound", "IpPermissions"), ("Outbound", "IpPermissionsEgress")):
+            perms = sg.get(key) or []
+            if not perms:
+                continue
+            for proto, pr, src, remark in expand_rules(perms, sg_name_by_id):
+                rules.setdefault((direction, proto, pr, src), []).append(remark)
+        index[sg.get("GroupId") or ""] = {key: tuple(sorted(remarks)) for key, remarks in rules.items()}
+    return index
+
+def _remark(remarks):
+    return " | ".join(remarks) if remarks else "-"
+
+# -------------------------
+# 변경분 계산
+# 반환: [{Change, VPC Name, ..., 비고 (이전), 비고 (현재)}, ...]
+#   ADDED: 새로 생긴 룰 / REMOVED: 없어진 룰 / MODIFIED: 같은 룰의 Description 변경
+#   한쪽 스냅샷에만 있는 SG 는 Direction "SG" 행(ADDED / REMOVED)을 먼저 기록 (룰이 없는 SG 도 표시)
+# -------------------------
+def diff_security_groups(old, new):
+    (old_vpcs, old_sgs), (new_vpcs, new_sgs) = old, new
+    vpc_name_by_id = {**old_vpcs, **new_vpcs}
+    sg_by_id = {sg.get("GroupId"): sg for sg in old_sgs}
+    sg_by_id.update({sg.get("GroupId"): sg for sg in new_sgs})
+    sg_name_by_id = {**build_sg_name_map(old_sgs), **build_sg_name_map(new_sgs)}
+
+    old_index = index_rules(old_sgs, sg_name_by_id)
+    new_index = index_rules(new_sgs, sg_name_by_id)
+
+    changes = []
+    for gid in sorted(old_index.keys() | new_index.keys(),
+                      key=lambda g: ((sg_by_id[g].get("GroupName") or "").lower(), g)):
+        before, after = old_index.get(gid, {}), new_index.get(gid, {})
+        sg_change = None if (gid in old_index) == (gid in new_index) else ("ADDED" if gid in new_index else "REMOVED")
+        if before == after and sg_change is None:
+            continue
+
+        sg = sg_by_id[gid]
+        vpc_id = sg.get("VpcId")
+        base = {
+            'VPC Name': vpc_name_by_id.get(vpc_id, vpc_id) if vpc_id else "NO_VPC",
+            'Security Groups Name': sg.get("GroupName") or gid,
+            'Group ID': gid,
+        }
+        if sg_change:
+            changes.append({
+                'Change': sg_change, **base,
+                'Direction': "SG", 'Type': "-", 'Port Range': "-", 'Source': "-",
+                '비고 (이전)': "-", '비고 (현재)': "-",
+            })
+        for key in sorted(before.keys() | after.keys()):
+            if key in before and key in after:
+                if before[key] == after[key]:
+                    continue
+                change = "MODIFIED"
+            else:
+                change = "ADDED" if key in after else "REMOVED"
+            direction, proto, pr, src = key
+            changes.append({
+                'Change': change, **base,
+                'Direction': direction, 'Type': proto, 'Port Range': pr, 'Source': src,
+                '비고 (이전)': _remark(before.get(key)), '비고 (현재)': _remark(after.get(key)),
+            })
+    return changes
+
+def save_changes_excel(changes, filename):
+    df = pd.DataFrame(changes, columns=COLUMNS)
+    writer = pd.ExcelWriter(filename, engine='xlsxwriter')
+    df.to_excel(writer, index=False, sheet_name='Changes')
+    workbook, worksheet = writer.book, writer.sheets['Changes']
+
+    header_fmt = workbook.add_format({'bold': True, 'bg_color': '#D3D3D3', 'border': 1, 'align': 'center', 'valign': 'vcenter'})
+    for col_num, value in enumerate(df.columns.values):
+        worksheet.write(0, col_num, value, header_fmt)
+
+    # 변경 유형별 색상
+    fills = {"ADDED": '#E2EFDA', "REMOVED": '#FCE4D6', "MODIFIED": '#FFF2CC'}
+    for change, color in fills.items():
+        worksheet.conditional_format(1, 0, max(len(df), 1), len(COLUMNS) - 1, {
+            'type': 'formula', 'criteria': f'=$A2="{change}"',
+            'format': workbook.add_format({'bg_color': color, 'border': 1}),
+        })
+
+    worksheet.set_column('A:A', 11)
+    worksheet.set_column('B:D', 26)
+    worksheet.set_column('E:G', 11)
+    worksheet.set_column('H:H', 36)
+    worksheet.set_column('I:J', 24)
+    worksheet.freeze_panes(1, 0)
+    writer.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="두 스냅샷 간 보안그룹 룰 변경분")
+    parser.add_argument("old_db", help="이전 스냅샷 DB")
+    parser.add_argument("new_db", help="현재 스냅샷 DB")
+    parser.add_argument("--account", default=ACCOUNT_LABEL)
+    parser.add_argument("--region", default=REGION_NAME)
+    parser.add_argument("--json", metavar="FILE", help="엑셀 대신 JSON으로 저장")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    changes = diff_security_groups(load_sgs(args.old_db, args.account, args.region),
+                                   load_sgs(args.new_db, args.account, args.region))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(changes, f, ensure_ascii=False, indent=2)
+        print(f"변경 {len(changes)}건: {args.json}")
+    else:
+        save_changes_excel(changes, args.output)
+        print(f"변경 {len(changes)}건: {args.output}")
@@ -0,0 +1,284 @@
+import ipaddress
+from bisect import bisect_left
+from collections import namedtuple
+
+from prefix_lists import cidr_map, sg_prefix_list_ids
+from sg_rules import Memo, RuleExpander, perm_sources
+
+# ==========================================
+# 보안그룹 도달성 조회
+# - "10.20.0.0/16 에서 TCP 5432 로 들어올 수 있는 SG/룰은?" 을 엑셀 필터 없이 바로 조회
+# - CIDR 소스: (버전, 네트워크 주소, 프리픽스 길이) 키 사전
+#   CIDR 은 서로 포함되거나 겹치지 않으므로 질의 CIDR 을 포함하는 룰 = 질의의 상위 프리픽스 (최대 33/129개 키)
+#   겹침(overlaps) 조회는 시작 주소 정렬 배열에서 질의 범위 안의 하위 프리픽스를 이분 탐색으로 추가
+# - 포트: 소스 키 + 프로토콜별 interval tree (룰 포트 범위가 질의 포트 범위를 포함하는지)
+# - 프로토콜도 포함 기준: all 룰은 모든 프로토콜 질의에 일치, all 질의는 all 룰에만 일치
+# - SG 참조(UserIdGroupPairs): 참조 대상 SG ID 키 사전, transitive=True 면 일치한 SG 를 다시 출발지로 삼아
+#   같은 프로토콜/포트를 허용하는 SG 를 따라감 (경로는 via 에 기록, 순환은 방문 집합으로 차단)
+# - 표기(Type / Port Range / Source / Remark)는 get_securitygroup 과 같은 sg_rules 확장 결과 그대로
+# ==========================================
+PROTOCOL_NAMES = {"-1": "all", "6": "tcp", "17": "udp", "1": "icmp", "58": "icmpv6"}
+ANY_PORT = (-1, 65535)   # all 프로토콜 / 포트 미지정 룰 (ICMP 타입 -1 포함)
+DIRECTIONS = {"inbound": "IpPermissions", "outbound": "IpPermissionsEgress"}
+
+ReachMatch = namedtuple("ReachMatch", ["group_id", "group_name", "direction", "type", "port_range",
+                                       "source", "remark", "via"])
+
+def normalize_protocol(value):
+    value = str(value).lower()
+    return PROTOCOL_NAMES.get(value, value)
+
+# 룰 포트 구간: ICMP 는 FromPort(타입)만 비교
+def _rule_ports(proto, p):
+    fp, tp = p.get("FromPort"), p.get("ToPort")
+    if proto == "all" or fp is None or fp == -1:
+        return ANY_PORT
+    if proto in ("icmp", "icmpv6"):
+        return fp, fp
+    return fp, tp
+
+# 질의 포트: None(포트 무관) / 정수 / (시작, 끝)
+def _query_ports(port):
+    if port is None or isinstance(port, tuple):
+        return port
+    return int(port), int(port)
+
+def _network(value):
+    return ipaddress.ip_network(value, strict=False)
+
+def _cidr_key(net):
+    return net.version, int(net.network_address), net.prefixlen
+
+# -------------------------
+# 정적 interval tree (centered)
+# 노드: (중심, 중심을 지나는 구간 lo 오름차순, hi 내림차순, 왼쪽, 오른쪽)
+# 구간: (lo, hi, 값)
+# -------------------------
+class IntervalTree:
+    def __init__(self, intervals):
+        self.size = len(intervals)
+        self.root = self._build(list(intervals))
+
+    @classmethod
+    def _build(cls, items):
+        if not items:
+            return None
+        points = sorted(p for lo, hi, _ in items for p in (lo, hi))
+        center = points[len(points) // 2]
+        left, right, mid = [], [], []
+        for item in items:
+            if item[1] < center:
+                left.append(item)
+            elif item[0] > center:
+                right.append(item)
+            else:
+                mid.append(item)
+        return (center, sorted(mid, key=lambda i: i[0]), sorted(mid, key=lambda i: -i[1]),
+                cls._build(left), cls._build(right))
+
+    # point 를 포함하는 구간
+    def stab(self, point):
+        out = []
+        node = self.root
+        while node is not None:
+            center, by_lo, by_hi, left, right = node
+            if point < center:
+                for item in by_lo:
+                    if item[0] > point:
+                        break
+                    out.append(item)
+                node = left
+            elif point > center:
+                for item in by_hi:
+                    if item[1] < point:
+                        break
+                    out.append(item)
+                node = right
+            else:
+                out.extend(by_lo)
+                break
+        return out
+
+    # [lo, hi] 전체를 포함하는 구간
+    def covering(self, lo, hi):
+        return [item for item in self.stab(lo) if item[1] >= hi]
+
+# 소스 키 1개의 룰: 프로토콜별 포트 interval tree
+class _PortIndex:
+    def __init__(self):
+        self.pending = {}
+        self.trees = None
+
+    def add(self, proto, ports, rule_id):
+        self.pending.setdefault(proto, []).append((ports[0], ports[1], rule_id))
+
+    def freeze(self):
+        self.trees = {proto: IntervalTree(items) for proto, items in self.pending.items()}
+        self.pending = None
+
+    # all 프로토콜 룰은 모든 질의 프로토콜에 일치, all 질의는 all 룰에만 일치
+    # (포트와 같은 "포함" 기준: 모든 프로토콜을 묻는 질의를 tcp/22 룰이 전부 허용하지는 않음)
+    def query(self, proto, ports):
+        out = []
+        for key in ((proto, "all") if proto != "all" else ("all",)):
+            tree = self.trees.get(key)
+            if tree is None:
+                continue
+            if ports is None:
+                out.extend(rid for _, _, rid in _all_items(tree.root))
+            else:
+                out.extend(rid for _, _, rid in tree.covering(*ports))
+        return out
+
+def _all_items(node):
+    if node is None:
+        return
+    yield from node[1]
+    yield from _all_items(node[3])
+    yield from _all_items(node[4])
+
+# -------------------------
+# 인덱스
+# sgs: describe_security_groups 결과, ref_names: sgs 밖 참조 SG 이름 (범위 조회 시)
+# prefix_lists: {PrefixListId: [CIDR, ...]} 또는 함수 - 주면 prefix list 소스를 CIDR 로 펼침
+# -------------------------
+class ReachabilityIndex:
+    def __init__(self, sgs, ref_names=None, prefix_lists=None):
+        sgs = list(sgs)
+        names = {**(ref_names or {}), **{sg["GroupId"]: sg.get("GroupName") or sg["GroupId"] for sg in sgs}}
+        expander = RuleExpander(names)
+        self.names = names
+        self.rules = []              # rule_id -> (GroupId, direction, Type, Port Range, Source, Remark)
+        self.unresolved = set()
+        self.cidrs = {d: {} for d in DIRECTIONS}    # (버전, 주소, 길이) -> _PortIndex
+        self.refs = {d: {} for d in DIRECTIONS}     # 참조 GroupId -> _PortIndex
+        self.pls = {d: {} for d in DIRECTIONS}      # 펼치지 못한 PrefixListId -> _PortIndex
+        self._keys = Memo(lambda cidr: _cidr_key(_network(cidr)))   # 같은 CIDR 문자열은 한 번만 파싱
+
+        for sg in sgs:
+            for direction, key in DIRECTIONS.items():
+                for p in sg.get(key) or []:
+                    proto = normalize_protocol(p.get("IpProtocol", "-1"))
+                    ports = _rule_ports(proto, p)
+                    # 확장 행과 소스 목록은 같은 순서 (sg_rules.perm_sources)
+                    for row, (kind, value, _) in zip(expander.expand([p]), perm_sources(p)):
+                        rule_id = len(self.rules)
+                        self.rules.append((sg["GroupId"], direction) + row)
+                        for index, source in self._sources(direction, kind, value, prefix_lists):
+                            index.setdefault(source, _PortIndex()).add(proto, ports, rule_id)
+
+        # 겹침 조회용: 버전별 (시작 주소, 길이, 키) 정렬
+        self.starts = {}
+        self.nested = {}
+        for direction in DIRECTIONS:
+            for version in (4, 6):
+                keys = sorted(k for k in self.cidrs[direction] if k[0] == version)
+                self.nested[direction, version] = keys
+                self.starts[direction, version] = [k[1] for k in keys]
+            for index in (self.cidrs[direction], self.refs[direction], self.pls[direction]):
+                for ports in index.values():
+                    ports.freeze()
+
+    def _sources(self, direction, kind, value, prefix_lists):
+        if kind == "cidr":
+            return [(self.cidrs[direction], self._keys[value])]
+        if kind == "sg":
+            return [(self.refs[direction], value)]
+        cidrs = None
+        if prefix_lists is not None:
+            cidrs = prefix_lists(value) if callable(prefix_lists) else prefix_lists.get(value)
+        if cidrs is None:
+            self.unresolved.add(value)
+            return [(self.pls[direction], value)]
+        return [(self.cidrs[direction], self._keys[c]) for c in cidrs]
+
+    # prefix_lists 미지정 + 카탈로그가 펼치기 모드면 참조된 prefix list 를 해석해 사용
+    @classmethod
+    def from_catalog(cls, catalog, prefix_lists=None):
+        ref_names = catalog.sg_name_by_id() if catalog.scope else None
+        sgs = catalog.security_groups()
+        if prefix_lists is None and catalog.expand_prefix_lists:
+            prefix_lists = cidr_map(catalog.prefix_lists(sg_prefix_list_ids(sgs)))
+        return cls(sgs, ref_names, prefix_lists)
+
+    # CIDR 질의 -> 일치 룰 번호
+    # match="contains": 룰 소스가 질의 범위 전체를 포함 / "overlaps": 일부라도 겹침
+    def _cidr_rules(self, direction, net, proto, ports, match):
+        index = self.cidrs[direction]
+        version, address, prefixlen = _cidr_key(net)
+        bits = net.max_prefixlen
+        keys = []
+        for length in range(prefixlen, -1, -1):
+            mask = ((1 << length) - 1) << (bits - length)
+            keys.append((version, address & mask, length))
+        if match == "overlaps":
+            last = address | ((1 << (bits - prefixlen)) - 1)
+            nested, starts = self.nested[direction, version], self.starts[direction, version]
+            i = bisect_left(starts, address)
+            while i < len(starts) and starts[i] <= last:
+                if nested[i][2] > prefixlen:
+                    keys.append(nested[i])
+                i += 1
+        elif match != "contains":
+            raise ValueError(f"match 는 'contains' 또는 'overlaps': {match!r}")
+        out = []
+        for key in keys:
+            port_index = index.get(key)
+            if port_index is not None:
+                out.extend(port_index.query(proto, ports))
+        return out
+
+    def _ref_rules(self, direction, group_id, proto, ports):
+        port_index = self.refs[direction].get(group_id)
+        return port_index.query(proto, ports) if port_index is not None else []
+
+    # source: CIDR / IP / SG ID / PrefixListId, port: 정수 / (시작, 끝) / None(포트 무관)
+    # direction: "inbound" (source 에서 들어옴) / "outbound" (source 로 나감)
+    def query(self, proto, port, source, direction="inbound", match="contains", transitive=False):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction 은 {' / '.join(DIRECTIONS)}: {direction!r}")
+        proto = normalize_protocol(proto)
+        ports = _query_ports(port)
+        source = str(source)
+
+        if source.startswith("sg-"):
+            hits = [(rid, ()) for rid in self._ref_rules(direction, source, proto, ports)]
+            visited = {source}
+        elif source.startswith("pl-"):
+            port_index = self.pls[direction].get(source)
+            hits = [(rid, ()) for rid in (port_index.query(proto, ports) if port_index else [])]
+            visited = set()
+        else:
+            # 펼친 prefix list 의 CIDR 이 서로 포함되면 같은 룰이 여러 키에서 나오므로 중복 제거
+            rids = self._cidr_rules(direction, _network(source), proto, ports, match)
+            hits = [(rid, ()) for rid in dict.fromkeys(rids)]
+            visited = set()
+
+        # 일치한 SG 의 멤버가 다시 출발지: 그 SG 를 참조하는 룰을 따라감 (너비 우선, SG 당 1회)
+        if transitive:
+            frontier = hits
+            while frontier:
+                found = []
+                for rid, via in frontier:
+                    group_id = self.rules[rid][0]
+                    if group_id in visited:
+                        continue
+                    visited.add(group_id)
+                    path = via + (group_id,)
+                    found.extend((ref_rid, path) for ref_rid in self._ref_rules(direction, group_id, proto, ports))
+                hits.extend(found)
+                frontier = found
+
+        results = []
+        for rid, via in hits:
+            group_id, direction_, proto_, port_range, src, remark = self.rules[rid]
+            results.append(ReachMatch(group_id, self.names.get(group_id, group_id), direction_.capitalize(),
+                                      proto_, port_range, src, remark, via))
+        return results
+
+# 단독 실행은 통합 CLI 의 reach 명령과 같음 (옵션은 aws_resource.py reach --help)
+if __name__ == "__main__":
+    import sys
+
+    import aws_resource
+    sys.exit(aws_resource.main(["reach", *sys.argv[1:]]))
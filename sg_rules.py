@@ -0,0 +1,217 @@
+from array import array
+
+from prefix_lists import display_sources
+
+# ==========================================
+# 보안그룹 룰 확장 엔진 (두 SG 리포트 공용)
+# - 문자열은 StringPool 에 한 번만 저장하고 룰은 정수 코드 컬럼(array)으로 보관
+# - 같은 (Type, Port, Source, 비고) 룰 행은 한 번만 저장 (SG/방향별로는 룰 번호만 보관)
+# - SG 참조 표기 "sg-xxxx(Name)" / 포트 문자열은 값마다 한 번만 생성
+# - 표기 규칙(dialect)은 리포트별로 분리: 기존 두 리포트 출력과 동일하게 유지
+#   side_by_side: get_securitygroup (Description 이 비어 있어도 "-", 빈 소스 생략)
+#   centered: get_securitygroup2 (Description 키가 없을 때만 "-", 값 그대로)
+# ==========================================
+EMPTY_RULE = ("-", "-", "-", "-")
+
+class StringPool:
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+# 값 -> 변환 결과 캐시 (포트 범위 / SG 참조 표기, sg_reach 의 CIDR 키 등)
+class Memo(dict):
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+
+    def __missing__(self, key):
+        value = self[key] = self.fn(key)
+        return value
+
+# -------------------------
+# side_by_side 표기 (get_securitygroup)
+# -------------------------
+def _side_by_side_port(ports):
+    fp, tp = ports
+    if fp is None or tp is None:
+        return "-"
+    return str(fp) if fp == tp else f"{fp}-{tp}"
+
+# 퍼미션의 소스 목록: (종류 "cidr" | "sg" | "pl", 값, Description)
+# - side_by_side 행 순서/조건과 동일 (sg_reach 인덱스가 행과 1:1 로 맞춰 씀)
+def perm_sources(p):
+    for r in (p.get("IpRanges") or []):
+        if r.get("CidrIp"):
+            yield "cidr", r["CidrIp"], r.get("Description")
+    for r in (p.get("Ipv6Ranges") or []):
+        if r.get("CidrIpv6"):
+            yield "cidr", r["CidrIpv6"], r.get("Description")
+    for g in (p.get("UserIdGroupPairs") or []):
+        if g.get("GroupId"):
+            yield "sg", g["GroupId"], g.get("Description")
+    for pl in (p.get("PrefixListIds") or []):
+        if pl.get("PrefixListId"):
+            yield "pl", pl["PrefixListId"], pl.get("Description")
+
+def _side_by_side_perm(p, ports, refs, pls):
+    proto = p.get("IpProtocol", "-1")
+    proto = "all" if proto == "-1" else str(proto)
+    pr = ports[(p.get("FromPort"), p.get("ToPort"))]
+
+    # (source, remark) - 소스가 여러 개면 소스만 행 분리 (펼친 prefix list 는 CIDR 마다 1행)
+    src_items = []
+    for kind, value, desc in perm_sources(p):
+        if kind == "sg":
+            src_items.append((refs[value], desc or "-"))
+        elif kind == "pl":
+            src_items.extend((src, desc or "-") for src in pls[value])
+        else:
+            src_items.append((value, desc or "-"))
+
+    if not src_items:
+        return [(proto, pr, "-", "-")]
+    return [(proto, pr, src, remark) for src, remark in src_items]
+
+def _side_by_side_names(sgs):
+    return {sg["GroupId"]: sg.get("GroupName") or sg["GroupId"] for sg in sgs if sg.get("GroupId")}
+
+def _side_by_side_meta(sg, vpc_names):
+    vpc_id = sg.get("VpcId")
+    sg_id = sg.get("GroupId") or ""
+    vpc_name = vpc_names.get(vpc_id, vpc_id) if vpc_id else "NO_VPC"
+    return vpc_name, sg.get("GroupName") or sg_id or "", sg_id
+
+# -------------------------
+# centered 표기 (get_securitygroup2)
+# -------------------------
+def _centered_port(ports):
+    fp, tp = ports
+    return "-" if fp is None else (str(fp) if fp == tp else f"{fp}-{tp}")
+
+def _centered_perm(p, ports, refs, pls):
+    proto = "all" if p.get('IpProtocol') == "-1" else str(p.get('IpProtocol', '-'))
+    port = ports[(p.get('FromPort'), p.get('ToPort'))]
+
+    srcs = [(r.get('CidrIp') or r.get('CidrIpv6'), r.get('Description', '-'))
+            for r in p.get('IpRanges', []) + p.get('Ipv6Ranges', [])]
+    srcs += [(refs[g['GroupId']], g.get('Description', '-')) for g in p.get('UserIdGroupPairs', [])]
+    srcs += [(src, pl.get('Description', '-')) for pl in p.get('PrefixListIds', []) for src in pls[pl['PrefixListId']]]
+    return [(proto, port, src, desc) for src, desc in (srcs or [("-", "-")])]
+
+def _centered_names(sgs):
+    return {sg['GroupId']: sg.get('GroupName', sg['GroupId']) for sg in sgs}
+
+def _centered_meta(sg, vpc_names):
+    return vpc_names.get(sg.get('VpcId'), 'NO_VPC'), sg.get('GroupName', ''), sg['GroupId']
+
+# dialect: (포트 표기, 퍼미션 확장, 참조 이름 맵, SG 표시값)
+DIALECTS = {
+    "side_by_side": (_side_by_side_port, _side_by_side_perm, _side_by_side_names, _side_by_side_meta),
+    "centered": (_centered_port, _centered_perm, _centered_names, _centered_meta),
+}
+
+# prefix_lists: {PrefixListId: prefix_lists.PrefixList} - 주면 pl-xxxx 소스를 CIDR(목록 이름)으로 펼침
+class RuleExpander:
+    def __init__(self, sg_name_by_id, dialect="side_by_side", prefix_lists=None):
+        port_fn, self._perm, _, _ = DIALECTS[dialect]
+        self._ports = Memo(port_fn)
+        self._refs = Memo(lambda gid: f"{gid}({sg_name_by_id.get(gid, gid)})")
+        self._pls = Memo(lambda pl_id: display_sources(prefix_lists, pl_id))
+
+    # 퍼미션 목록 -> [(Type, PortRange, Source, Remark), ...] (룰이 없으면 "-" 1줄)
+    def expand(self, perms):
+        out = []
+        for p in (perms or []):
+            out.extend(self._perm(p, self._ports, self._refs, self._pls))
+        return out or [EMPTY_RULE]
+
+# 단건 확장 (sg_diff 등 테이블 없이 룰 목록만 필요한 경우)
+def expand_perms(perms, sg_name_by_id, dialect="side_by_side", prefix_lists=None):
+    return RuleExpander(sg_name_by_id, dialect, prefix_lists).expand(perms)
+
+# -------------------------
+# SG 단위 스트리밍 확장 (전체 SG 테이블을 만들지 않음)
+# - SG 하나씩 (VPC Name, SG Name, Group ID, inbound 룰, outbound 룰) 생성 → 쓰고 나면 버림
+# - 참조 이름 맵(ref_names + sgs 이름)과 포트/참조 표기 캐시만 SG 사이에 공유
+# -------------------------
+def iter_sg_rules(vpc_names, sgs, dialect="side_by_side", ref_names=None, prefix_lists=None):
+    _, _, names_fn, meta_fn = DIALECTS[dialect]
+    expander = RuleExpander({**(ref_names or {}), **names_fn(sgs)}, dialect, prefix_lists)
+    for sg in sgs:
+        yield (*meta_fn(sg, vpc_names), expander.expand(sg.get("IpPermissions")),
+               expander.expand(sg.get("IpPermissionsEgress")))
+
+# -------------------------
+# 컬럼형 룰 테이블
+# - rule_*: 중복 제거된 룰 행의 컬럼별 문자열 코드
+# - sg_*: SG 표시값 (VPC Name, SG Name, Group ID) 코드
+# - in/out: SG i 의 룰 번호 = members[offsets[i]:offsets[i+1]] (CSR 형태)
+# -------------------------
+class RuleTable:
+    def __init__(self):
+        self.pool = StringPool()
+        self.rule_proto, self.rule_port = array("I"), array("I")
+        self.rule_source, self.rule_remark = array("I"), array("I")
+        self.sg_vpc, self.sg_name, self.sg_id = array("I"), array("I"), array("I")
+        self.offsets = {"in": array("I", [0]), "out": array("I", [0])}
+        self.members = {"in": array("I"), "out": array("I")}
+
+    # sgs 순서 그대로 저장 (정렬은 호출 측 책임)
+    # ref_names: sgs 밖 SG 참조 이름 (범위 조회 시 catalog.sg_name_by_id), sgs 의 이름이 우선
+    # prefix_lists: 펼칠 prefix list (catalog.prefix_lists 결과)
+    @classmethod
+    def build(cls, vpc_names, sgs, dialect="side_by_side", ref_names=None, prefix_lists=None):
+        table = cls()
+        code = table.pool.code
+        rule_ids = {}
+
+        for vpc_name, sg_name, sg_id, in_rules, out_rules in iter_sg_rules(vpc_names, sgs, dialect, ref_names,
+                                                                             prefix_lists):
+            table.sg_vpc.append(code(vpc_name))
+            table.sg_name.append(code(sg_name))
+            table.sg_id.append(code(sg_id))
+            for direction, rules in (("in", in_rules), ("out", out_rules)):
+                members = table.members[direction]
+                for rule in rules:
+                    rid = rule_ids.get(rule)
+                    if rid is None:
+                        rid = rule_ids[rule] = len(table.rule_proto)
+                        table.rule_proto.append(code(rule[0]))
+                        table.rule_port.append(code(rule[1]))
+                        table.rule_source.append(code(rule[2]))
+                        table.rule_remark.append(code(rule[3]))
+                    members.append(rid)
+                table.offsets[direction].append(len(members))
+        return table
+
+    def __len__(self):
+        return len(self.sg_id)
+
+    def _rules(self, direction, i):
+        values = self.pool.values
+        offsets, members = self.offsets[direction], self.members[direction]
+        return [(values[self.rule_proto[r]], values[self.rule_port[r]],
+                 values[self.rule_source[r]], values[self.rule_remark[r]])
+                for r in members[offsets[i]:offsets[i + 1]]]
+
+    # SG 단위 디코딩: (VPC Name, SG Name, Group ID, inbound 룰, outbound 룰)
+    def iter_sgs(self):
+        values = self.pool.values
+        for i in range(len(self)):
+            yield (values[self.sg_vpc[i]], values[self.sg_name[i]], values[self.sg_id[i]],
+                   self._rules("in", i), self._rules("out", i))
+
+    def stats(self):
+        return {
+            "security_groups": len(self),
+            "rule_rows": len(self.members["in"]) + len(self.members["out"]),
+            "distinct_rules": len(self.rule_proto),
+            "distinct_strings": len(self.pool.values),
+        }
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from sg_rules import DIALECTS
+
+# ==========================================
+# 샤드 병렬 렌더링 (xlsx)
+# - 엑셀 저장(셀 스타일/병합 기록 + XML 압축)은 순수 파이썬이라 스레드로는 1코어만 사용
+#   → 계정(대상) 또는 VPC 단위로 나눠 프로세스 풀에서 샤드마다 워크북 1개씩 저장
+# - 샤드 저장은 collector.save_excel 을 그대로 호출 → 스타일/병합/열 너비는 기존 리포트와 동일
+# - 결과: 출력 경로가 .zip 이면 샤드별 워크북을 묶은 zip 1개, 아니면 디렉터리에 파일별로 저장
+# - 한 워크북으로 다시 합치지 않음: xlsx 의 스타일 인덱스/공유 문자열은 워크북 단위 테이블이라
+#   시트 XML 을 옮기려면 모든 셀의 인덱스를 다시 매겨야 함 (병렬로 줄인 시간을 단일 프로세스에서 다시 씀)
+# - spawn 컨텍스트: 수집 스레드가 남아 있을 수 있는 프로세스를 fork 하지 않음 (워커당 import 1회)
+# ==========================================
+SHARD_WORKERS = os.cpu_count() or 1
+SHARD_BY = ("account", "vpc")
+
+# DataFrame 리포트의 VPC 샤드 컬럼 (없는 리포트는 VPC 지정 시에도 계정 단위)
+VPC_COLUMNS = {
+    "routetable": "VPC Name",
+    "vpcendpoint": "VPC",
+}
+SG_DIALECTS = {"securitygroup": "side_by_side", "securitygroup2": "centered"}
+
+# -------------------------
+# 샤드 분할: [(파일명 라벨, titles, results), ...] - collector.save_excel 인자 형태 그대로
+# -------------------------
+def _frame_shards(name, title, df, by):
+    if df is None or df.empty:
+        return []
+    column = VPC_COLUMNS.get(name) if by == "vpc" else None
+    if column is None:
+        return [(title, [title], [df])]
+    return [(f"{title}-{vpc}", [title], [group.reset_index(drop=True)])
+            for vpc, group in df.groupby(column, sort=False, dropna=False)]
+
+# SG 리포트: VPC 별로 SG 를 나누고, 참조 이름은 계정 전체 맵을 넘김 (다른 VPC SG 참조도 이름 유지)
+def _sg_shards(name, title, data, by):
+    if by != "vpc":
+        return [(title, [title], [data])]
+    vpc_map, sgs, *extra = data
+    names = {**((extra[0] if extra else None) or {}), **DIALECTS[SG_DIALECTS[name]][2](sgs)}
+    by_vpc = {}
+    for sg in sgs:
+        by_vpc.setdefault(sg.get("VpcId"), []).append(sg)
+    return [(f"{title}-{vpc_map.get(vpc_id, vpc_id) if vpc_id else 'NO_VPC'}", [title],
+             [(vpc_map, group, names, *extra[1:])])
+            for vpc_id, group in by_vpc.items()]
+
+def shard_report(name, titles, results, by="account"):
+    if by not in SHARD_BY:
+        raise ValueError(f"지원하지 않는 샤드 단위: {by} ({', '.join(SHARD_BY)})")
+    split = _sg_shards if name in SG_DIALECTS else _frame_shards
+    shards = []
+    for title, data in zip(titles, results):
+        shards.extend(split(name, title, data, by))
+    return shards
+
+# 샤드 크기 (큰 샤드부터 풀에 넣어 마지막 워커 혼자 오래 도는 것을 줄임)
+def _weight(results):
+    data = results[0]
+    return len(data[1]) if isinstance(data, tuple) else len(data)
+
+def _filename(label):
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", str(label)).strip("_") or "shard"
+
+# -------------------------
+# 워커 (프로세스 풀에서 실행, 최상위 함수여야 pickle 가능)
+# -------------------------
+def _render(job):
+    name, titles, results, path = job
+    import collector
+    started = time.perf_counter()
+    collector.save_excel(name, titles, results, path)
+    return (path if os.path.exists(path) else None), time.perf_counter() - started
+
+def _assemble(files, out):
+    if out.endswith(".zip"):
+        # xlsx 는 이미 압축된 파일이라 재압축 없이 저장
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+            for path in files:
+                zf.write(path, os.path.basename(path))
+        return [out]
+    os.makedirs(out, exist_ok=True)
+    moved = []
+    for path in files:
+        moved.append(shutil.move(path, os.path.join(out, os.path.basename(path))))
+    return moved
+
+# 리포트 1개를 샤드별 워크북으로 병렬 저장 → zip / 디렉터리
+# 반환: 만들어진 파일 경로 목록 (샤드가 모두 비면 빈 목록)
+def render_sharded(name, titles, results, out, by="account", workers=SHARD_WORKERS):
+    shards = shard_report(name, titles, results, by)
+    if not shards:
+        return []
+    started = time.perf_counter()
+    base = os.path.splitext(os.path.basename(out))[0]
+    tmp = tempfile.mkdtemp(prefix="shard-")
+    try:
+        jobs, used = [], set()
+        for label, shard_titles, shard_results in shards:
+            filename = f"{base}_{_filename(label)}"
+            # 같은 이름 VPC 가 여러 개면 번호를 붙여 구분
+            unique, n = filename, 1
+            while unique in used:
+                n += 1
+                unique = f"{filename}_{n}"
+            used.add(unique)
+            jobs.append((name, shard_titles, shard_results, os.path.join(tmp, f"{unique}.xlsx")))
+
+        order = sorted(range(len(jobs)), key=lambda i: -_weight(jobs[i][2]))
+        workers = max(1, min(workers, len(jobs)))
+        done = [None] * len(jobs)
+        if workers == 1:
+            for i in order:
+                done[i] = _render(jobs[i])
+        else:
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                for i, result in zip(order, pool.map(_render, [jobs[i] for i in order])):
+                    done[i] = result
+
+        files = _assemble([path for path, _ in done if path], out)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print(f"🧩 샤드 렌더링: {name} {len(jobs)}개 ({by}, 워커 {workers}) {time.perf_counter() - started:.1f}s → {out}")
+    return files
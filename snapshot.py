@@ -0,0 +1,206 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from constants import SNAPSHOT_DB
+
+# ==========================================
+# 1. 설정 (스냅샷 저장소, 기본 파일 SNAPSHOT_DB 는 constants)
+# ==========================================
+SNAPSHOT_TTL = 24 * 3600   # 초 단위, 이보다 오래된 응답은 auto 모드에서 재조회
+# ==========================================
+
+# -------------------------
+# 원본 API 응답 스냅샷 저장소 (SQLite)
+# - 키: (계정 라벨, 리전, 서비스, API, 파라미터 JSON) + 페이지 번호
+# - 값: ResponseMetadata를 뺀 응답 JSON을 zlib 압축해 저장
+# - 스레드마다 커넥션을 따로 사용 (collector 스레드풀에서 동시 기록)
+# -------------------------
+class SnapshotStore:
+    def __init__(self, path=SNAPSHOT_DB, ttl=SNAPSHOT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    account TEXT, region TEXT, service TEXT, operation TEXT, params TEXT,
+                    page INTEGER, fetched_at REAL, payload BLOB,
+                    PRIMARY KEY (account, region, service, operation, params, page)
+                )""")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    # 캐시된 페이지 목록 (없거나 TTL 만료면 None, ttl=None 이면 만료 무시)
+    def load_pages(self, key, ttl=None):
+        rows = self._conn().execute(
+            "SELECT fetched_at, payload FROM responses"
+            " WHERE account=? AND region=? AND service=? AND operation=? AND params=? ORDER BY page",
+            key).fetchall()
+        if not rows:
+            return None
+        if ttl is not None and time.time() - rows[0][0] > ttl:
+            return None
+        return [json.loads(zlib.decompress(payload)) for _, payload in rows]
+
+    # 같은 키의 이전 페이지를 지우고 새 페이지로 교체
+    def save_pages(self, key, pages):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "DELETE FROM responses WHERE account=? AND region=? AND service=? AND operation=? AND params=?",
+                key)
+            conn.executemany(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*key, i, now, blob) for i, blob in enumerate(pages)])
+
+    # 저장된 (계정, 리전, 서비스, API) 목록과 수집 시각
+    def entries(self):
+        return self._conn().execute(
+            "SELECT account, region, service, operation, MIN(fetched_at), COUNT(*) FROM responses"
+            " GROUP BY account, region, service, operation ORDER BY account, region, service, operation"
+        ).fetchall()
+
+def encode_page(response):
+    response = {k: v for k, v in response.items() if k != "ResponseMetadata"}
+    return zlib.compress(json.dumps(response, default=str, separators=(",", ":")).encode())
+
+def params_key(params):
+    # PaginationConfig(페이지 크기)는 결과 내용과 무관하므로 키에서 제외
+    params = {k: v for k, v in params.items() if k != "PaginationConfig"}
+    return json.dumps(params, sort_keys=True, default=str)
+
+# -------------------------
+# 스냅샷 세션 / 클라이언트
+# - boto3.Session 대신 리포트 함수에 주입 (session.client(...) 만 사용하므로 호환)
+# - mode
+#   "auto"   : TTL 안의 캐시가 있으면 사용, 없으면 실제 호출 후 저장
+#   "record" : 항상 실제 호출 후 저장
+#   "replay" : 캐시만 사용 (--from-snapshot, 네트워크/자격증명 불필요)
+# -------------------------
+class SnapshotMissing(LookupError):
+    pass
+
+class SnapshotSession:
+    def __init__(self, store, account, region, base=None, mode="auto"):
+        self.store = store
+        self.account = account
+        self.region = region
+        self.base = base
+        self.mode = mode
+
+    def client(self, service, **kwargs):
+        real = self.base.client(service, **kwargs) if self.base is not None else None
+        region = kwargs.get("region_name") or self.region
+        return SnapshotClient(self, service, region, real)
+
+class SnapshotClient:
+    def __init__(self, session, service, region, real):
+        self._session = session
+        self._service = service
+        self._region = region
+        self._real = real
+
+    def _key(self, operation, params):
+        return (self._session.account, self._region, self._service, operation, params_key(params))
+
+    def _cached(self, key):
+        mode = self._session.mode
+        if mode == "record":
+            return None
+        pages = self._session.store.load_pages(key, ttl=None if mode == "replay" else self._session.store.ttl)
+        if pages is None and (mode == "replay" or self._real is None):
+            raise SnapshotMissing(f"스냅샷 없음: {key[:4]} {key[4]}")
+        return pages
+
+    def _call(self, operation, **params):
+        key = self._key(operation, params)
+        pages = self._cached(key)
+        if pages is not None:
+            return pages[0]
+        response = getattr(self._real, operation)(**params)
+        self._session.store.save_pages(key, [encode_page(response)])
+        return response
+
+    def __getattr__(self, operation):
+        if operation.startswith("_"):
+            raise AttributeError(operation)
+        return lambda **params: self._call(operation, **params)
+
+    def get_paginator(self, operation):
+        return SnapshotPaginator(self, operation)
+
+class SnapshotPaginator:
+    def __init__(self, client, operation):
+        self._client = client
+        self._operation = operation
+
+    def paginate(self, **params):
+        client = self._client
+        key = client._key(self._operation, params)
+        pages = client._cached(key)
+        if pages is not None:
+            yield from pages
+            return
+
+        # 실제 페이지를 흘려보내며 압축본만 모아 두었다가 끝나면 저장
+        blobs = []
+        for page in client._real.get_paginator(self._operation).paginate(**params):
+            blobs.append(encode_page(page))
+            yield page
+        client._session.store.save_pages(key, blobs)
+
+# -------------------------
+# 항목 단위 조회 결과 캐시 (SQLite, 스냅샷 DB 와 같은 파일의 별도 테이블)
+# - 키: (namespace, scope, 항목 ID) 예) ("sso_user", IdentityStoreId, UserId)
+# - version: 원본 목록에서 보이는 변경 표시 (Revision / UpdatedAt 등)
+#   → TTL 안이어도 version 이 달라진 항목은 다시 조회
+# - 조회/저장은 묶음 단위 (스레드풀 작업 전후에 호출 측 스레드에서 한 번씩)
+# -------------------------
+class LookupCache:
+    def __init__(self, path=SNAPSHOT_DB, ttl=SNAPSHOT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lookups (
+                    namespace TEXT, scope TEXT, item TEXT, version TEXT, fetched_at REAL, payload TEXT,
+                    PRIMARY KEY (namespace, scope, item)
+                )""")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        return conn
+
+    # versions: {항목 ID: version} -> 유효한 캐시 값 {항목 ID: value}
+    def get_many(self, namespace, scope, versions):
+        rows = self._conn().execute(
+            "SELECT item, version, fetched_at, payload FROM lookups WHERE namespace=? AND scope=?",
+            (namespace, scope)).fetchall()
+        now = time.time()
+        hits = {}
+        for item, version, fetched_at, payload in rows:
+            if item in versions and version == _version(versions[item]) and now - fetched_at <= self.ttl:
+                hits[item] = json.loads(payload)
+        return hits
+
+    # items: {항목 ID: (version, value)}
+    def put_many(self, namespace, scope, items):
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?, ?)",
+                [(namespace, scope, item, _version(version), now, json.dumps(value, default=str))
+                 for item, (version, value) in items.items()])
+
+def _version(value):
+    return None if value is None else str(value)
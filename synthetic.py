@@ -0,0 +1,435 @@
+import fnmatch
+import functools
+import ipaddress
+import threading
+import time
+from collections import Counter
+
+from types import SimpleNamespace
+
+import numpy as np
+from botocore.exceptions import ClientError
+from botocore.hooks import HierarchicalEmitter
+
+# ==========================================
+# 합성 AWS 백엔드 (벤치마크/로컬 검증용)
+# - 리포트가 쓰는 API만 흉내: EC2 describe_* / 관리형 prefix list / TGW 라우트 검색, sso-admin, identitystore,
+#   organizations list_accounts
+# - MaxResults/NextToken 페이지네이션, 주요 Filters, ID 목록 인자 지원
+# - 호출 수 집계, 호출당 지연(latency), 초당 허용치 초과 시 스로틀 응답 흉내
+# - botocore 와 같은 before-call / after-call 이벤트 발생 (instrument 훅 검증용)
+# ==========================================
+
+# 규모 프리셋 (SG 수, 라우팅 테이블 수, 인터페이스 엔드포인트 수, SSO 사용자/그룹 수, 조직 계정/권한 세트 수,
+#             TGW 라우팅 테이블 수)
+SCALES = {
+    "small": dict(n_sgs=1_000, n_rtbs=500, n_vpce=100, n_users=500, n_groups=50,
+                  n_accounts=10, n_permission_sets=8, n_tgw_rtbs=50),
+    "medium": dict(n_sgs=10_000, n_rtbs=2_000, n_vpce=300, n_users=2_000, n_groups=100,
+                   n_accounts=50, n_permission_sets=20, n_tgw_rtbs=200),
+    "large": dict(n_sgs=50_000, n_rtbs=5_000, n_vpce=500, n_users=4_000, n_groups=200,
+                  n_accounts=200, n_permission_sets=40, n_tgw_rtbs=500),
+}
+TGW_HUB_ROUTES = 1_500   # 첫 TGW 라우팅 테이블의 정적 라우트 수 (검색 MaxResults 1000 초과 → 범위 분할 경로)
+
+# 관리형 prefix list: (ID, 이름, 소유자, 항목 수) - 마지막 항목은 참조만 되고 조회되지 않는 ID (공유 해제 등)
+# - SG/라우트는 인덱스로 고름 (rng 추가 소비 없음 → 기존 시드의 SG/라우트 구성 유지)
+PREFIX_LISTS = [
+    ("pl-0123abcd", "com.amazonaws.ap-northeast-2.s3", "AWS", 6),
+    ("pl-0456cdef", "com.amazonaws.ap-northeast-2.dynamodb", "AWS", 4),
+    ("pl-0789aaaa", "corp-office", "111122223333", 12),
+    ("pl-0abcbbbb", "partner-ranges", "111122223333", 130),
+]
+SG_PREFIX_LISTS = ["pl-0123abcd", "pl-0789aaaa", "pl-0abcbbbb", "pl-0dead000"]
+ROUTE_PREFIX_LISTS = ["pl-0123abcd", "pl-0456cdef"]
+
+def _tags(name):
+    return [{'Key': 'Name', 'Value': name}]
+
+# 보안그룹 (IPv4/IPv6/SG 참조/Prefix list 혼합, SG당 평균 ~15 룰 행)
+def synthetic_security_groups(n_sgs, n_vpcs=20, seed=0, vpc_ids=None):
+    rng = np.random.default_rng(seed)
+    vpc_map = {f"vpc-{v:08x}": f"vpc-name-{v}" for v in range(n_vpcs)}
+    vpc_ids = vpc_ids or list(vpc_map)
+    sgs = []
+    for i in range(n_sgs):
+        perms = []
+        for _ in range(int(rng.integers(1, 6))):
+            port = int(rng.choice([22, 80, 443, 3306, 5432, 8080]))
+            perm = {
+                'IpProtocol': str(rng.choice(['tcp', 'udp', '-1'])),
+                'IpRanges': [{'CidrIp': f"10.{int(rng.integers(256))}.{j}.0/24", 'Description': f"desc-{j}"}
+                             for j in range(int(rng.integers(0, 4)))],
+                'Ipv6Ranges': [{'CidrIpv6': '2001:db8::/32'}] if rng.random() < 0.1 else [],
+                'UserIdGroupPairs': [{'GroupId': f"sg-{int(rng.integers(n_sgs)):08x}", 'Description': 'ref'}]
+                                    if rng.random() < 0.3 else [],
+                'PrefixListIds': [{'PrefixListId': SG_PREFIX_LISTS[i % len(SG_PREFIX_LISTS)]}]
+                                 if rng.random() < 0.05 else [],
+            }
+            if perm['IpProtocol'] != '-1':
+                perm['FromPort'], perm['ToPort'] = port, port + int(rng.choice([0, 0, 10]))
+            perms.append(perm)
+        sgs.append({
+            'GroupId': f"sg-{i:08x}",
+            'GroupName': f"sg-name-{i}",
+            'VpcId': vpc_ids[i % len(vpc_ids)],
+            'IpPermissions': perms,
+            'IpPermissionsEgress': [{'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}],
+            'Tags': _tags(f"sg-tag-{i}"),
+        })
+    return vpc_map, sgs
+
+# -------------------------
+# 합성 계정 데이터
+# -------------------------
+class SyntheticAccount:
+    def __init__(self, n_sgs=1_000, n_rtbs=500, n_vpce=100, n_users=500, n_groups=50, n_accounts=10,
+                 n_permission_sets=8, n_tgw_rtbs=50, seed=0):
+        rng = np.random.default_rng(seed)
+        n_vpcs = max(2, n_rtbs // 20)
+        self.vpcs = [{'VpcId': f"vpc-{v:08x}", 'CidrBlock': f"10.{v % 256}.0.0/16", 'Tags': _tags(f"vpc-name-{v}")}
+                     for v in range(n_vpcs)]
+        vpc_ids = [v['VpcId'] for v in self.vpcs]
+
+        self.subnets = [{'SubnetId': f"subnet-{v:04x}{s:04x}", 'VpcId': vpc_ids[v],
+                         'CidrBlock': f"10.{v % 256}.{s}.0/24", 'Tags': _tags(f"subnet-{v}-{s}")}
+                        for v in range(n_vpcs) for s in range(4)]
+
+        self.route_tables = []
+        for r in range(n_rtbs):
+            v = r % n_vpcs
+            routes = [{'DestinationCidrBlock': self.vpcs[v]['CidrBlock'], 'GatewayId': 'local', 'State': 'active'},
+                      {'DestinationCidrBlock': '0.0.0.0/0', 'NatGatewayId': f"nat-{v:08x}", 'State': 'active'}]
+            for k in range(int(rng.integers(2, 10))):
+                target = [{'TransitGatewayId': 'tgw-0123456789'}, {'VpcPeeringConnectionId': f"pcx-{k:08x}"},
+                          {'GatewayId': f"igw-{v:08x}"}][k % 3]
+                routes.append({'DestinationCidrBlock': f"172.{16 + k % 16}.{r % 256}.0/24", 'State': 'active', **target})
+            if rng.random() < 0.2:
+                routes.append({'DestinationPrefixListId': ROUTE_PREFIX_LISTS[r % len(ROUTE_PREFIX_LISTS)],
+                               'GatewayId': f"vpce-{r:08x}", 'State': 'active'})
+            associations = [{'Main': True, 'RouteTableId': f"rtb-{r:08x}"}] if r < n_vpcs else []
+            associations.append({'Main': False, 'SubnetId': self.subnets[(v * 4) + (r // n_vpcs) % 4]['SubnetId'],
+                                 'RouteTableId': f"rtb-{r:08x}"})
+            self.route_tables.append({'RouteTableId': f"rtb-{r:08x}", 'VpcId': vpc_ids[v], 'Routes': routes,
+                                      'Associations': associations, 'Tags': _tags(f"rtb-name-{r}")})
+
+        _, self.security_groups = synthetic_security_groups(n_sgs, seed=seed, vpc_ids=vpc_ids)
+
+        self.prefix_lists = [{'PrefixListId': pl_id, 'PrefixListName': name, 'OwnerId': owner, 'Version': 1,
+                              'AddressFamily': 'IPv4', 'State': 'create-complete', 'MaxEntries': max(n, 10)}
+                             for pl_id, name, owner, n in PREFIX_LISTS]
+        self.prefix_list_entries = {pl_id: [{'Cidr': f"100.{p}.{e // 256}.{e % 256}/32", 'Description': f"entry-{e}"}
+                                            for e in range(n)]
+                                    for p, (pl_id, _, _, n) in enumerate(PREFIX_LISTS)}
+
+        self.vpc_endpoints, self.network_interfaces = [], []
+        for e in range(n_vpce):
+            v = e % n_vpcs
+            interface = e % 5 != 0
+            endpoint = {'VpcEndpointId': f"vpce-{e:08x}", 'VpcEndpointType': 'Interface' if interface else 'Gateway',
+                        'ServiceName': f"com.amazonaws.ap-northeast-2.svc{e % 40}", 'VpcId': vpc_ids[v],
+                        'Groups': [{'GroupId': self.security_groups[e % max(1, n_sgs)]['GroupId']}] if n_sgs else [],
+                        'NetworkInterfaceIds': [], 'Tags': _tags(f"vpce-name-{e}")}
+            if interface:
+                for z in range(2 + e % 2):
+                    eni_id = f"eni-{e:08x}{z:02x}"
+                    endpoint['NetworkInterfaceIds'].append(eni_id)
+                    self.network_interfaces.append({
+                        'NetworkInterfaceId': eni_id, 'InterfaceType': 'vpc_endpoint',
+                        'SubnetId': self.subnets[v * 4 + z]['SubnetId'], 'VpcId': vpc_ids[v],
+                        'PrivateIpAddress': f"10.{v % 256}.{z}.{10 + e % 200}"})
+            self.vpc_endpoints.append(endpoint)
+
+        self.groups = [{'GroupId': f"g-{g:06d}", 'DisplayName': f"group-{g}"} for g in range(n_groups)]
+        self.users = [{'UserId': f"u-{u:06d}", 'UserName': f"user{u}", 'DisplayName': f"User {u}",
+                       'Emails': [{'Value': f"user{u}@example.com", 'Primary': True}], 'Revision': 1}
+                      for u in range(n_users)]
+        self.user_by_id = {user['UserId']: user for user in self.users}
+        # describe_user 에만 있는 상태
+        self.user_status = {user['UserId']: "DISABLED" if u % 17 == 0 else "ENABLED"
+                            for u, user in enumerate(self.users)}
+        self.memberships = {g['GroupId']: [] for g in self.groups}
+        for u in range(n_users):
+            for g in set(rng.integers(0, max(1, n_groups), int(rng.integers(1, 5))).tolist()):
+                if n_groups:
+                    self.memberships[self.groups[g]['GroupId']].append(
+                        {'MembershipId': f"m-{u}-{g}", 'GroupId': self.groups[g]['GroupId'],
+                         'MemberId': {'UserId': self.users[u]['UserId']}})
+
+        # 조직 계정 / 권한 세트 (권한 세트마다 계정 ~60% 에 프로비저닝, 계정 x 권한 세트마다 그룹 1~2 + 사용자 0~1)
+        self.org_accounts = [{'Id': f"{100000000000 + a}", 'Name': f"account-{a}", 'Status': 'ACTIVE'}
+                             for a in range(n_accounts)]
+        self.permission_sets = [{'PermissionSetArn': f"arn:aws:sso:::permissionSet/ssoins-synthetic/ps-{p:04x}",
+                                 'Name': f"PermissionSet-{p}"} for p in range(n_permission_sets)]
+        self.permission_set_by_arn = {ps['PermissionSetArn']: ps for ps in self.permission_sets}
+        self.provisioned = {}
+        self.assignments = {}
+        for ps in self.permission_sets:
+            arn = ps['PermissionSetArn']
+            self.provisioned[arn] = [a['Id'] for a in self.org_accounts if rng.random() < 0.6]
+            for account_id in self.provisioned[arn]:
+                principals = [('GROUP', self.groups[int(g)]['GroupId'])
+                              for g in rng.integers(0, n_groups, int(rng.integers(1, 3)))] if n_groups else []
+                principals += [('USER', self.users[int(u)]['UserId'])
+                               for u in rng.integers(0, n_users, int(rng.integers(0, 2)))] if n_users else []
+                self.assignments[(account_id, arn)] = [
+                    {'AccountId': account_id, 'PermissionSetArn': arn, 'PrincipalType': kind, 'PrincipalId': pid}
+                    for kind, pid in dict.fromkeys(principals)]
+
+        self._build_transit_gateway(n_tgw_rtbs)
+
+    # TGW (rng 사용 없음 → 기존 시드의 다른 리소스 구성 유지)
+    # - VPC 마다 attachment 1개 + VPN 2개(ECMP 기본 경로) + 피어링 1개
+    # - 테이블 t 는 VPC v % 4 == t % 4 인 VPC CIDR 를 전파, 10번째마다 블랙홀, 5번째마다 prefix list 정적 라우트
+    def _build_transit_gateway(self, n_tgw_rtbs):
+        tgw_id = 'tgw-0123456789'
+        def attachment(att_id, resource_type, resource_id, name, owner='111122223333'):
+            return {'TransitGatewayAttachmentId': att_id, 'TransitGatewayId': tgw_id,
+                    'ResourceType': resource_type, 'ResourceId': resource_id, 'ResourceOwnerId': owner,
+                    'State': 'available', 'Tags': _tags(name)}
+
+        vpc_atts = [attachment(f"tgw-attach-{v:08x}", 'vpc', vpc['VpcId'], f"att-vpc-{v}")
+                    for v, vpc in enumerate(self.vpcs)]
+        vpn_atts = [attachment(f"tgw-attach-vpn{k:05x}", 'vpn', f"vpn-{k:08x}", f"att-vpn-{k}") for k in range(2)]
+        peering = attachment("tgw-attach-pcx00000", 'peering', 'tgw-0fedcba987', "att-peer-dr", owner='444455556666')
+        # 다른 계정 VPC (vpc_map 에 없음 → attachment Name 태그로 표기)
+        shared = attachment("tgw-attach-shared00", 'vpc', 'vpc-0shared0000', "att-shared-services",
+                            owner='444455556666')
+        self.tgw_attachments = vpc_atts + vpn_atts + [peering, shared]
+
+        def route(dest, atts, kind='propagated', state='active', key='DestinationCidrBlock'):
+            return {key: dest, 'Type': kind, 'State': state,
+                    'TransitGatewayAttachments': [{'TransitGatewayAttachmentId': a['TransitGatewayAttachmentId'],
+                                                   'ResourceId': a['ResourceId'],
+                                                   'ResourceType': a['ResourceType']} for a in atts]}
+
+        self.tgw_route_tables, self.tgw_routes = [], {}
+        for t in range(n_tgw_rtbs):
+            rtb_id = f"tgw-rtb-{t:08x}"
+            routes = [route(self.vpcs[v]['CidrBlock'], [att]) for v, att in enumerate(vpc_atts) if v % 4 == t % 4]
+            routes.append(route('0.0.0.0/0', vpn_atts, 'static'))
+            routes.append(route('10.250.0.0/16', [shared], 'static'))
+            if t % 10 == 9:
+                routes.append(route('10.255.0.0/16', [], 'static', 'blackhole'))
+            if t == 0:
+                routes += [route(f"100.{64 + i // 256}.{i % 256}.0/24", [peering], 'static')
+                           for i in range(TGW_HUB_ROUTES)]
+            # 허브 테이블은 prefix list 라우트가 첫 검색(MaxResults) 뒤에 오도록 마지막에 추가
+            if t % 5 == 0:
+                routes.append(route('pl-0789aaaa', vpn_atts[:1], 'static', key='PrefixListId'))
+            self.tgw_route_tables.append({'TransitGatewayRouteTableId': rtb_id, 'TransitGatewayId': tgw_id,
+                                          'State': 'available', 'DefaultAssociationRouteTable': t == 0,
+                                          'DefaultPropagationRouteTable': t == 0,
+                                          'Tags': _tags(f"tgw-rtb-seg{t % 4}-{t}")})
+            self.tgw_routes[rtb_id] = routes
+
+    @classmethod
+    def scale(cls, name, seed=0):
+        return cls(seed=seed, **SCALES[name])
+
+# EC2 Filters 이름 -> 리소스 값 추출
+def _filter_values(item, name):
+    if name.startswith("tag:"):
+        return [t['Value'] for t in item.get('Tags', []) if t['Key'] == name[4:]]
+    field = {
+        'vpc-id': 'VpcId', 'interface-type': 'InterfaceType', 'network-interface-id': 'NetworkInterfaceId',
+        'group-name': 'GroupName', 'group-id': 'GroupId', 'service-name': 'ServiceName',
+        'subnet-id': 'SubnetId', 'route-table-id': 'RouteTableId', 'vpc-endpoint-id': 'VpcEndpointId',
+        'vpc-endpoint-type': 'VpcEndpointType', 'prefix-list-id': 'PrefixListId',
+        'prefix-list-name': 'PrefixListName', 'owner-id': 'OwnerId', 'transit-gateway-id': 'TransitGatewayId',
+        'transit-gateway-route-table-id': 'TransitGatewayRouteTableId', 'resource-type': 'ResourceType',
+        'resource-id': 'ResourceId', 'state': 'State',
+    }.get(name)
+    if name == 'tag-key':
+        return [t['Key'] for t in item.get('Tags', [])]
+    if name == 'association.subnet-id':
+        return [a.get('SubnetId') for a in item.get('Associations', [])]
+    return [item.get(field)] if field else []
+
+@functools.lru_cache(maxsize=None)
+def _network(cidr):
+    return ipaddress.ip_network(cidr)
+
+# search_transit_gateway_routes Filters (CIDR 검색 + 속성 일치)
+def _tgw_route_matches(route, filters):
+    cidr = route.get('DestinationCidrBlock')
+    for f in filters or []:
+        name, values = f['Name'], f['Values']
+        if name == 'route-search.exact-match':
+            ok = cidr in values
+        elif name == 'route-search.subnet-of-match':
+            network = _network(cidr) if cidr else None
+            ok = network is not None and any(
+                network.version == _network(v).version and network.subnet_of(_network(v)) for v in values)
+        elif name.startswith('attachment.'):
+            field = {'attachment.transit-gateway-attachment-id': 'TransitGatewayAttachmentId',
+                     'attachment.resource-id': 'ResourceId', 'attachment.resource-type': 'ResourceType'}[name]
+            ok = any(a.get(field) in values for a in route.get('TransitGatewayAttachments', []))
+        else:
+            field = {'state': 'State', 'type': 'Type', 'prefix-list-id': 'PrefixListId'}[name]
+            ok = route.get(field) in values
+        if not ok:
+            return False
+    return True
+
+def _matches(item, filters):
+    for f in filters or []:
+        values = _filter_values(item, f['Name'])
+        if not any(fnmatch.fnmatchcase(str(v), pattern) for v in values for pattern in f['Values']):
+            return False
+    return True
+
+# -------------------------
+# 합성 client / session
+# -------------------------
+class SyntheticPaginator:
+    def __init__(self, method):
+        self._method = method
+
+    def paginate(self, PaginationConfig=None, **params):
+        config = PaginationConfig or {}
+        if config.get("PageSize"):
+            params["MaxResults"] = config["PageSize"]
+        while True:
+            page = self._method(**params)
+            yield page
+            if not page.get("NextToken"):
+                return
+            params["NextToken"] = page["NextToken"]
+
+class SyntheticClient:
+    # API -> (데이터 속성, 응답 키, ID 인자, ID 필드, 기본 페이지 크기)
+    EC2_LISTS = {
+        'describe_vpcs': ('vpcs', 'Vpcs', 'VpcIds', 'VpcId', 1000),
+        'describe_subnets': ('subnets', 'Subnets', 'SubnetIds', 'SubnetId', 1000),
+        'describe_route_tables': ('route_tables', 'RouteTables', 'RouteTableIds', 'RouteTableId', 100),
+        'describe_security_groups': ('security_groups', 'SecurityGroups', 'GroupIds', 'GroupId', 1000),
+        'describe_vpc_endpoints': ('vpc_endpoints', 'VpcEndpoints', 'VpcEndpointIds', 'VpcEndpointId', 1000),
+        'describe_network_interfaces': ('network_interfaces', 'NetworkInterfaces', 'NetworkInterfaceIds',
+                                        'NetworkInterfaceId', 1000),
+        'describe_managed_prefix_lists': ('prefix_lists', 'PrefixLists', 'PrefixListIds', 'PrefixListId', 100),
+        'describe_transit_gateway_route_tables': ('tgw_route_tables', 'TransitGatewayRouteTables',
+                                                  'TransitGatewayRouteTableIds', 'TransitGatewayRouteTableId', 1000),
+        'describe_transit_gateway_attachments': ('tgw_attachments', 'TransitGatewayAttachments',
+                                                 'TransitGatewayAttachmentIds', 'TransitGatewayAttachmentId', 1000),
+    }
+
+    def __init__(self, session, service):
+        self._session = session
+        self._service = service
+
+    def _page(self, items, key, params, default_size):
+        start = int(params.get('NextToken') or 0)
+        size = params.get('MaxResults') or default_size
+        page = {key: items[start:start + size]}
+        if start + size < len(items):
+            page['NextToken'] = str(start + size)
+        return page
+
+    def _ec2_list(self, operation, params):
+        attr, key, id_param, id_field, size = self.EC2_LISTS[operation]
+        items = getattr(self._session.account, attr)
+        if params.get(id_param):
+            wanted = set(params[id_param])
+            items = [i for i in items if i[id_field] in wanted]
+        if params.get('Filters'):
+            items = [i for i in items if _matches(i, params['Filters'])]
+        return self._page(items, key, params, size)
+
+    def _call(self, operation, params):
+        model = SimpleNamespace(name="".join(w.capitalize() for w in operation.split("_")))
+        event = f"{self._service}.{model.name}"
+        context = {}
+        events = self._session.events
+        events.emit(f"before-call.{event}", model=model, params=params, context=context)
+        self._session._record(self._service, operation)
+        parsed = self._respond(operation, params)
+        events.emit(f"after-call.{event}", model=model, http_response=None, parsed=parsed, context=context)
+        return parsed
+
+    def _respond(self, operation, params):
+        account = self._session.account
+        if operation in self.EC2_LISTS:
+            return self._ec2_list(operation, params)
+        if operation == 'get_managed_prefix_list_entries':
+            if params['PrefixListId'] not in account.prefix_list_entries:
+                raise ClientError({'Error': {'Code': 'InvalidPrefixListID.NotFound',
+                                             'Message': f"{params['PrefixListId']} not found"}}, operation)
+            return self._page(account.prefix_list_entries[params['PrefixListId']], 'Entries', params, 100)
+        # 페이지네이션 없음: MaxResults 까지만 반환하고 AdditionalRoutesAvailable 로 잘림 표시
+        if operation == 'search_transit_gateway_routes':
+            routes = [r for r in account.tgw_routes[params['TransitGatewayRouteTableId']]
+                      if _tgw_route_matches(r, params['Filters'])]
+            limit = params.get('MaxResults') or 1000
+            return {'Routes': routes[:limit], 'AdditionalRoutesAvailable': len(routes) > limit}
+        if operation == 'list_instances':
+            return {'Instances': [{'InstanceArn': 'arn:aws:sso:::instance/ssoins-synthetic',
+                                   'IdentityStoreId': 'd-synthetic'}]}
+        if operation == 'list_groups':
+            return self._page(account.groups, 'Groups', params, 100)
+        if operation == 'list_users':
+            return self._page(account.users, 'Users', params, 100)
+        if operation == 'describe_user':
+            return {**account.user_by_id[params['UserId']], 'IdentityStoreId': params['IdentityStoreId'],
+                    'UserStatus': account.user_status[params['UserId']]}
+        if operation == 'list_permission_sets':
+            return self._page([ps['PermissionSetArn'] for ps in account.permission_sets], 'PermissionSets', params, 100)
+        if operation == 'describe_permission_set':
+            return {'PermissionSet': account.permission_set_by_arn[params['PermissionSetArn']]}
+        if operation == 'list_accounts_for_provisioned_permission_set':
+            return self._page(account.provisioned.get(params['PermissionSetArn'], []), 'AccountIds', params, 100)
+        if operation == 'list_account_assignments':
+            return self._page(account.assignments.get((params['AccountId'], params['PermissionSetArn']), []),
+                              'AccountAssignments', params, 100)
+        if operation == 'list_accounts':
+            return self._page(account.org_accounts, 'Accounts', params, 20)
+        if operation == 'list_group_memberships':
+            return self._page(account.memberships.get(params['GroupId'], []), 'GroupMemberships', params, 100)
+        raise AttributeError(operation)
+
+    def __getattr__(self, operation):
+        if operation.startswith("_"):
+            raise AttributeError(operation)
+        return lambda **params: self._call(operation, params)
+
+    def get_paginator(self, operation):
+        return SyntheticPaginator(getattr(self, operation))
+
+class SyntheticSession:
+    def __init__(self, account=None, profile_name=None, region_name=None, latency=0.0, throttle_rate=None):
+        self.account = account or SyntheticAccount()
+        self.profile_name = profile_name
+        self.region_name = region_name
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.calls = Counter()
+        self.throttled = Counter()
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.events = HierarchicalEmitter()
+
+    # 호출 기록 + (옵션) 지연 / API별 초당 허용치 초과 시 스로틀 오류
+    def _record(self, service, operation):
+        name = f"{service}.{operation}"
+        with self._lock:
+            self.calls[name] += 1
+            if self.throttle_rate:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(name, (self.throttle_rate, now))
+                tokens = min(self.throttle_rate, tokens + (now - updated) * self.throttle_rate)
+                if tokens < 1:
+                    self._buckets[name] = (tokens, now)
+                    self.throttled[name] += 1
+                    raise ClientError({'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Rate exceeded'}},
+                                      operation)
+                self._buckets[name] = (tokens - 1, now)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def client(self, service, **kwargs):
+        return SyntheticClient(self, service)
+
+# collector.get_session 용 팩토리 (대상마다 같은 합성 계정을 공유)
+def session_factory(account, **kwargs):
+    return lambda profile_name=None, region_name=None: SyntheticSession(
+        account, profile_name=profile_name, region_name=region_name, **kwargs)
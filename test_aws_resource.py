@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# --help 는 argparse + constants 만 로딩 (리포트/내보내기/스냅샷 모듈과 무거운 패키지는 로딩하지 않음)
+def test_help_loads_only_argparse():
+    code = ("import runpy, sys\n"
+            "sys.argv = ['aws_resource.py', '--help']\n"
+            "try:\n"
+            "    runpy.run_path('aws_resource.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sorted(sys.modules)), file=sys.stderr)\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    modules = set(result.stderr.split())
+    assert "argparse" in modules and "constants" in modules
+    loaded = modules & {"export", "snapshot", "sqlite3", "sg_rules", "prefix_lists", "collector", "boto3",
+                        "botocore", "pandas", "openpyxl", "xlsxwriter"}
+    assert not loaded
+    assert "routetable" in result.stdout
+
+# 새 프로세스에서 --help 전체 시간 (중앙값, 인터프리터 시작 포함) 상한
+HELP_BUDGET_MS = 100
+
+def test_cold_help_under_budget():
+    from bench_service import _median_ms
+    assert _median_ms(["aws_resource.py", "--help"], runs=5) < HELP_BUDGET_MS
+
+# 모듈 단독 실행은 통합 CLI 명령으로 넘어감 (--profile 은 어디서나 AWS 프로필, 계측은 --stats)
+def test_module_entry_points_delegate_to_cli():
+    for script, command in (("collector.py", "all"), ("service.py", "serve"), ("route_lookup.py", "route"),
+                            ("sg_reach.py", "reach")):
+        result = subprocess.run([sys.executable, script, "--help"], cwd=HERE, capture_output=True, text=True,
+                                check=True)
+        assert result.stdout.startswith(f"usage: aws_resource {command} "), script
+        if command in ("all", "route", "reach"):
+            assert ("--stats" in result.stdout) == (command == "all"), script
+        if command in ("route", "reach"):
+            assert "AWS 프로필" in result.stdout, script
+
+# 조회 명령 (route / reach) 은 --from-snapshot 으로 AWS 호출 없이 실행
+def test_query_commands_from_snapshot(session, account, tmp_path, capsys):
+    import aws_resource
+    from catalog import ResourceCatalog
+    from route_lookup import RouteIndex
+    from sg_reach import ReachabilityIndex
+    from snapshot import SnapshotSession, SnapshotStore
+
+    db = str(tmp_path / "snap.db")
+    recorded = ResourceCatalog(SnapshotSession(SnapshotStore(db), "DEV", "ap-northeast-2", base=session))
+    subnet = account.subnets[0]['SubnetId']
+    expected = RouteIndex.from_catalog(recorded).lookup(subnet, "10.0.0.1")
+    reachable = ReachabilityIndex.from_catalog(recorded).query("all", None, "0.0.0.0/0", "outbound")
+    assert reachable
+
+    aws_resource.main(["route", subnet, "10.0.0.1", "--from-snapshot", db, "--label", "DEV"])
+    out = capsys.readouterr().out
+    assert out.startswith("10.0.0.1") and expected.route_table_id in out
+
+    aws_resource.main(["reach", "all", "-", "0.0.0.0/0", "--outbound", "--from-snapshot", db, "--label", "DEV"])
+    assert capsys.readouterr().out.splitlines() == [
+        f"{m.group_id:<22} {m.group_name:<32} {m.direction:<8} {m.type:<6} {m.port_range:<12} {m.source:<40} {m.remark}"
+        for m in reachable]
@@ -0,0 +1,92 @@
+import time
+from collections import Counter
+
+import boto3
+from botocore.stub import Stubber
+
+import collector
+from synthetic import SyntheticSession
+
+EC2_REPORTS = ["routetable", "tgwroute", "securitygroup", "securitygroup2", "vpcendpoint"]
+EXPECTED_DESCRIBES = {"describe_vpcs", "describe_subnets", "describe_route_tables", "describe_security_groups",
+                      "describe_vpc_endpoints", "describe_network_interfaces",
+                      "describe_transit_gateway_route_tables", "describe_transit_gateway_attachments",
+                      "describe_managed_prefix_lists"}   # 합성 허브 TGW 테이블이 잘려 prefix list 라우트 재검색
+
+# 대상마다 카탈로그 1개: EC2 리포트 5개를 한 번에 수집해도 describe_* 는 대상당 1회씩
+def test_each_describe_called_once_per_target(make_account):
+    sessions = {}
+
+    def factory(profile_name=None, region_name=None):
+        return sessions.setdefault((profile_name, region_name),
+                                   SyntheticSession(make_account(seed=len(sessions))))
+
+    targets = ["dev:ap-northeast-2:DEV", "prod:ap-northeast-2:PROD"]
+    collected = collector.collect_reports(targets, EC2_REPORTS, session_factory=factory)
+
+    assert set(collected) == set(EC2_REPORTS)
+    assert len(sessions) == len(targets)
+    for session in sessions.values():
+        describes = Counter({op.split(".", 1)[1]: n for op, n in session.calls.items()
+                             if op.startswith("ec2.describe_")})
+        assert set(describes) == EXPECTED_DESCRIBES
+        assert all(n == 1 for n in describes.values()), describes
+
+# -------------------------
+# Stubber 기반 가짜 세션 (대상마다 EC2 client 1개, 응답 순서 고정)
+# - 호출마다 지연(CALL_LATENCY)을 넣어 대상 동시 수집의 시간 단축 확인
+# -------------------------
+CALL_LATENCY = 0.2
+STUB_TARGETS = ["a:ap-northeast-2:ALPHA", "b:ap-northeast-2:BRAVO", "c:ap-northeast-2:CHARLIE",
+                "d:ap-northeast-2:DELTA"]
+
+class StubSession:
+    def __init__(self, ec2):
+        self.ec2 = ec2
+
+    def client(self, service, **kwargs):
+        assert service == "ec2"
+        return self.ec2
+
+def _stubbed_sessions(delays):
+    sessions, stubbers = {}, []
+    for n, (profile, delay) in enumerate(delays.items()):
+        ec2 = boto3.client("ec2", region_name="ap-northeast-2", aws_access_key_id="test",
+                           aws_secret_access_key="test")
+        ec2.meta.events.register("before-parameter-build.ec2", lambda delay=delay, **kwargs: time.sleep(delay))
+        vpc, rtb = f"vpc-{n:017x}", f"rtb-{n:017x}"
+        stub = Stubber(ec2)
+        stub.add_response("describe_vpcs", {"Vpcs": [{"VpcId": vpc, "Tags": [{"Key": "Name", "Value": profile}]}]},
+                          {"MaxResults": 1000})
+        stub.add_response("describe_route_tables", {"RouteTables": [{
+            "RouteTableId": rtb, "VpcId": vpc,
+            "Routes": [{"DestinationCidrBlock": f"10.{n}.0.0/16", "GatewayId": "local"}]}]}, {"MaxResults": 100})
+        stub.activate()
+        sessions[profile] = StubSession(ec2)
+        stubbers.append(stub)
+    return (lambda profile_name=None, region_name=None: sessions[profile_name]), stubbers
+
+def _routetable_run(delays, max_workers):
+    factory, stubbers = _stubbed_sessions(delays)
+    started = time.perf_counter()
+    collected = collector.collect_reports(STUB_TARGETS, ["routetable"], max_workers=max_workers,
+                                          session_factory=factory)
+    elapsed = time.perf_counter() - started
+    for stub in stubbers:
+        stub.assert_no_pending_responses()
+    return collector.concat_frames(collected["routetable"]), elapsed
+
+# 대상마다 ACCOUNT 라벨, 먼저 끝난 대상과 관계없이 입력 대상 순서대로 병합
+def test_stubbed_targets_keep_label_and_order():
+    # 첫 대상이 가장 늦게 끝나도록 지연
+    df, _ = _routetable_run({"a": 0.3, "b": 0.0, "c": 0.05, "d": 0.0}, max_workers=4)
+    assert df['ACCOUNT'].tolist() == ["ALPHA", "BRAVO", "CHARLIE", "DELTA"]
+    assert df['VPC Name'].tolist() == ["a", "b", "c", "d"]
+    assert df['Destination'].tolist() == ["10.0.0.0/16", "10.1.0.0/16", "10.2.0.0/16", "10.3.0.0/16"]
+
+# 대상 4개 동시 수집 ≈ 대상 1개 시간 (순차 대비 거의 선형 단축)
+def test_stubbed_targets_speedup_near_linear():
+    delays = dict.fromkeys("abcd", CALL_LATENCY)
+    _, sequential = _routetable_run(delays, max_workers=1)
+    _, concurrent = _routetable_run(delays, max_workers=4)
+    assert sequential / concurrent >= 0.75 * len(STUB_TARGETS)
@@ -0,0 +1,115 @@
+import csv
+import json
+
+import pandas as pd
+import pytest
+
+import export
+from export import DICTIONARY_COLUMNS, SG_COLUMNS, export_frame, export_sg, write_rows
+from sg_rules import iter_sg_rules
+from synthetic import synthetic_security_groups
+
+ROWS = [("DEV", "메인-vpc", "vpc-1", "rtb-a", "10.0.0.0/16", "local"),
+        ("DEV", "메인-vpc", "vpc-1", "rtb-a", "0.0.0.0/0", "igw-1"),
+        ("PROD", "서비스, \"quoted\"", "vpc-2", None, "::/0", "igw-2")]
+COLUMNS = ['ACCOUNT', 'VPC Name', 'VPC ID', 'Route Tables ID', 'Destination', 'Target']
+
+def _expected_sg_rows(sheets, dialect):
+    return sum(len(in_rules) + len(out_rules)
+               for _, vpc_map, sgs in sheets
+               for _, _, _, in_rules, out_rules in iter_sg_rules(vpc_map, sgs, dialect))
+
+def _sheets():
+    return [("DEV", *synthetic_security_groups(40)), ("PROD", *synthetic_security_groups(25))]
+
+# ==========================================
+# CSV: BOM 포함 utf-8, 첫 줄이 헤더
+# ==========================================
+def test_csv_has_bom_and_header(tmp_path):
+    path = tmp_path / "out.csv"
+    write_rows(iter(ROWS), COLUMNS, path, "csv")
+    raw = path.read_bytes()
+    assert raw.startswith(b"\xef\xbb\xbf")
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        header, *rows = list(csv.reader(f))
+    assert header == COLUMNS
+    assert rows == [["" if v is None else v for v in row] for row in ROWS]
+
+def test_frame_csv_has_bom_and_header(tmp_path):
+    path = tmp_path / "frame.csv"
+    export_frame(pd.DataFrame(ROWS, columns=COLUMNS), path, "csv", report="routetable")
+    assert path.read_bytes().startswith(b"\xef\xbb\xbf")
+    assert pd.read_csv(path, encoding="utf-8-sig").columns.tolist() == COLUMNS
+
+# ==========================================
+# JSON Lines: 한 줄에 JSON 객체 하나 (한글은 이스케이프 없이)
+# ==========================================
+@pytest.mark.parametrize("source", ["rows", "frame"])
+def test_jsonl_one_object_per_line(tmp_path, source):
+    path = tmp_path / "out.jsonl"
+    if source == "rows":
+        write_rows(iter(ROWS), COLUMNS, path, "jsonl")
+    else:
+        export_frame(pd.DataFrame(ROWS, columns=COLUMNS), path, "jsonl")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(ROWS)
+    records = [json.loads(line) for line in lines]
+    assert all(isinstance(r, dict) and list(r) == COLUMNS for r in records)
+    assert [tuple(r.values()) for r in records] == ROWS
+    assert "메인-vpc" in lines[0]
+
+# ==========================================
+# Parquet: pyarrow 로 다시 읽어 값 / 사전 인코딩 컬럼 확인
+# ==========================================
+def _dictionary_columns(table):
+    import pyarrow as pa
+    return {field.name for field in table.schema if pa.types.is_dictionary(field.type)}
+
+def test_parquet_rows_round_trip_with_dictionary_columns(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(export, "BATCH_ROWS", 2)   # 여러 RecordBatch 로 나눠 기록
+    path = tmp_path / "out.parquet"
+    write_rows(iter(ROWS), COLUMNS, path, "parquet", DICTIONARY_COLUMNS["routetable"])
+    table = pq.read_table(path)
+    assert table.column_names == COLUMNS
+    assert _dictionary_columns(table) == set(DICTIONARY_COLUMNS["routetable"]) & set(COLUMNS)
+    assert [tuple(r.values()) for r in table.to_pylist()] == ROWS
+
+def test_parquet_frame_round_trip_with_dictionary_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "frame.parquet"
+    df = pd.DataFrame(ROWS, columns=COLUMNS)
+    export_frame(df, path, "parquet", report="routetable")
+    table = pq.read_table(path)
+    assert _dictionary_columns(table) == set(DICTIONARY_COLUMNS["routetable"]) & set(COLUMNS)
+    assert [tuple(r.values()) for r in table.to_pylist()] == ROWS
+
+# ==========================================
+# 보안그룹: 출력 행 수 = 펼친 룰 수 (방향별 룰 합계)
+# ==========================================
+@pytest.mark.parametrize("dialect", ["side_by_side", "centered"])
+@pytest.mark.parametrize("fmt", ["csv", "jsonl", "parquet"])
+def test_export_sg_row_count_matches_expanded_rules(tmp_path, fmt, dialect):
+    if fmt == "parquet":
+        pq = pytest.importorskip("pyarrow.parquet")
+    sheets = _sheets()
+    expected = _expected_sg_rows(sheets, dialect)
+    path = tmp_path / f"sg.{fmt}"
+    export_sg(sheets, path, fmt, dialect)
+
+    if fmt == "csv":
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            header, *rows = list(csv.reader(f))
+        assert header == SG_COLUMNS
+        accounts = [row[0] for row in rows]
+    elif fmt == "jsonl":
+        rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        accounts = [row['ACCOUNT'] for row in rows]
+    else:
+        table = pq.read_table(path)
+        report = "securitygroup" if dialect == "side_by_side" else "securitygroup2"
+        assert _dictionary_columns(table) == set(DICTIONARY_COLUMNS[report])
+        rows = table.to_pylist()
+        accounts = [row['ACCOUNT'] for row in rows]
+    assert len(rows) == expected
+    assert set(accounts) == {"DEV", "PROD"}
@@ -0,0 +1,107 @@
+import boto3
+from botocore.stub import Stubber
+
+from catalog import ResourceCatalog
+from get_permissionset import COLUMNS, get_permission_set_data
+
+INSTANCE = "arn:aws:sso:::instance/ssoins-1234567890abcdef"
+STORE = "d-1234567890"
+PS_ADMIN = "arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-aaaaaaaaaaaaaaaa"
+PS_READ = "arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-bbbbbbbbbbbbbbbb"
+PS_LEGACY = "arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-cccccccccccccccc"   # 목록 조회에 없음
+PS_DELETED = "arn:aws:sso:::permissionSet/ssoins-1234567890abcdef/ps-dddddddddddddddd"  # 목록 조회에 없음 + 이미 삭제
+PROD, DEV = "111111111111", "222222222222"
+
+# 서비스별 Stubber 클라이언트를 돌려주는 세션
+class StubSession:
+    def __init__(self, clients):
+        self.clients = clients
+
+    def client(self, service, **kwargs):
+        return self.clients[service]
+
+def _client(service):
+    return boto3.client(service, region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test")
+
+def _assignment(account_id, arn, principal_type, principal_id):
+    return {"AccountId": account_id, "PermissionSetArn": arn, "PrincipalType": principal_type,
+            "PrincipalId": principal_id}
+
+def _group(group_id, name):
+    return {"GroupId": group_id, "DisplayName": name, "IdentityStoreId": STORE, "Revision": "1",
+            "GroupArn": f"arn:aws:identitystore::123456789012:identitystore/{STORE}/group/{group_id}"}
+
+def _user(user_id, name, display_name):
+    return {"UserId": user_id, "UserName": name, "DisplayName": display_name, "IdentityStoreId": STORE,
+            "Revision": "1", "UserArn": f"arn:aws:identitystore::123456789012:identitystore/{STORE}/user/{user_id}"}
+
+def _membership(group_id, user_id):
+    return {"IdentityStoreId": STORE, "MembershipId": f"m-{group_id}-{user_id}",
+            "MembershipArn": f"arn:aws:identitystore::123456789012:identitystore/{STORE}/membership/m-{group_id}-{user_id}",
+            "GroupId": group_id, "MemberId": {"UserId": user_id}}
+
+# max_workers=1: 권한 세트 / (계정, 권한 세트) / 그룹 조회가 넣은 순서대로 호출되어 Stubber 응답 순서와 일치
+def _stub_sso_admin(stub):
+    instance = {"InstanceArn": INSTANCE}
+    stub.add_response("list_instances", {"Instances": [{"InstanceArn": INSTANCE, "IdentityStoreId": STORE}]}, {})
+    stub.add_response("list_permission_sets", {"PermissionSets": [PS_ADMIN, PS_READ]}, instance)
+    for arn, name, accounts in ((PS_ADMIN, "AdminAccess", [PROD]), (PS_READ, "ReadOnly", [PROD, DEV])):
+        stub.add_response("describe_permission_set", {"PermissionSet": {"Name": name, "PermissionSetArn": arn}},
+                          {**instance, "PermissionSetArn": arn})
+        stub.add_response("list_accounts_for_provisioned_permission_set", {"AccountIds": accounts},
+                          {**instance, "PermissionSetArn": arn})
+
+    assignments = {
+        (PROD, PS_ADMIN): [_assignment(PROD, PS_ADMIN, "USER", "u-1")],                 # 직접 할당
+        (PROD, PS_READ): [_assignment(PROD, PS_READ, "GROUP", "g-dev")],                # 그룹 (멤버 2명)
+        (DEV, PS_READ): [_assignment(DEV, PS_READ, "GROUP", "g-empty"),                 # 멤버 없는 그룹
+                         _assignment(DEV, PS_LEGACY, "USER", "u-2"),                    # 프로비저닝 목록에 없는 권한 세트
+                         _assignment(DEV, PS_DELETED, "USER", "u-1")],
+    }
+    for (account_id, arn), items in assignments.items():
+        stub.add_response("list_account_assignments", {"AccountAssignments": items},
+                          {**instance, "AccountId": account_id, "PermissionSetArn": arn})
+
+    # 목록에 없던 권한 세트는 ARN 순서로 이름 조회 (삭제된 것은 ARN 그대로)
+    stub.add_response("describe_permission_set", {"PermissionSet": {"Name": "Legacy", "PermissionSetArn": PS_LEGACY}},
+                      {**instance, "PermissionSetArn": PS_LEGACY})
+    stub.add_client_error("describe_permission_set", "ResourceNotFoundException",
+                          expected_params={**instance, "PermissionSetArn": PS_DELETED})
+
+def _stub_identity_store(stub):
+    store = {"IdentityStoreId": STORE}
+    stub.add_response("list_groups", {"Groups": [_group("g-dev", "devs"), _group("g-empty", "empty")]}, store)
+    stub.add_response("list_group_memberships",
+                      {"GroupMemberships": [_membership("g-dev", "u-1"), _membership("g-dev", "u-2")]},
+                      {**store, "GroupId": "g-dev"})
+    stub.add_response("list_group_memberships", {"GroupMemberships": []}, {**store, "GroupId": "g-empty"})
+    stub.add_response("list_users", {"Users": [_user("u-1", "alice", "Alice"), _user("u-2", "bob", "Bob")]}, store)
+
+def test_permission_set_matrix_with_stubbed_sso():
+    clients = {name: _client(name) for name in ("sso-admin", "identitystore", "organizations")}
+    stubs = {name: Stubber(client) for name, client in clients.items()}
+    _stub_sso_admin(stubs["sso-admin"])
+    _stub_identity_store(stubs["identitystore"])
+    stubs["organizations"].add_response("list_accounts", {"Accounts": [{"Id": PROD, "Name": "prod"},
+                                                                       {"Id": DEV, "Name": "dev"}]}, {})
+    for stub in stubs.values():
+        stub.activate()
+    try:
+        df = get_permission_set_data(catalog=ResourceCatalog(StubSession(clients)), account_label="ORG",
+                                     max_workers=1)
+        for stub in stubs.values():
+            stub.assert_no_pending_responses()
+    finally:
+        for stub in stubs.values():
+            stub.deactivate()
+
+    assert df.columns.tolist() == ['ACCOUNT'] + COLUMNS
+    assert (df['ACCOUNT'] == "ORG").all()
+    assert [tuple(row) for row in df[COLUMNS].itertuples(index=False)] == [
+        (DEV, "dev", "Legacy", "bob", "Bob", "Direct"),
+        (DEV, "dev", "ReadOnly", "-", "-", "Group: empty"),
+        (DEV, "dev", PS_DELETED, "alice", "Alice", "Direct"),
+        (PROD, "prod", "AdminAccess", "alice", "Alice", "Direct"),
+        (PROD, "prod", "ReadOnly", "alice", "Alice", "Group: devs"),
+        (PROD, "prod", "ReadOnly", "bob", "Bob", "Group: devs"),
+    ]
@@ -0,0 +1,80 @@
+import math
+
+import boto3
+from botocore.stub import Stubber
+
+import collector
+from catalog import ResourceCatalog
+from get_ssouser import build_membership_index, get_sso_user_data
+from synthetic import SyntheticSession, session_factory
+
+STORE = "d-1234567890"
+
+def _membership(group_id, user_id):
+    return {"IdentityStoreId": STORE, "MembershipId": f"m-{group_id}-{user_id}",
+            "MembershipArn": f"arn:aws:identitystore::123456789012:identitystore/{STORE}/membership/m-{group_id}-{user_id}",
+            "GroupId": group_id,
+            "MemberId": {"UserId": user_id}}
+
+# 그룹마다 list_group_memberships 를 페이지 끝까지 (NextToken 포함) - 사용자별 조회 없음
+def test_membership_index_pages_per_group_with_stubbed_identity_store():
+    client = boto3.client("identitystore", region_name="us-east-1",
+                          aws_access_key_id="test", aws_secret_access_key="test")
+    group_map = {"g-1": "admins", "g-2": "devs"}
+    with Stubber(client) as stub:
+        stub.add_response("list_group_memberships",
+                          {"GroupMemberships": [_membership("g-1", "u-1"), _membership("g-1", "u-2")],
+                           "NextToken": "page-2"},
+                          {"IdentityStoreId": STORE, "GroupId": "g-1"})
+        stub.add_response("list_group_memberships", {"GroupMemberships": [_membership("g-1", "u-3")]},
+                          {"IdentityStoreId": STORE, "GroupId": "g-1", "NextToken": "page-2"})
+        stub.add_response("list_group_memberships", {"GroupMemberships": [_membership("g-2", "u-1")]},
+                          {"IdentityStoreId": STORE, "GroupId": "g-2"})
+        index = build_membership_index(client, STORE, group_map, max_workers=1)
+        stub.assert_no_pending_responses()
+    assert {uid: sorted(groups) for uid, groups in index.items()} == {
+        "u-1": ["admins", "devs"], "u-2": ["admins"], "u-3": ["admins"]}
+
+# 멤버십 조회 호출 수는 그룹 페이지 수 (사용자 수와 무관)
+def test_membership_calls_scale_with_groups_not_users(make_account):
+    for n_users in (30, 600):
+        account = make_account(n_users=n_users, n_groups=5)
+        session = SyntheticSession(account)
+        df = get_sso_user_data(catalog=ResourceCatalog(session), cache_db=None)
+        pages = sum(max(1, math.ceil(len(m) / 100)) for m in account.memberships.values())
+        assert session.calls["identitystore.list_group_memberships"] == pages
+        assert session.calls["identitystore.list_group_memberships_for_member"] == 0
+        assert session.calls["identitystore.list_groups"] == 1
+        assert len(df) == n_users
+
+# 사용자 상세 캐시: 처음엔 사용자마다 describe_user, 다시 실행하면 0, Revision 이 바뀐 사용자만 다시 조회
+def test_user_detail_cache_refetches_only_changed_users(make_account, tmp_path):
+    account = make_account(n_users=40)
+    cache_db = str(tmp_path / "lookup.db")
+    expected = {"cold": 40, "warm": 0, "changed": 5}
+    for label, calls in expected.items():
+        if label == "changed":
+            for user in account.users[:calls]:
+                user['Revision'] += 1
+        session = SyntheticSession(account)
+        df = get_sso_user_data(catalog=ResourceCatalog(session), cache_db=cache_db)
+        assert session.calls["identitystore.describe_user"] == calls, label
+        assert (df['UserStatus'] != "-").all()
+
+# --snapshot 없이 수집하면 조회 캐시 파일을 만들지 않음 (매번 describe_user)
+def test_user_detail_cache_is_off_without_snapshot(account, tmp_path):
+    collected = collector.collect_reports(["bench:ap-northeast-2:BENCH"], ["ssouser"],
+                                          session_factory=session_factory(account))
+    assert len(collected["ssouser"][0]) == len(account.users)
+    assert list(tmp_path.iterdir()) == []
+
+# ssouser + permissionset 을 한 번에 수집해도 SSO 인스턴스 / 그룹 / 그룹 멤버 / 사용자 목록은 한 번만 조회
+def test_sso_reports_share_identity_lookups(account):
+    session = SyntheticSession(account)
+    collected = collector.collect_reports(["bench:ap-northeast-2:BENCH"], ["ssouser", "permissionset"],
+                                          session_factory=lambda profile_name=None, region_name=None: session)
+    assert all(len(collected[name][0]) for name in ("ssouser", "permissionset"))
+    assert session.calls["sso-admin.list_instances"] == 1
+    assert session.calls["identitystore.list_groups"] == 1
+    assert session.calls["identitystore.list_users"] == 1
+    assert session.calls["identitystore.list_group_memberships"] == len(account.groups)
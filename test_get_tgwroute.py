@@ -0,0 +1,118 @@
+import boto3
+from botocore.stub import Stubber
+
+from catalog import ResourceCatalog
+from get_tgwroute import ROUTE_STATES, attachment_names, get_tgw_route_data, search_routes
+from resources import tag_name
+
+RTB = "tgw-rtb-0123456789abcdef0"
+LIMIT = 5   # search_transit_gateway_routes MaxResults 최소값 (잘림 여부는 응답의 AdditionalRoutesAvailable)
+
+def _route(cidr, key="DestinationCidrBlock"):
+    return {key: cidr, "Type": "static", "State": "active",
+            "TransitGatewayAttachments": [{"TransitGatewayAttachmentId": "tgw-attach-0123456789abcdef0",
+                                           "ResourceId": "vpc-0123456789abcdef0", "ResourceType": "vpc"}]}
+
+def _expect(stub, routes, truncated, kind=None, cidr=None):
+    filters = [{"Name": "state", "Values": ROUTE_STATES}]
+    if kind:
+        filters.append({"Name": f"route-search.{kind}-match", "Values": [cidr]})
+    stub.add_response("search_transit_gateway_routes",
+                      {"Routes": [_route(c) for c in routes], "AdditionalRoutesAvailable": truncated},
+                      {"TransitGatewayRouteTableId": RTB, "MaxResults": LIMIT, "Filters": filters})
+
+# 잘린 검색은 0.0.0.0/0 · ::/0 로 나누고, 다시 잘린 범위는 exact + 절반 범위 2개로 나눠 검색 (목적지 중복 제거)
+# - max_workers=1: 작업을 넣은 순서대로 호출되어 Stubber 의 응답 순서와 일치
+def test_truncated_search_splits_ranges_with_stubbed_ec2():
+    ec2 = boto3.client("ec2", region_name="ap-northeast-2", aws_access_key_id="test", aws_secret_access_key="test")
+    with Stubber(ec2) as stub:
+        _expect(stub, ["10.0.0.0/16", "10.1.0.0/16"], True)
+        _expect(stub, ["10.0.0.0/16", "10.1.0.0/16"], True, "subnet-of", "0.0.0.0/0")
+        _expect(stub, ["2001:db8::/32"], False, "subnet-of", "::/0")
+        _expect(stub, ["0.0.0.0/0"], False, "exact", "0.0.0.0/0")
+        _expect(stub, ["10.0.0.0/16", "10.1.0.0/16"], False, "subnet-of", "0.0.0.0/1")
+        _expect(stub, ["172.16.0.0/12"], False, "subnet-of", "128.0.0.0/1")
+        found = search_routes(ec2, [RTB], max_workers=1, limit=LIMIT)
+        stub.assert_no_pending_responses()
+
+    destinations = [route["DestinationCidrBlock"] for route in found[RTB]]
+    assert sorted(destinations) == sorted(["10.0.0.0/16", "10.1.0.0/16", "2001:db8::/32", "0.0.0.0/0",
+                                           "172.16.0.0/12"])
+
+# 잘리지 않은 테이블은 호출 1회
+def test_untruncated_table_searched_once():
+    ec2 = boto3.client("ec2", region_name="ap-northeast-2", aws_access_key_id="test", aws_secret_access_key="test")
+    with Stubber(ec2) as stub:
+        _expect(stub, ["10.0.0.0/16"], False)
+        found = search_routes(ec2, [RTB], max_workers=1, limit=LIMIT)
+        stub.assert_no_pending_responses()
+    assert [route["DestinationCidrBlock"] for route in found[RTB]] == ["10.0.0.0/16"]
+
+# 잘린 테이블: CIDR 범위 검색 뒤 prefix-list-id 필터로 prefix list 목적지 라우트를 한 번 더 검색
+# - ID 목록 함수는 잘린 테이블이 있을 때 한 번만 호출
+def test_truncated_table_searches_prefix_list_routes():
+    ec2 = boto3.client("ec2", region_name="ap-northeast-2", aws_access_key_id="test", aws_secret_access_key="test")
+    calls = []
+
+    def prefix_list_ids():
+        calls.append(1)
+        return ["pl-0789aaaa", "pl-0123abcd", "pl-0789aaaa"]
+
+    with Stubber(ec2) as stub:
+        _expect(stub, ["10.0.0.0/16", "10.1.0.0/16"], True)
+        _expect(stub, ["10.0.0.0/16", "10.1.0.0/16"], False, "subnet-of", "0.0.0.0/0")
+        _expect(stub, [], False, "subnet-of", "::/0")
+        stub.add_response("search_transit_gateway_routes",
+                          {"Routes": [_route("pl-0789aaaa", key="PrefixListId")],
+                           "AdditionalRoutesAvailable": False},
+                          {"TransitGatewayRouteTableId": RTB, "MaxResults": LIMIT,
+                           "Filters": [{"Name": "state", "Values": ROUTE_STATES},
+                                       {"Name": "prefix-list-id", "Values": ["pl-0123abcd", "pl-0789aaaa"]}]})
+        found = search_routes(ec2, [RTB], max_workers=1, limit=LIMIT, prefix_list_ids=prefix_list_ids)
+        stub.assert_no_pending_responses()
+
+    assert calls == [1]
+    assert sorted(route.get("DestinationCidrBlock") or route["PrefixListId"] for route in found[RTB]) == [
+        "10.0.0.0/16", "10.1.0.0/16", "pl-0789aaaa"]
+
+# ID 목록이 없으면 추가 검색 없이 경고
+def test_truncated_table_without_prefix_list_ids_warns(capsys):
+    ec2 = boto3.client("ec2", region_name="ap-northeast-2", aws_access_key_id="test", aws_secret_access_key="test")
+    with Stubber(ec2) as stub:
+        _expect(stub, ["10.0.0.0/16"], True)
+        _expect(stub, ["10.0.0.0/16"], False, "subnet-of", "0.0.0.0/0")
+        _expect(stub, [], False, "subnet-of", "::/0")
+        search_routes(ec2, [RTB], max_workers=1, limit=LIMIT)
+        stub.assert_no_pending_responses()
+    assert "prefix list 목적지 라우트 일부 누락 가능" in capsys.readouterr().out
+
+# ==========================================
+# attachment 표기 / 리포트 행 (합성 계정)
+# ==========================================
+def test_attachment_names_resolve_vpc_through_vpc_map():
+    attachments = [
+        {"TransitGatewayAttachmentId": "tgw-attach-1", "ResourceType": "vpc", "ResourceId": "vpc-1",
+         "Tags": [{"Key": "Name", "Value": "att-app"}]},
+        {"TransitGatewayAttachmentId": "tgw-attach-2", "ResourceType": "vpc", "ResourceId": "vpc-other",
+         "Tags": [{"Key": "Name", "Value": "att-shared"}]},
+        {"TransitGatewayAttachmentId": "tgw-attach-3", "ResourceType": "vpc", "ResourceId": "vpc-untagged"},
+        {"TransitGatewayAttachmentId": "tgw-attach-4", "ResourceType": "vpn", "ResourceId": "vpn-1"},
+    ]
+    assert attachment_names(attachments, {"vpc-1": "app-vpc"}) == {
+        "tgw-attach-1": "app-vpc", "tgw-attach-2": "att-shared", "tgw-attach-3": "vpc-untagged",
+        "tgw-attach-4": "vpn-1"}
+
+def test_tgw_route_rows_use_vpc_names_and_include_hub_prefix_list_route(session, account):
+    df = get_tgw_route_data(catalog=ResourceCatalog(session), account_label="DEV")
+    vpc_names = {vpc["VpcId"]: tag_name(vpc, vpc["VpcId"]) for vpc in account.vpcs}
+    vpc_rows = df[(df["Resource Type"] == "vpc") & (df["Attachment ID"] != "tgw-attach-shared00")]
+    assert len(vpc_rows)
+    attachments = {att["TransitGatewayAttachmentId"]: att["ResourceId"] for att in account.tgw_attachments}
+    assert (vpc_rows["Target"] == vpc_rows["Attachment ID"].map(attachments).map(vpc_names)).all()
+    assert set(df.loc[df["Attachment ID"] == "tgw-attach-shared00", "Target"]) == {"att-shared-services"}
+
+    # 허브 테이블(라우트 수 > MaxResults)의 prefix list 라우트도 포함, 범위 검색 결과와 합쳐 빠짐 없음
+    for rtb_id, routes in account.tgw_routes.items():
+        expected = {r.get("DestinationCidrBlock") or r["PrefixListId"] for r in routes if r["State"] in ROUTE_STATES}
+        assert set(df.loc[df["TGW Route Table ID"] == rtb_id, "Destination"]) == expected, rtb_id
+    assert session.calls["ec2.describe_managed_prefix_lists"] == 1
@@ -0,0 +1,28 @@
+from catalog import ResourceCatalog
+from get_vpcendpoint import get_vpce_data_with_ip
+from synthetic import SyntheticSession
+
+def _eni_calls(account):
+    session = SyntheticSession(account)
+    df = get_vpce_data_with_ip(catalog=ResourceCatalog(session))
+    return session.calls["ec2.describe_network_interfaces"], df
+
+# ENI 조회 호출 수는 엔드포인트 수와 무관 (엔드포인트마다 호출하지 않음)
+def test_eni_lookup_calls_constant_in_endpoint_count(make_account):
+    calls_small, _ = _eni_calls(make_account(n_vpce=10))
+    calls_large, df_large = _eni_calls(make_account(n_vpce=300))
+    assert calls_small == calls_large == 1
+    assert df_large["Endpoint ID"].nunique() == 300
+    assert (df_large.loc[df_large["Type"] == "Interface", "Private IP"] != "-").all()
+
+# ENI 가 하나도 조회되지 않는 Interface 엔드포인트도 행 1개 (Subnet/IP "-")
+def test_unresolved_interface_endpoint_keeps_base_row(account, session):
+    endpoint = next(e for e in account.vpc_endpoints if e["VpcEndpointType"] == "Interface")
+    endpoint["NetworkInterfaceIds"] = ["eni-gone0001", "eni-gone0002"]
+    df = get_vpce_data_with_ip(catalog=ResourceCatalog(session))
+    rows = df[df["Endpoint ID"] == endpoint["VpcEndpointId"]]
+    assert len(rows) == 1
+    assert rows.iloc[0][["Subnet", "Private IP"]].tolist() == ["-", "-"]
+    assert df["Endpoint ID"].nunique() == len(account.vpc_endpoints)
+    # 빠진 ENI 는 ID 필터로 한 번 더 조회 (묶음 1회)
+    assert session.calls["ec2.describe_network_interfaces"] == 2
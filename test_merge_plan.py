@@ -0,0 +1,55 @@
+import pandas as pd
+
+from merge_plan import plan_merges, write_planned
+
+# 쓰기 호출을 그대로 기록하는 가짜 워크시트 (bench_excel.NullSheet 와 같은 인터페이스)
+class RecordingSheet:
+    def __init__(self):
+        self.merges = []
+        self.cells = {}
+
+    def merge_range(self, first_row, first_col, last_row, last_col, value, fmt=None):
+        self.merges.append((first_row, first_col, last_row, last_col, value))
+
+    def write(self, row, col, value, fmt=None):
+        self.cells[(row, col)] = value
+
+    def write_column(self, row, col, data, fmt=None):
+        for offset, value in enumerate(data):
+            self.cells[(row + offset, col)] = value
+
+def _write(df, merge_cols, key_cols=None):
+    sheet = RecordingSheet()
+    write_planned(sheet, df, plan_merges(df, merge_cols, key_cols), fmt=None)
+    return sheet
+
+# 자식 컬럼(Route Table)은 값이 같아도 부모(VPC) 경계를 넘어 병합되지 않음
+def test_child_column_does_not_merge_across_parent_boundary():
+    df = pd.DataFrame({'VPC': ["vpc-a", "vpc-a", "vpc-b", "vpc-b"],
+                       'Route Table': ["main", "main", "main", "main"],
+                       'Destination': ["10.0.0.0/16", "0.0.0.0/0", "10.1.0.0/16", "0.0.0.0/0"]})
+    sheet = _write(df, [0, 1])
+    assert sheet.merges == [(1, 0, 2, 0, "vpc-a"), (3, 0, 4, 0, "vpc-b"),
+                            (1, 1, 2, 1, "main"), (3, 1, 4, 1, "main")]
+    assert [sheet.cells[(row, 2)] for row in range(1, 5)] == df['Destination'].tolist()
+
+# 한 행짜리 구간은 merge_range 없이 단일 셀로 기록
+def test_single_row_runs_written_without_merge():
+    df = pd.DataFrame({'VPC': ["vpc-a", "vpc-b", "vpc-b"], 'Route Table': ["rtb-1", "rtb-2", "rtb-3"]})
+    sheet = _write(df, [0, 1])
+    assert sheet.merges == [(2, 0, 3, 0, "vpc-b")]
+    assert sheet.cells == {(1, 0): "vpc-a", (1, 1): "rtb-1", (2, 1): "rtb-2", (3, 1): "rtb-3"}
+
+# key_cols 모드: 모든 병합 컬럼을 Endpoint ID 구간으로 병합 (값이 같은 이웃 엔드포인트와 합쳐지지 않음)
+def test_key_cols_merge_by_endpoint_id():
+    df = pd.DataFrame({'Endpoint ID': ["vpce-1", "vpce-1", "vpce-2", "vpce-3", "vpce-3"],
+                       'Service': ["s3", "s3", "s3", "ecr", "ecr"],
+                       'IP': ["10.0.0.1", "10.0.1.1", "10.0.0.2", "10.0.0.3", "10.0.1.3"]})
+    sheet = _write(df, [0, 1], key_cols=[0])
+    assert sheet.merges == [(1, 0, 2, 0, "vpce-1"), (4, 0, 5, 0, "vpce-3"),
+                            (1, 1, 2, 1, "s3"), (4, 1, 5, 1, "ecr")]
+    assert sheet.cells[(3, 0)] == "vpce-2" and sheet.cells[(3, 1)] == "s3"
+    assert [sheet.cells[(row, 2)] for row in range(1, 6)] == df['IP'].tolist()
+
+def test_empty_frame_has_no_plan():
+    assert plan_merges(pd.DataFrame({'VPC': []}), [0]) == []
@@ -0,0 +1,116 @@
+import gc
+import itertools
+import threading
+import time
+
+import pytest
+
+import collector
+from pipeline import Stage, prefetch
+from synthetic import SyntheticSession
+
+TARGETS = ["dev:ap-northeast-2:DEV", "prod:ap-northeast-2:PROD"]
+JOIN_TIMEOUT = 10   # 이 시간 안에 끝나지 않으면 멈춘 것으로 판단
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "prefetch" and t.is_alive()]
+
+def _wait_until(check, timeout=JOIN_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check():
+            return True
+        time.sleep(0.01)
+    return check()
+
+# ==========================================
+# prefetch
+# ==========================================
+def test_prefetch_keeps_order():
+    assert list(prefetch(iter(range(100)), maxsize=3)) == list(range(100))
+
+# 생산 측 예외는 그때까지 받은 항목 뒤에 소비 측에서 그대로 다시 발생
+def test_producer_exception_reraised_in_consumer():
+    def pages():
+        yield 1
+        yield 2
+        raise ValueError("page 3 failed")
+
+    received = []
+    with pytest.raises(ValueError, match="page 3 failed"):
+        for item in prefetch(pages()):
+            received.append(item)
+    assert received == [1, 2]
+    assert _wait_until(lambda: not _prefetch_threads())
+
+# 소비 측이 중간에 멈추면 (close / 참조 해제) 가득 찬 큐에서 대기하던 생산 스레드도 종료
+@pytest.mark.parametrize("how", ["close", "drop"])
+def test_consumer_stopping_early_releases_producer(how):
+    produced = []
+
+    def endless():
+        for i in itertools.count():
+            produced.append(i)
+            yield i
+
+    items = prefetch(endless(), maxsize=2)
+    assert next(items) == 0
+    assert _wait_until(lambda: len(produced) >= 3)   # 큐가 가득 차 put 에서 대기 중
+    if how == "close":
+        items.close()
+    else:
+        del items
+        gc.collect()
+    assert _wait_until(lambda: not _prefetch_threads())
+    stopped_at = len(produced)
+    time.sleep(0.3)
+    assert len(produced) == stopped_at
+
+# ==========================================
+# Stage / collect_and_save
+# ==========================================
+def test_stage_runs_items_in_order_and_reraises_on_close():
+    seen = []
+
+    def consume(item):
+        if item == 2:
+            raise RuntimeError("write failed")
+        seen.append(item)
+
+    stage = Stage(consume, maxsize=1)
+    for item in range(10):   # 실패 뒤 항목도 큐가 비워지므로 submit 이 막히지 않음
+        stage.submit(item)
+    with pytest.raises(RuntimeError, match="write failed"):
+        stage.close()
+    assert seen == [0, 1]
+
+# 저장 단계 예외는 collect_and_save 에서 다시 발생하고, 남은 리포트 제출이 막혀 멈추지 않음
+def test_writer_error_reraised_from_collect_and_save(account, monkeypatch):
+    saved = []
+
+    def save_report(name, titles, results, formats=None, shard_by=None):
+        if not saved:
+            saved.append(name)
+            raise OSError(f"disk full while writing {name}")
+        saved.append(name)
+
+    monkeypatch.setattr(collector, "save_report", save_report)
+    monkeypatch.setattr(collector, "WRITE_QUEUE", 1)
+    sessions = {}
+    outcome = {}
+
+    def run():
+        try:
+            collector.collect_and_save(
+                TARGETS, session_factory=lambda profile_name=None, region_name=None:
+                    sessions.setdefault(profile_name, SyntheticSession(account)))
+        except BaseException as exc:
+            outcome['error'] = exc
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(JOIN_TIMEOUT)
+    assert not worker.is_alive(), "collect_and_save hung after a writer error"
+    assert isinstance(outcome.get('error'), OSError)
+    assert "disk full" in str(outcome['error'])
+    assert saved[:1] and len(saved) == 1   # 실패 뒤 리포트는 저장하지 않음
@@ -0,0 +1,48 @@
+from collections import Counter
+
+import collector
+from prefix_lists import route_prefix_list_ids, sg_prefix_list_ids
+from synthetic import SyntheticSession
+
+TARGET = ["bench:ap-northeast-2:BENCH"]
+REPORTS = ["routetable", "securitygroup", "securitygroup2"]
+
+def _references(account):
+    sg_refs = [pl["PrefixListId"] for sg in account.security_groups for key in ("IpPermissions", "IpPermissionsEgress")
+               for perm in sg.get(key) or [] for pl in perm.get("PrefixListIds") or []]
+    route_refs = [route["DestinationPrefixListId"] for rtb in account.route_tables for route in rtb["Routes"]
+                  if route.get("DestinationPrefixListId")]
+    return sg_refs + route_refs
+
+# get_managed_prefix_list_entries 첫 페이지 요청 수 (PrefixListId 별)
+def _count_entry_fetches(session):
+    fetches = Counter()
+
+    def count(params, **kwargs):
+        if "NextToken" not in params:
+            fetches[params["PrefixListId"]] += 1
+
+    session.events.register("before-call.ec2.GetManagedPrefixListEntries", count)
+    return fetches
+
+# 규칙 / 라우트 여러 개가 같은 목록을 참조하고 리포트 여러 개가 펼쳐도 목록마다 한 번만 조회
+def test_each_prefix_list_fetched_once_per_run(make_account):
+    account = make_account(n_sgs=200)
+    referenced = sg_prefix_list_ids(account.security_groups) | route_prefix_list_ids(account.route_tables)
+    assert len(_references(account)) > 2 * len(referenced)
+    session = SyntheticSession(account)
+    fetches = _count_entry_fetches(session)
+
+    collector.collect_reports(TARGET, REPORTS, session_factory=lambda profile_name=None, region_name=None: session,
+                              expand_prefix_lists=True)
+
+    assert set(fetches) == referenced & set(account.prefix_list_entries)
+    assert all(n == 1 for n in fetches.values()), fetches
+
+# --snapshot 없이는 실행 간 캐시 파일을 만들지 않음
+def test_prefix_list_cache_is_off_without_snapshot(account, tmp_path):
+    session = SyntheticSession(account)
+    collector.collect_reports(TARGET, ["securitygroup"], expand_prefix_lists=True,
+                              session_factory=lambda profile_name=None, region_name=None: session)
+    assert session.calls["ec2.get_managed_prefix_list_entries"] > 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,114 @@
+import ipaddress
+import random
+
+import pytest
+
+from route_lookup import RouteIndex
+
+VPC = "vpc-1"
+MAIN_RTB = "rtb-main"
+PRIVATE_RTB = "rtb-private"
+PL = "pl-0123456789abcdef0"
+
+SUBNETS = [
+    {'SubnetId': "subnet-public", 'VpcId': VPC, 'CidrBlock': "10.0.0.0/24"},
+    {'SubnetId': "subnet-private", 'VpcId': VPC, 'CidrBlock': "10.0.1.0/24",
+     'Ipv6CidrBlockAssociationSet': [{'Ipv6CidrBlock': "2001:db8:0:1::/64"}]},
+]
+
+def route_tables():
+    return [
+        {'RouteTableId': MAIN_RTB, 'VpcId': VPC, 'Associations': [{'Main': True}],
+         'Routes': [{'DestinationCidrBlock': "10.0.0.0/16", 'GatewayId': "local"},
+                    {'DestinationCidrBlock': "0.0.0.0/0", 'GatewayId': "igw-1"}]},
+        {'RouteTableId': PRIVATE_RTB, 'VpcId': VPC, 'Associations': [{'SubnetId': "subnet-private"}],
+         'Routes': [{'DestinationCidrBlock': "10.0.0.0/16", 'GatewayId': "local"},
+                    {'DestinationIpv6CidrBlock': "2001:db8::/56", 'GatewayId': "local"},
+                    {'DestinationCidrBlock': "0.0.0.0/0", 'NatGatewayId': "nat-1"},
+                    {'DestinationCidrBlock': "172.16.0.0/12", 'TransitGatewayId': "tgw-1"},
+                    {'DestinationCidrBlock': "172.16.5.0/24", 'VpcPeeringConnectionId': "pcx-1"},
+                    {'DestinationCidrBlock': "172.16.5.128/25", 'NetworkInterfaceId': "eni-1"},
+                    {'DestinationCidrBlock': "192.168.0.0/16", 'TransitGatewayId': "tgw-old",
+                     'State': "blackhole"},
+                    {'DestinationPrefixListId': PL, 'GatewayId': "vpce-1"},
+                    {'DestinationCidrBlock': "52.95.0.0/16", 'TransitGatewayId': "tgw-1"}]},
+    ]
+
+# prefix list 펼침: 52.95.0.0/16 은 CIDR 라우트와 길이가 같음, 52.219.0.0/16 은 prefix list 에만 있음
+PREFIX_LISTS = {PL: ["52.95.0.0/16", "52.219.0.0/16"]}
+
+@pytest.fixture
+def index():
+    return RouteIndex(route_tables(), SUBNETS, PREFIX_LISTS)
+
+# 겹치는 CIDR 중 가장 긴 프리픽스
+@pytest.mark.parametrize("dest, destination, target", [
+    ("172.16.5.200", "172.16.5.128/25", "eni-1"),
+    ("172.16.5.10", "172.16.5.0/24", "pcx-1"),
+    ("172.16.9.1", "172.16.0.0/12", "tgw-1"),
+    ("8.8.8.8", "0.0.0.0/0", "nat-1"),
+])
+def test_longest_prefix_wins(index, dest, destination, target):
+    match = index.lookup("subnet-private", dest)
+    assert (match.destination, match.target) == (destination, target)
+
+# VPC CIDR 안의 목적지는 local (IPv4 / IPv6)
+@pytest.mark.parametrize("dest", ["10.0.0.7", "10.0.200.1", "2001:db8:0:2::1"])
+def test_local_route_inside_vpc_cidr(index, dest):
+    match = index.lookup("subnet-private", dest)
+    assert match.target == "local"
+    assert match.state == "active"
+
+# blackhole 라우트는 건너뛰지 않고 blackhole 로 보고 (덜 구체적인 0.0.0.0/0 으로 넘어가지 않음)
+def test_blackhole_reported_not_skipped(index):
+    match = index.lookup("subnet-private", "192.168.1.1")
+    assert (match.destination, match.target, match.state) == ("192.168.0.0/16", "tgw-old", "blackhole")
+
+# 같은 길이의 CIDR 라우트와 prefix list 라우트: CIDR 라우트 우선, prefix list 에만 있는 범위는 prefix list
+def test_cidr_beats_prefix_list_of_same_length(index):
+    tie = index.lookup("subnet-private", "52.95.1.1")
+    assert (tie.destination, tie.target) == ("52.95.0.0/16", "tgw-1")
+    only_pl = index.lookup("subnet-private", "52.219.1.1")
+    assert (only_pl.destination, only_pl.target) == (PL, "vpce-1")
+
+# prefix list 를 펼치지 못하면 unresolved 에 기록하고 해당 라우트는 일치 대상에서 빠짐
+def test_unresolved_prefix_list():
+    index = RouteIndex(route_tables(), SUBNETS)
+    assert index.unresolved == {PL}
+    assert index.lookup("subnet-private", "52.219.1.1").target == "nat-1"
+
+# 명시적 연결이 없는 서브넷은 VPC 메인 라우팅 테이블로 폴백
+def test_fallback_to_main_route_table(index):
+    explicit = index.lookup("subnet-private", "8.8.8.8")
+    main = index.lookup("subnet-public", "8.8.8.8")
+    assert (explicit.route_table_id, explicit.association, explicit.target) == (PRIVATE_RTB, "explicit", "nat-1")
+    assert (main.route_table_id, main.association, main.target) == (MAIN_RTB, "main", "igw-1")
+
+# 출발지 IP → 서브넷 → 라우팅 테이블
+def test_source_ip_resolves_subnet(index):
+    assert index.lookup("10.0.1.9", "8.8.8.8").route_table_id == PRIVATE_RTB
+    assert index.lookup("10.0.0.9", "8.8.8.8").route_table_id == MAIN_RTB
+    with pytest.raises(KeyError):
+        index.lookup("10.9.9.9", "8.8.8.8")
+
+def test_no_matching_route_returns_none():
+    index = RouteIndex([{'RouteTableId': MAIN_RTB, 'VpcId': VPC, 'Associations': [{'Main': True}],
+                         'Routes': [{'DestinationCidrBlock': "10.0.0.0/16", 'GatewayId': "local"}]}], SUBNETS)
+    assert index.lookup("subnet-public", "8.8.8.8") is None
+
+# 임의 라우트 집합에서 trie 결과 == 모든 라우트를 훑어 가장 긴 프리픽스를 고른 결과
+def test_trie_agrees_with_linear_scan():
+    rng = random.Random(7)
+    routes = {}
+    for _ in range(300):
+        prefixlen = rng.randint(0, 32)
+        net = ipaddress.ip_network((rng.getrandbits(32), prefixlen), strict=False)
+        routes.setdefault(str(net), {'DestinationCidrBlock': str(net), 'GatewayId': f"igw-{len(routes)}"})
+    index = RouteIndex([{'RouteTableId': MAIN_RTB, 'VpcId': VPC, 'Associations': [{'Main': True}],
+                         'Routes': list(routes.values())}], SUBNETS)
+    nets = [ipaddress.ip_network(cidr) for cidr in routes]
+    for _ in range(2000):
+        address = ipaddress.ip_address(rng.getrandbits(32))
+        best = max((n for n in nets if address in n), key=lambda n: n.prefixlen, default=None)
+        match = index.lookup("subnet-public", address)
+        assert (match and match.destination) == (best and str(best))
@@ -0,0 +1,83 @@
+import boto3
+from botocore.stub import Stubber
+
+import get_routetable
+from catalog import ResourceCatalog
+from scope import FILTER_VALUE_LIMIT, Scope
+
+VPC = "vpc-0123456789abcdef0"
+
+# catalog 가 session.client("ec2") 로 받는 client 를 Stubber 로 고정
+class StubSession:
+    def __init__(self, ec2):
+        self.ec2 = ec2
+
+    def client(self, service, **kwargs):
+        assert service == "ec2"
+        return self.ec2
+
+def _stubbed_ec2():
+    return boto3.client("ec2", region_name="ap-northeast-2", aws_access_key_id="test", aws_secret_access_key="test")
+
+def test_scoped_resources_send_scope_filters():
+    ec2 = _stubbed_ec2()
+    scope = Scope(vpc_ids=[VPC], tags={"env": ["prd", "stg"], "team": []}, sg_names=["web-*"],
+                  services=["com.amazonaws.ap-northeast-2.s3"])
+    with Stubber(ec2) as stub:
+        stub.add_response("describe_security_groups", {"SecurityGroups": []}, {
+            "MaxResults": 1000,
+            "Filters": [{"Name": "vpc-id", "Values": [VPC]},
+                        {"Name": "tag:env", "Values": ["prd", "stg"]},
+                        {"Name": "tag-key", "Values": ["team"]},
+                        {"Name": "group-name", "Values": ["web-*"]}]})
+        stub.add_response("describe_vpc_endpoints", {"VpcEndpoints": []}, {
+            "MaxResults": 1000,
+            "Filters": [{"Name": "vpc-id", "Values": [VPC]},
+                        {"Name": "tag:env", "Values": ["prd", "stg"]},
+                        {"Name": "tag-key", "Values": ["team"]},
+                        {"Name": "service-name", "Values": ["com.amazonaws.ap-northeast-2.s3"]}]})
+        # 마스터 데이터는 VPC 범위만 (태그/이름 조건은 붙지 않음)
+        stub.add_response("describe_subnets", {"Subnets": []}, {
+            "MaxResults": 1000, "Filters": [{"Name": "vpc-id", "Values": [VPC]}]})
+        catalog = ResourceCatalog(StubSession(ec2), scope)
+        catalog.security_groups()
+        catalog.resources("vpc_endpoints")
+        catalog.subnets()
+        stub.assert_no_pending_responses()
+
+def test_unscoped_resources_send_no_filters():
+    ec2 = _stubbed_ec2()
+    with Stubber(ec2) as stub:
+        stub.add_response("describe_route_tables", {"RouteTables": []}, {"MaxResults": 100})
+        ResourceCatalog(StubSession(ec2)).resources("route_tables")
+        stub.assert_no_pending_responses()
+
+# 범위 지정 시 참조된 ID 만 ID 필터로, FILTER_VALUE_LIMIT 개씩 나눠 조회 (이미 받은 ID 는 다시 조회하지 않음)
+def test_scoped_lookup_chunks_id_filters():
+    ec2 = _stubbed_ec2()
+    ids = [f"subnet-{i:017x}" for i in range(FILTER_VALUE_LIMIT + 50)]
+    with Stubber(ec2) as stub:
+        for chunk in (ids[:FILTER_VALUE_LIMIT], ids[FILTER_VALUE_LIMIT:]):
+            stub.add_response("describe_subnets",
+                              {"Subnets": [{"SubnetId": i, "VpcId": VPC} for i in chunk]},
+                              {"MaxResults": 1000, "Filters": [{"Name": "subnet-id", "Values": chunk}]})
+        catalog = ResourceCatalog(StubSession(ec2), Scope(vpc_ids=[VPC]))
+        assert len(catalog.lookup("subnets", ids)) == len(ids)
+        assert len(catalog.lookup("subnets", ids[:10])) == 10
+        stub.assert_no_pending_responses()
+
+# 리포트 단위: 범위 지정 라우팅 테이블 리포트는 VPC / 라우팅 테이블 조회 모두 범위 필터 포함
+def test_scoped_route_table_report_filters():
+    ec2 = _stubbed_ec2()
+    scope = Scope(vpc_ids=[VPC], tags={"env": ["prd"]})
+    with Stubber(ec2) as stub:
+        stub.add_response("describe_vpcs", {"Vpcs": [{"VpcId": VPC, "Tags": [{"Key": "Name", "Value": "main"}]}]},
+                          {"MaxResults": 1000, "Filters": [{"Name": "vpc-id", "Values": [VPC]}]})
+        stub.add_response("describe_route_tables", {"RouteTables": [{
+            "RouteTableId": "rtb-0123456789abcdef0", "VpcId": VPC,
+            "Routes": [{"DestinationCidrBlock": "10.0.0.0/16", "GatewayId": "local"}]}]},
+            {"MaxResults": 100, "Filters": [{"Name": "vpc-id", "Values": [VPC]},
+                                            {"Name": "tag:env", "Values": ["prd"]}]})
+        df = get_routetable.get_full_data(account_label="DEV", catalog=ResourceCatalog(StubSession(ec2), scope))
+        stub.assert_no_pending_responses()
+    assert df[['VPC Name', 'Destination', 'Target']].values.tolist() == [["main", "10.0.0.0/16", "local"]]
@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+
+from service import Inventory, NotFound, Service
+from synthetic import session_factory
+
+TARGET = [("bench", "ap-northeast-2", "BENCH")]
+
+@pytest.fixture
+def inventory(account, capsys):
+    # 엔드포인트 ENI 가 아닌 ENI 도 섞어 둠 (network_interfaces 갱신 필터 확인용)
+    account.network_interfaces.append({'NetworkInterfaceId': "eni-instance", 'InterfaceType': 'interface',
+                                       'SubnetId': account.subnets[0]['SubnetId'], 'VpcId': account.vpcs[0]['VpcId'],
+                                       'PrivateIpAddress': "10.0.0.99"})
+    inventory = Inventory(TARGET, session_factory(account), throttle=False)
+    inventory.start()
+    yield inventory
+    inventory.stop()
+
+def _get(service, path, **params):
+    status, ctype, body, headers = service.handle("GET", path, params)
+    assert status == 200
+    return body, headers["X-Cache"]
+
+def test_start_loads_every_item(inventory):
+    assert all(item["error"] is None and item["version"] > 0 for item in inventory.status()["items"])
+
+# TGW 리포트가 읽는 목록도 갱신 항목
+def test_tgw_lists_are_refreshed(inventory, account):
+    resources = {item["resource"]: item for item in inventory.status()["items"]}
+    assert resources["transit_gateway_route_tables"]["items"] == len(account.tgw_route_tables)
+    assert resources["transit_gateway_attachments"]["items"] == len(account.tgw_attachments)
+    before = inventory.versions(inventory.targets[0], "transit_gateway_route_tables")
+    account.tgw_route_tables.pop()
+    inventory.refresh(inventory.targets[0], "transit_gateway_route_tables").result()
+    assert inventory.versions(inventory.targets[0], "transit_gateway_route_tables") != before
+
+# 리포트끼리 공유하는 SSO 조회도 리포트 갱신 때 다시 조회 (사용자 목록 변경 반영)
+def test_sso_report_refresh_refetches_shared_lookups(inventory, account):
+    account.users.pop()
+    inventory.refresh(inventory.targets[0], "ssouser").result()
+    resources = {item["resource"]: item for item in inventory.status()["items"]}
+    assert resources["ssouser"]["items"] == len(account.users)
+
+# ENI 갱신은 엔드포인트 ENI 만
+def test_network_interface_refresh_keeps_endpoint_enis_only(inventory):
+    body, _ = _get(Service(inventory), "/inventory/network_interfaces")
+    enis = json.loads(body)["BENCH"]
+    assert enis and all(eni['InterfaceType'] == 'vpc_endpoint' for eni in enis)
+
+def test_report_and_query_responses(inventory, account):
+    service = Service(inventory)
+    body, cache = _get(service, "/reports/routetable", format="csv")
+    assert cache == "miss"
+    assert b"Route Tables ID" in body.splitlines()[0]
+    assert _get(service, "/reports/routetable", format="csv")[1] == "hit"
+
+    matches = json.loads(_get(service, "/query/sg", protocol="tcp", port="5432", source="10.0.0.0/8",
+                              match="overlaps")[0])
+    assert matches and {m["target"] for m in matches} == {"BENCH"}
+    subnet = account.subnets[0]['SubnetId']
+    routes = json.loads(_get(service, "/query/route", source=subnet, dest="10.0.0.1,8.8.8.8")[0])
+    assert [r["dest"] for r in routes] == ["10.0.0.1", "8.8.8.8"]
+    assert [r["destination"] for r in routes] == ["10.0.0.0/16", "0.0.0.0/0"]
+    with pytest.raises(NotFound):
+        service.handle("GET", "/reports/nope", {})
+
+# 응답 캐시는 응답이 읽는 항목 버전으로 무효화: SG 갱신은 SG 조회만 새로 만들고 라우팅 리포트는 캐시 유지
+def test_cache_invalidated_only_by_dependencies(inventory, account):
+    service = Service(inventory)
+    sg_query = dict(protocol="tcp", port="5432", source="10.0.0.0/8", match="overlaps")
+    _get(service, "/reports/routetable", format="csv")
+    _get(service, "/query/sg", **sg_query)
+
+    account.security_groups.pop()
+    inventory.refresh(inventory.targets[0], "security_groups").result()
+
+    assert _get(service, "/reports/routetable", format="csv")[1] == "hit"
+    assert _get(service, "/query/sg", **sg_query)[1] == "miss"
+    assert _get(service, "/query/sg", **sg_query)[1] == "hit"
+
+# 같은 데이터로 다시 조회하면 버전이 그대로 → 캐시 유지
+def test_unchanged_refresh_keeps_cache(inventory):
+    service = Service(inventory)
+    _get(service, "/query/route", source="10.0.0.1", dest="8.8.8.8")
+    version = inventory.version
+    inventory.refresh(inventory.targets[0], "route_tables").result()
+    assert inventory.version == version
+    assert _get(service, "/query/route", source="10.0.0.1", dest="8.8.8.8")[1] == "hit"
+
+# 요청 스레드 여러 개가 동시에 조회 인덱스를 만들고 읽어도 같은 결과
+def test_concurrent_index_queries(inventory):
+    service = Service(inventory, cache_entries=0)
+    params = {"protocol": "tcp", "port": "443", "source": "10.0.0.0/8", "match": "overlaps"}
+    expected = service.query_sg(params)
+    assert expected
+    results, errors = [], []
+
+    def worker():
+        try:
+            for _ in range(5):
+                results.append(service.query_sg(params))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert all(r == expected for r in results)
@@ -0,0 +1,76 @@
+import copy
+
+from sg_diff import diff_security_groups
+
+VPCS = {"vpc-1": "main"}
+
+def _sg(gid, name, inbound=(), outbound=()):
+    return {"GroupId": gid, "GroupName": name, "VpcId": "vpc-1",
+            "IpPermissions": list(inbound), "IpPermissionsEgress": list(outbound)}
+
+def _https(*ranges):
+    return {"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443,
+            "IpRanges": [{"CidrIp": cidr, "Description": desc} for cidr, desc in ranges]}
+
+def _web():
+    return _sg("sg-web", "web", inbound=[_https(("10.0.0.0/8", "office"))],
+               outbound=[{"IpProtocol": "-1", "UserIdGroupPairs": [{"GroupId": "sg-db"}]}])
+
+def _db():
+    return _sg("sg-db", "db", inbound=[{"IpProtocol": "tcp", "FromPort": 5432, "ToPort": 5432,
+                                        "UserIdGroupPairs": [{"GroupId": "sg-web", "Description": "app"}]}])
+
+def _changes(old_sgs, new_sgs):
+    return [(c['Change'], c['Group ID'], c['Direction'], c['Source'], c['비고 (이전)'], c['비고 (현재)'])
+            for c in diff_security_groups((VPCS, old_sgs), (VPCS, new_sgs))]
+
+def test_unchanged_snapshots_have_no_changes():
+    assert _changes([_web(), _db()], [_web(), _db()]) == []
+
+def test_added_and_removed_rules():
+    new_web = _web()
+    new_web["IpPermissions"] = [_https(("192.168.0.0/16", "vpn"))]
+    assert _changes([_web()], [new_web]) == [
+        ("REMOVED", "sg-web", "Inbound", "10.0.0.0/8", "office", "-"),
+        ("ADDED", "sg-web", "Inbound", "192.168.0.0/16", "-", "vpn"),
+    ]
+
+def test_description_change_is_modified():
+    new_web = _web()
+    new_web["IpPermissions"] = [_https(("10.0.0.0/8", "office-hq"))]
+    assert _changes([_web()], [new_web]) == [("MODIFIED", "sg-web", "Inbound", "10.0.0.0/8", "office", "office-hq")]
+
+# SG 이름만 바뀌면 (참조하는 SG 의 Source 표기 포함) 변경 아님
+def test_sg_rename_alone_is_not_a_change():
+    renamed = _db()
+    renamed["GroupName"] = "database"
+    assert _changes([_web(), _db()], [_web(), renamed]) == []
+
+# 룰이 없는 SG 도 생성 / 삭제는 SG 행으로 표시
+def test_zero_rule_sg_added_and_removed():
+    empty = _sg("sg-empty", "empty")
+    assert _changes([_web()], [_web(), empty]) == [("ADDED", "sg-empty", "SG", "-", "-", "-")]
+    assert _changes([_web(), empty], [_web()]) == [("REMOVED", "sg-empty", "SG", "-", "-", "-")]
+
+# 새 SG 는 SG 행 다음에 룰 행
+def test_new_sg_lists_sg_row_then_rules():
+    assert _changes([_web()], [_web(), _db()]) == [
+        ("ADDED", "sg-db", "SG", "-", "-", "-"),
+        ("ADDED", "sg-db", "Inbound", "sg-web(web)", "-", "app"),
+    ]
+
+# 같은 키로 펼쳐지는 룰 두 개의 비고는 덮어쓰지 않고 모두 비교
+def test_duplicate_rule_keys_keep_every_remark():
+    old_web = _web()
+    old_web["IpPermissions"] = [_https(("10.0.0.0/8", "office")), _https(("10.0.0.0/8", "backup"))]
+    new_web = copy.deepcopy(old_web)
+    new_web["IpPermissions"][0]["IpRanges"][0]["Description"] = "office-hq"
+    assert _changes([old_web], [new_web]) == [
+        ("MODIFIED", "sg-web", "Inbound", "10.0.0.0/8", "backup | office", "backup | office-hq"),
+    ]
+    # 뒤 룰의 비고만 남던 방식이면 보이지 않는 변경
+    new_web["IpPermissions"][0]["IpRanges"][0]["Description"] = "office"
+    new_web["IpPermissions"] = new_web["IpPermissions"][1:]
+    assert _changes([old_web], [new_web]) == [
+        ("MODIFIED", "sg-web", "Inbound", "10.0.0.0/8", "backup | office", "backup"),
+    ]
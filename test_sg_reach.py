@@ -0,0 +1,166 @@
+import ipaddress
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from sg_reach import DIRECTIONS, ReachabilityIndex, normalize_protocol
+from sg_rules import RuleExpander, perm_sources
+
+# 인덱스 없이 전체 룰을 훑는 기준 (inbound, contains, CIDR 소스)
+def linear_reach(sgs, proto, port, source):
+    query = ipaddress.ip_network(source, strict=False)
+    hits = 0
+    for sg in sgs:
+        for p in sg.get('IpPermissions') or []:
+            rule_proto = normalize_protocol(p.get('IpProtocol', '-1'))
+            if rule_proto != 'all' and (rule_proto != proto or not (p.get('FromPort', -1) <= port <= p.get('ToPort', -1))):
+                continue
+            for kind, value, _ in perm_sources(p):
+                if kind == 'cidr':
+                    net = ipaddress.ip_network(value, strict=False)
+                    hits += net.version == query.version and query.subnet_of(net)
+    return hits
+
+# 합성 계정 SG 에 /16, /24, /28 질의: 인덱스 결과 수 == 선형 스캔 결과 수
+def test_index_agrees_with_linear_scan(account):
+    sgs = account.security_groups
+    index = ReachabilityIndex(sgs)
+    rng = np.random.default_rng(0)
+    ports = rng.choice([22, 80, 443, 3306, 5432, 8080], 200).tolist()
+    sources = [f"10.{a}.0.0/16" if m == 16 else f"10.{a}.{b}.0/{m}" for a, b, m in
+               zip(rng.integers(0, 256, 200).tolist(), rng.integers(0, 4, 200).tolist(),
+                   rng.choice([16, 24, 28], 200).tolist())]
+    total = 0
+    for port, source in zip(ports, sources):
+        expected = linear_reach(sgs, "tcp", port, source)
+        assert len(index.query("tcp", port, source)) == expected, (port, source)
+        total += expected
+    assert total > 0
+
+# -------------------------
+# 임의 SG 집합에서 인덱스 조회 == 모든 룰을 훑는 기준 구현 (고정 seed)
+# - contains / overlaps, inbound / outbound, CIDR / SG 참조 출발지, 포트 무관 / 단일 / 범위, all 프로토콜
+# - transitive: 일치한 SG 를 참조하는 룰을 너비 우선으로 따라간 깊이(len(via))까지 비교
+# -------------------------
+N_SGS = 25
+N_QUERIES = 300
+
+def _random_cidr(rng):
+    if rng.random() < 0.1:
+        return str(ipaddress.ip_network((0x20010db8 << 96 | rng.getrandbits(64) << 32, rng.randint(32, 64)),
+                                        strict=False))
+    return str(ipaddress.ip_network((10 << 24 | rng.getrandbits(24), rng.randint(8, 32)), strict=False))
+
+def _random_perm(rng, group_ids):
+    proto = rng.choice(["tcp", "tcp", "udp", "icmp", "-1"])
+    p = {"IpProtocol": proto}
+    if proto in ("tcp", "udp"):
+        lo = rng.randint(0, 120)
+        p["FromPort"], p["ToPort"] = lo, lo + rng.choice([0, 0, 5, 40])
+    elif proto == "icmp":
+        p["FromPort"], p["ToPort"] = rng.choice([-1, 0, 3, 8]), -1
+    p["IpRanges"] = [{"CidrIp": c} for c in (_random_cidr(rng) for _ in range(rng.randint(0, 3))) if ":" not in c]
+    p["Ipv6Ranges"] = [{"CidrIpv6": _random_cidr(rng)} for _ in range(rng.random() < 0.2)]
+    p["UserIdGroupPairs"] = [{"GroupId": rng.choice(group_ids)} for _ in range(rng.choice([0, 0, 1, 2]))]
+    return p
+
+def random_sgs(rng):
+    group_ids = [f"sg-{i:04d}" for i in range(N_SGS)]
+    return [{"GroupId": gid, "GroupName": f"name-{gid}",
+             "IpPermissions": [_random_perm(rng, group_ids) for _ in range(rng.randint(0, 4))],
+             "IpPermissionsEgress": [_random_perm(rng, group_ids) for _ in range(rng.randint(0, 3))]}
+            for gid in group_ids]
+
+def random_query(rng):
+    proto = rng.choice(["tcp", "tcp", "udp", "icmp", "all"])
+    port = rng.choice([None, rng.randint(0, 160), (lo := rng.randint(0, 120), lo + rng.randint(0, 30))])
+    if proto == "icmp" and port is not None:
+        port = rng.choice([0, 3, 8])
+    source = f"sg-{rng.randrange(N_SGS):04d}" if rng.random() < 0.3 else _random_cidr(rng)
+    return (proto, port, source, rng.choice(["inbound", "outbound"]), rng.choice(["contains", "overlaps"]),
+            rng.random() < 0.5)
+
+def _rule_ports(proto, p):
+    fp, tp = p.get("FromPort"), p.get("ToPort")
+    if proto == "all" or fp is None or fp == -1:
+        return -1, 65535
+    return (fp, fp) if proto == "icmp" else (fp, tp)
+
+def _rule_allows(p, proto, port):
+    rule_proto = normalize_protocol(p.get("IpProtocol", "-1"))
+    if rule_proto != "all" and rule_proto != proto:
+        return False
+    if port is None:
+        return True
+    lo, hi = port if isinstance(port, tuple) else (port, port)
+    rule_lo, rule_hi = _rule_ports(rule_proto, p)
+    return rule_lo <= lo and hi <= rule_hi
+
+def _source_matches(kind, value, source, match):
+    if source.startswith("sg-"):
+        return kind == "sg" and value == source
+    if kind != "cidr":
+        return False
+    rule, query = ipaddress.ip_network(value, strict=False), ipaddress.ip_network(source, strict=False)
+    if rule.version != query.version:
+        return False
+    return query.subnet_of(rule) if match == "contains" else rule.overlaps(query)
+
+# 선형 스캔: (GroupId, Type, Port Range, Source, 깊이) 목록
+def linear_query(sgs, proto, port, source, direction, match, transitive):
+    expander = RuleExpander({sg["GroupId"]: sg["GroupName"] for sg in sgs})
+    key = DIRECTIONS[direction]
+    proto = normalize_protocol(proto)
+
+    def scan(accept):
+        out = []
+        for sg in sgs:
+            for p in sg.get(key) or []:
+                if not _rule_allows(p, proto, port):
+                    continue
+                for row, (kind, value, _) in zip(expander.expand([p]), perm_sources(p)):
+                    if accept(kind, value):
+                        out.append((sg["GroupId"],) + row[:3])
+        return out
+
+    level = scan(lambda kind, value: _source_matches(kind, value, source, match))
+    hits = [row + (0,) for row in level]
+    visited = {source} if source.startswith("sg-") else set()
+    depth = 0
+    while transitive and level:
+        groups = {row[0] for row in level} - visited
+        visited |= groups
+        depth += 1
+        level = scan(lambda kind, value: kind == "sg" and value in groups)
+        hits.extend(row + (depth,) for row in level)
+    return Counter(hits)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_index_matches_linear_scan_on_random_rules(seed):
+    rng = random.Random(seed)
+    sgs = random_sgs(rng)
+    index = ReachabilityIndex(sgs)
+    matched = 0
+    for _ in range(N_QUERIES):
+        proto, port, source, direction, match, transitive = query = random_query(rng)
+        results = index.query(proto, port, source, direction, match, transitive)
+        got = Counter((m.group_id, m.type, m.port_range, m.source, len(m.via)) for m in results)
+        assert got == linear_query(sgs, *query), query
+        # 경유 경로의 마지막 SG 는 그 룰이 참조하는 SG
+        for m in results:
+            if m.via:
+                assert m.source.startswith(m.via[-1] + "(")
+        matched += len(results)
+    assert matched > N_QUERIES
+
+# all 질의는 all 룰에만, all 룰은 모든 프로토콜 질의에 일치
+def test_all_protocol_semantics():
+    sgs = [{"GroupId": "sg-a", "GroupName": "a", "IpPermissions": [
+               {"IpProtocol": "-1", "IpRanges": [{"CidrIp": "10.0.0.0/8"}]},
+               {"IpProtocol": "tcp", "FromPort": 22, "ToPort": 22, "IpRanges": [{"CidrIp": "10.0.0.0/8"}]}]}]
+    index = ReachabilityIndex(sgs)
+    assert [m.type for m in index.query("all", None, "10.1.0.0/16")] == ["all"]
+    assert sorted(m.type for m in index.query("tcp", 22, "10.1.0.0/16")) == ["all", "tcp"]
+    assert [m.type for m in index.query("udp", 53, "10.1.0.0/16")] == ["all"]
@@ -0,0 +1,96 @@
+import pytest
+
+from bench_excel import legacy_expand_rules
+from get_securitygroup import build_sg_name_map
+from sg_rules import RuleTable, iter_sg_rules
+from synthetic import synthetic_security_groups
+
+# ==========================================
+# 두 기존 리포트 표기와 엔진 출력 비교 (SG 표시값 + 방향별 룰 목록)
+# - side_by_side: get_securitygroup 의 기존 expand_rules (bench_excel.legacy_expand_rules)
+# - centered: get_securitygroup2 의 기존 get_rule_list / 데이터 구성 루프 (아래 그대로 옮김)
+# ==========================================
+def legacy_side_by_side(vpc_map, sgs):
+    names = build_sg_name_map(sgs)
+    rows = []
+    for sg in sgs:
+        vpc_id = sg.get("VpcId")
+        sg_id = sg.get("GroupId") or ""
+        vpc_name = vpc_map.get(vpc_id, vpc_id) if vpc_id else "NO_VPC"
+        rows.append((vpc_name, sg.get("GroupName") or sg_id or "", sg_id,
+                     legacy_expand_rules(sg.get("IpPermissions") or [], names),
+                     legacy_expand_rules(sg.get("IpPermissionsEgress") or [], names)))
+    return rows
+
+def legacy_centered(vpc_map, sgs):
+    sg_names = {sg['GroupId']: sg.get('GroupName', sg['GroupId']) for sg in sgs}
+
+    def get_rule_list(perms):
+        rules = []
+        for p in perms:
+            proto = "all" if p.get('IpProtocol') == "-1" else str(p.get('IpProtocol', '-'))
+            f_port, t_port = p.get('FromPort'), p.get('ToPort')
+            port = "-" if f_port is None else (str(f_port) if f_port == t_port else f"{f_port}-{t_port}")
+            srcs = [(r.get('CidrIp') or r.get('CidrIpv6'), r.get('Description', '-'))
+                    for r in p.get('IpRanges', []) + p.get('Ipv6Ranges', [])]
+            srcs += [(f"{g['GroupId']}({sg_names.get(g['GroupId'], g['GroupId'])})", g.get('Description', '-'))
+                     for g in p.get('UserIdGroupPairs', [])]
+            srcs += [(pl['PrefixListId'], pl.get('Description', '-')) for pl in p.get('PrefixListIds', [])]
+            for src, desc in (srcs or [("-", "-")]):
+                rules.append((proto, port, src, desc))
+        return rules or [("-", "-", "-", "-")]
+
+    return [(vpc_map.get(sg.get('VpcId'), 'NO_VPC'), sg.get('GroupName', ''), sg['GroupId'],
+             get_rule_list(sg.get('IpPermissions', [])), get_rule_list(sg.get('IpPermissionsEgress', [])))
+            for sg in sgs]
+
+LEGACY = {"side_by_side": legacy_side_by_side, "centered": legacy_centered}
+
+# 경계 사례: Description 빈 값 / 키 없음, 소스 없는 퍼미션, VPC 없는 SG, 자기 참조 / 다른 SG 참조,
+#           이름 없는 SG 참조, 범위 밖(목록에 없는) SG 참조, 포트 범위 / 한쪽 포트만 있는 퍼미션
+def edge_case_sgs():
+    return [
+        {"GroupId": "sg-self", "GroupName": "self-ref", "VpcId": "vpc-1",
+         "IpPermissions": [
+             {"IpProtocol": "tcp", "FromPort": 22, "ToPort": 22,
+              "IpRanges": [{"CidrIp": "10.0.0.0/8", "Description": ""}, {"CidrIp": "10.1.0.0/16"}],
+              "Ipv6Ranges": [{"CidrIpv6": "::/0", "Description": "v6"}],
+              "UserIdGroupPairs": [{"GroupId": "sg-self"}, {"GroupId": "sg-other", "Description": ""},
+                                   {"GroupId": "sg-unknown", "Description": "cross-account"}],
+              "PrefixListIds": [{"PrefixListId": "pl-0123abcd", "Description": "s3"}]},
+             {"IpProtocol": "udp", "FromPort": 1000, "ToPort": 2000},
+         ],
+         "IpPermissionsEgress": [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}]},
+        {"GroupId": "sg-other", "GroupName": "other", "VpcId": "vpc-2",
+         "IpPermissions": [{"IpProtocol": "icmp", "FromPort": -1, "ToPort": -1,
+                            "UserIdGroupPairs": [{"GroupId": "sg-self", "Description": "from self-ref"}]}],
+         "IpPermissionsEgress": []},
+        {"GroupId": "sg-novpc", "GroupName": "classic", "IpPermissions": [], "IpPermissionsEgress": []},
+        {"GroupId": "sg-noname", "VpcId": "vpc-1",
+         "IpPermissions": [{"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443,
+                            "UserIdGroupPairs": [{"GroupId": "sg-noname"}]}]},
+    ]
+
+def _engine(vpc_map, sgs, dialect):
+    return list(iter_sg_rules(vpc_map, sgs, dialect))
+
+@pytest.mark.parametrize("dialect", ["side_by_side", "centered"])
+@pytest.mark.parametrize("case", ["synthetic", "edge"])
+def test_engine_matches_legacy_layout(dialect, case):
+    if case == "synthetic":
+        vpc_map, sgs = synthetic_security_groups(300)
+    else:
+        vpc_map, sgs = {"vpc-1": "main"}, edge_case_sgs()
+    expected = LEGACY[dialect](vpc_map, sgs)
+    assert _engine(vpc_map, sgs, dialect) == expected
+    assert list(RuleTable.build(vpc_map, sgs, dialect).iter_sgs()) == expected
+
+# 두 표기가 실제로 다른 지점 (빈 Description, VPC 맵에 없는 VPC)
+def test_dialects_differ_where_legacy_reports_differed():
+    vpc_map, sgs = {"vpc-1": "main"}, edge_case_sgs()
+    side = {row[2]: row for row in _engine(vpc_map, sgs, "side_by_side")}
+    centered = {row[2]: row for row in _engine(vpc_map, sgs, "centered")}
+    assert side["sg-self"][3][0] == ("tcp", "22", "10.0.0.0/8", "-")
+    assert centered["sg-self"][3][0] == ("tcp", "22", "10.0.0.0/8", "")
+    assert side["sg-other"][0] == "vpc-2" and centered["sg-other"][0] == "NO_VPC"
+    assert side["sg-noname"][1] == "sg-noname" and centered["sg-noname"][1] == ""
@@ -0,0 +1,60 @@
+import tracemalloc
+
+import pytest
+
+import get_securitygroup
+import get_securitygroup2
+from instrument import PROFILER
+from synthetic import synthetic_security_groups
+from xlsx_stream import RowMerges
+
+# SG 수를 6배로 늘려도 행 기록 구간의 피크는 같은 상한 안 (SG 하나씩 확장 → 기록, 전체 룰 테이블 / 셀 객체 없음)
+# - mergeCells 는 sheetData 뒤에 기록되어 시트 끝에 한 번에 만들어짐 (openpyxl 이 병합 범위 전체를 객체로 생성)
+#   → 병합 블록만 병합된 SG 수에 비례, SG당 상한으로 따로 확인
+SIZES = (100, 600)
+ROW_PEAK_BYTES = 500_000      # 행 기록 구간 피크 상한 (SG 수와 무관)
+MERGE_BYTES_PER_SG = 4_000    # 시트 끝 병합 블록 (SG당 A/B/C 범위 3개)
+
+def _peaks(save, n, path, monkeypatch):
+    vpc_map, sgs = synthetic_security_groups(n)
+    close = RowMerges.close
+    row_peak = []
+
+    # 병합 등록 직전까지의 피크 = 행 기록 구간 피크
+    def close_after_rows(self, ws):
+        row_peak.append(tracemalloc.get_traced_memory()[1])
+        close(self, ws)
+
+    monkeypatch.setattr(RowMerges, "close", close_after_rows)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        save([("SecurityGroups", vpc_map, sgs)], str(path))
+        return row_peak[0] - base, tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+@pytest.mark.parametrize("save", [get_securitygroup.save_side_by_side, get_securitygroup2.save_centered],
+                         ids=["side_by_side", "centered"])
+def test_sg_rows_stream_in_flat_memory(save, tmp_path, monkeypatch):
+    for n in SIZES:
+        row_peak, total_peak = _peaks(save, n, tmp_path / f"sg-{n}.xlsx", monkeypatch)
+        assert row_peak <= ROW_PEAK_BYTES, n
+        assert total_peak <= ROW_PEAK_BYTES + MERGE_BYTES_PER_SG * n, n
+
+# 룰 확장(SG 단위 iter_sg_rules)은 시트마다 "expand" 단계 1개로 따로 계측 (기록 시간 제외)
+@pytest.mark.parametrize("save, report", [(get_securitygroup.save_side_by_side, "securitygroup"),
+                                          (get_securitygroup2.save_centered, "securitygroup2")],
+                         ids=["side_by_side", "centered"])
+def test_rule_expansion_has_its_own_span(save, report, tmp_path):
+    vpc_map, sgs = synthetic_security_groups(20)
+    PROFILER.reset()
+    PROFILER.enable()
+    try:
+        save([("A", vpc_map, sgs), ("B", vpc_map, sgs)], str(tmp_path / "sg.xlsx"))
+    finally:
+        PROFILER.disable()
+    spans = [s for s in PROFILER.summary()["spans"] if s["stage"] == "expand"]
+    PROFILER.reset()
+    assert [s["report"] for s in spans] == [report, report]
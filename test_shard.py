@@ -0,0 +1,133 @@
+import io
+import zipfile
+
+import openpyxl
+import pytest
+
+import collector
+from shard import render_sharded
+from synthetic import SyntheticSession
+
+PROFILES = ["dev", "stg", "prod"]
+TARGETS = [f"{p}:ap-northeast-2:{p.upper()}" for p in PROFILES]
+SG_HEADER_ROWS = 2   # 보안그룹 리포트: 방향 제목 + Type/Port Range/Source 2줄
+
+# 계정마다 다른 합성 데이터 (seed 다름, VPC 2개 이상)
+@pytest.fixture
+def collected(make_account):
+    accounts = {p: make_account(seed=i, n_sgs=30, n_rtbs=12) for i, p in enumerate(PROFILES)}
+    results = collector.collect_reports(
+        TARGETS, ["routetable", "securitygroup"],
+        session_factory=lambda profile_name=None, region_name=None: SyntheticSession(accounts[profile_name]))
+    return collector.sheet_titles(TARGETS), results
+
+# 병합 셀은 왼쪽 위 값으로 채운 값 격자 + 병합 범위 (행, 열, 끝 행, 끝 열)
+def _grid(ws):
+    rows = [list(row) for row in ws.iter_rows(values_only=True)]
+    merges = set()
+    for rng in ws.merged_cells.ranges:
+        merges.add((rng.min_row, rng.min_col, rng.max_row, rng.max_col))
+        for r in range(rng.min_row, rng.max_row + 1):
+            for c in range(rng.min_col, rng.max_col + 1):
+                rows[r - 1][c - 1] = rows[rng.min_row - 1][rng.min_col - 1]
+    return [tuple(row) for row in rows], merges
+
+def _shards(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: openpyxl.load_workbook(io.BytesIO(zf.read(name))) for name in zf.namelist()}
+
+def _unsharded(name, titles, results, tmp_path):
+    path = str(tmp_path / f"{name}-full.xlsx")
+    collector.save_excel(name, titles, results, path)
+    return openpyxl.load_workbook(path)
+
+# ==========================================
+# DataFrame 리포트 (라우팅 테이블): 샤드 = 전체 시트에서 해당 계정(/VPC) 행 구간
+# - 병합은 전체 시트의 병합을 그 구간으로 자른 것과 같음 (부모 컬럼 경계에서 끊기므로)
+# ==========================================
+@pytest.mark.parametrize("by", ["account", "vpc"])
+def test_routetable_shards_match_unsharded_blocks(collected, tmp_path, by):
+    titles, results = collected
+    files = render_sharded("routetable", titles, results["routetable"], str(tmp_path / "rt.zip"), by, workers=1)
+    assert files == [str(tmp_path / "rt.zip")]
+    full_rows, full_merges = _grid(_unsharded("routetable", titles, results["routetable"], tmp_path).active)
+    header, data = full_rows[0], full_rows[1:]
+
+    keys = list(dict.fromkeys(row[:1] if by == "account" else row[:2] for row in data))
+    expected_names = {f"rt_{'-'.join(key)}.xlsx" for key in keys}
+    shards = _shards(files[0])
+    assert set(shards) == expected_names
+    assert {key[0] for key in keys} == set(titles)
+    if by == "vpc":
+        assert len(keys) > len(titles)
+
+    for key in keys:
+        wb = shards[f"rt_{'-'.join(key)}.xlsx"]
+        assert len(wb.worksheets) == 1
+        rows, merges = _grid(wb.active)
+        block = [i for i, row in enumerate(data) if row[:len(key)] == key]
+        assert block == list(range(block[0], block[-1] + 1))
+        assert rows[0] == header
+        assert rows[1:] == data[block[0]:block[-1] + 1]
+
+        first, last = block[0] + 2, block[-1] + 2   # 전체 시트의 행 번호 (헤더 1행)
+        offset = first - 2
+        clipped = {(max(r1, first) - offset, c1, min(r2, last) - offset, c2)
+                   for r1, c1, r2, c2 in full_merges if r1 <= last and r2 >= first}
+        assert merges == {m for m in clipped if m[2] > m[0]}
+
+# ==========================================
+# 보안그룹 리포트: 계정 샤드 = 전체 워크북의 해당 계정 시트
+#                  VPC 샤드 = 그 VPC 의 SG 행만 (헤더 2줄 / SG 별 병합 유지, 다른 VPC SG 참조 이름 유지)
+# ==========================================
+def _sg_blocks(rows):
+    blocks = {}
+    for row in rows[SG_HEADER_ROWS:]:
+        blocks.setdefault(row[2], []).append(row)
+    return blocks
+
+def test_sg_account_shards_match_unsharded_sheets(collected, tmp_path):
+    titles, results = collected
+    files = render_sharded("securitygroup", titles, results["securitygroup"], str(tmp_path / "sg.zip"), "account",
+                           workers=1)
+    full = _unsharded("securitygroup", titles, results["securitygroup"], tmp_path)
+    shards = _shards(files[0])
+    assert set(shards) == {f"sg_{title}.xlsx" for title in titles}
+    for title in titles:
+        wb = shards[f"sg_{title}.xlsx"]
+        assert wb.sheetnames == [title]
+        assert _grid(wb[title]) == _grid(full[title])
+
+def test_sg_vpc_shards_split_unsharded_sheets(collected, tmp_path):
+    titles, results = collected
+    files = render_sharded("securitygroup", titles, results["securitygroup"], str(tmp_path / "sg.zip"), "vpc",
+                           workers=1)
+    full = _unsharded("securitygroup", titles, results["securitygroup"], tmp_path)
+    shards = _shards(files[0])
+
+    seen = set()
+    for title in titles:
+        full_rows, full_merges = _grid(full[title])
+        full_blocks = _sg_blocks(full_rows)
+        vpcs = list(dict.fromkeys(rows[0][0] for rows in full_blocks.values()))
+        assert len(vpcs) > 1
+        for vpc in vpcs:
+            filename = f"sg_{title}-{vpc}.xlsx"
+            seen.add(filename)
+            wb = shards[filename]
+            assert wb.sheetnames == [title]
+            rows, merges = _grid(wb[title])
+            assert rows[:SG_HEADER_ROWS] == full_rows[:SG_HEADER_ROWS]
+            assert {m for m in merges if m[0] <= SG_HEADER_ROWS} == {m for m in full_merges if m[0] <= SG_HEADER_ROWS}
+            blocks = _sg_blocks(rows)
+            assert blocks == {gid: block for gid, block in full_blocks.items() if block[0][0] == vpc}
+
+            # SG 블록마다 VPC / 이름 / Group ID 컬럼 병합 (2행 이상인 SG)
+            start = SG_HEADER_ROWS + 1
+            for block in blocks.values():
+                end = start + len(block) - 1
+                if end > start:
+                    assert {(start, col, end, col) for col in (1, 2, 3)} <= merges
+                start = end + 1
+            assert start - 1 == len(rows)
+    assert set(shards) == seen
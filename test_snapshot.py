@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+import collector
+import snapshot
+from snapshot import SnapshotMissing, SnapshotSession, SnapshotStore
+from synthetic import SyntheticSession
+
+TARGETS = ["dev:ap-northeast-2:DEV", "prod:ap-northeast-2:PROD"]
+
+def _factory(account, sessions):
+    def factory(profile_name=None, region_name=None):
+        return sessions.setdefault(profile_name, SyntheticSession(account))
+    return factory
+
+def _same(a, b):
+    if isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b)
+    else:
+        assert a == b
+
+# 전체 리포트를 스냅샷에 기록한 뒤 replay 하면 백엔드 호출 없이 같은 결과
+def test_replay_reproduces_every_report_without_backend(account, tmp_path):
+    store = SnapshotStore(str(tmp_path / "snap.db"))
+    recorded_sessions, replay_sessions = {}, {}
+    recorded = collector.collect_reports(TARGETS, session_factory=_factory(account, recorded_sessions),
+                                         snapshot=store, mode="record")
+    assert all(sum(s.calls.values()) for s in recorded_sessions.values())
+
+    replayed = collector.collect_reports(TARGETS, session_factory=_factory(account, replay_sessions),
+                                         snapshot=SnapshotStore(store.path), mode="replay")
+    assert replay_sessions == {}
+    assert set(replayed) == set(recorded) == set(collector.REPORTS)
+    for name in recorded:
+        for a, b in zip(recorded[name], replayed[name]):
+            _same(a, b)
+
+# auto 모드: TTL 안이면 캐시 사용, 지나면 다시 조회해 저장
+def test_auto_mode_refetches_after_ttl(session, tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / "snap.db"), ttl=3600)
+    ec2 = SnapshotSession(store, "DEV", "ap-northeast-2", base=session).client("ec2")
+    first = ec2.describe_vpcs()
+    assert ec2.describe_vpcs() == first
+    assert session.calls["ec2.describe_vpcs"] == 1
+
+    now = snapshot.time.time()
+    monkeypatch.setattr(snapshot.time, "time", lambda: now + 3601)
+    assert ec2.describe_vpcs() == first
+    assert session.calls["ec2.describe_vpcs"] == 2
+
+# replay 모드: 저장되지 않은 호출은 SnapshotMissing (만료된 응답은 그대로 사용)
+def test_replay_missing_key_raises(session, tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / "snap.db"), ttl=1)
+    SnapshotSession(store, "DEV", "ap-northeast-2", base=session).client("ec2").describe_vpcs()
+    monkeypatch.setattr(snapshot.time, "time", lambda: 1e12)
+
+    replay = SnapshotSession(store, "DEV", "ap-northeast-2", mode="replay").client("ec2")
+    assert replay.describe_vpcs()['Vpcs']
+    with pytest.raises(SnapshotMissing):
+        replay.describe_subnets()
+    with pytest.raises(SnapshotMissing):
+        list(replay.get_paginator("describe_security_groups").paginate())
+    with pytest.raises(SnapshotMissing):
+        SnapshotSession(store, "PROD", "ap-northeast-2", mode="replay").client("ec2").describe_vpcs()
+
+# 여러 페이지 응답은 페이지 순서대로 재생 (페이지 크기는 키에서 제외)
+def test_paginated_replay(session, account, tmp_path):
+    store = SnapshotStore(str(tmp_path / "snap.db"))
+    ec2 = SnapshotSession(store, "DEV", "ap-northeast-2", base=session).client("ec2")
+    pages = list(ec2.get_paginator("describe_security_groups").paginate(PaginationConfig={"PageSize": 7}))
+    assert len(pages) == -(-len(account.security_groups) // 7)
+
+    replay = SnapshotSession(store, "DEV", "ap-northeast-2", mode="replay").client("ec2")
+    replayed = list(replay.get_paginator("describe_security_groups").paginate(PaginationConfig={"PageSize": 1000}))
+    assert replayed == pages
+    assert session.calls["ec2.describe_security_groups"] == len(pages)
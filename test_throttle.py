@@ -0,0 +1,85 @@
+import random
+import threading
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+
+import throttle
+from synthetic import SyntheticSession
+from throttle import RequestScheduler, ScheduledSession, TokenBucket
+
+ALLOWED_RATE = 40.0      # 합성 API 초당 허용치 (초과분은 RequestLimitExceeded)
+N_CALLS = 240
+N_THREADS = 8
+SEED = 1234
+
+@pytest.fixture
+def seeded():
+    # 백오프 지터(random.uniform)를 고정
+    state = random.getstate()
+    random.seed(SEED)
+    yield
+    random.setstate(state)
+
+# 허용치보다 높은 속도로 시작해도 전부 성공하고, 스로틀은 일부만, 허용 속도는 허용치 근처로 수렴
+def test_scheduler_converges_below_throttle_rate(account, seeded):
+    session = SyntheticSession(account, throttle_rate=ALLOWED_RATE)
+    scheduler = RequestScheduler(initial_rate=4 * ALLOWED_RATE)
+    ec2 = ScheduledSession(session, scheduler).client('ec2')
+    errors = []
+
+    def worker(n):
+        for _ in range(n):
+            try:
+                ec2.describe_vpcs()
+            except ClientError as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(N_CALLS // N_THREADS,)) for _ in range(N_THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    m = scheduler.metrics()["ec2.describe_vpcs"]
+    assert not errors
+    assert m["ok"] == N_CALLS
+    assert session.calls["ec2.describe_vpcs"] == m["calls"] == N_CALLS + m["throttled"]
+    assert m["throttled"] <= 0.25 * N_CALLS
+    assert m["rate_limit"] <= 2 * ALLOWED_RATE
+    assert 0.5 * ALLOWED_RATE <= m["achieved_rps"] <= 1.5 * ALLOWED_RATE
+
+# 동시에 몰려 온 스로틀 응답은 한 번만 감소 (고속에서도 DECREASE_WINDOW 안은 무시)
+def test_throttle_burst_decreases_once():
+    bucket = TokenBucket(rate=80.0)
+    for _ in range(20):
+        bucket.on_throttle()
+    assert bucket.rate == 80.0 * throttle.DECREASE_FACTOR
+
+# 연결 오류 / 읽기 타임아웃도 스케줄러가 재시도 (client 자체 재시도는 꺼져 있음)
+@pytest.mark.parametrize("error", [EndpointConnectionError(endpoint_url="https://ec2"),
+                                   ReadTimeoutError(endpoint_url="https://ec2")])
+def test_connection_errors_are_retried(monkeypatch, error):
+    monkeypatch.setattr(throttle.time, "sleep", lambda s: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise error
+        return "ok"
+
+    scheduler = RequestScheduler()
+    assert scheduler.call(("ec2", "describe_vpcs"), flaky) == "ok"
+    assert scheduler.metrics()["ec2.describe_vpcs"]["retries"] == 2
+
+# paginator 페이지 요청도 하나씩 스케줄러를 거침 (페이지 수 == 스케줄러 호출 수)
+def test_paginator_pages_go_through_scheduler(account):
+    session = SyntheticSession(account)
+    scheduler = RequestScheduler(initial_rate=1000.0)
+    ec2 = ScheduledSession(session, scheduler).client('ec2')
+    pages = list(ec2.get_paginator('describe_security_groups').paginate(PaginationConfig={"PageSize": 7}))
+
+    assert sum(len(p['SecurityGroups']) for p in pages) == len(account.security_groups)
+    assert len(pages) == -(-len(account.security_groups) // 7)
+    assert scheduler.metrics()["ec2.describe_security_groups"]["calls"] == len(pages)
@@ -0,0 +1,240 @@
+import random
+import threading
+import time
+
+import jmespath
+from botocore import xform_name
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from botocore.loaders import create_loader
+
+# ==========================================
+# 1. 설정 (API 호출 스케줄러)
+# ==========================================
+INITIAL_RATE = 10.0       # API별 시작 속도 (요청/초)
+MIN_RATE = 0.5
+MAX_RATE = 100.0
+ADDITIVE_STEP = 1.0       # 스로틀 없이 1초 지날 때마다 늘리는 속도 (요청/초)
+DECREASE_FACTOR = 0.5     # 스로틀 응답 시 곱하는 비율
+MAX_ATTEMPTS = 8
+BASE_DELAY = 0.2          # 재시도 지수 백오프 기준 (초)
+MAX_DELAY = 10.0
+DECREASE_WINDOW = 1.0     # 스로틀 감소 후 이 시간(초) 안의 스로틀 응답은 같은 혼잡으로 보고 무시 (RTT 이상)
+# ==========================================
+
+THROTTLE_CODES = {
+    "Throttling", "ThrottlingException", "ThrottledException", "RequestLimitExceeded",
+    "RequestThrottled", "RequestThrottledException", "TooManyRequestsException", "SlowDown",
+}
+TRANSIENT_CODES = {"InternalError", "InternalFailure", "ServiceUnavailable", "Unavailable"}
+
+# boto3 기본 재시도가 스로틀을 먼저 삼키지 않도록 client 재시도는 끄고 스케줄러가 담당
+# - 스케줄러는 스로틀/일시 오류 코드 + 연결 오류(EndpointConnectionError 등) + 읽기 타임아웃/연결 끊김
+#   (ReadTimeoutError, ConnectionClosedError 등 HTTPClientError)을 재시도
+RETRYABLE_ERRORS = (ClientError, BotoConnectionError, HTTPClientError)
+NO_RETRY_CONFIG = Config(retries={"total_max_attempts": 1, "mode": "standard"})
+
+# -------------------------
+# 토큰 버킷 + AIMD 속도 조절 (API 1개 단위)
+# - acquire: 토큰이 생길 때까지 대기 (잠금 밖에서 sleep)
+# - 성공: 초당 ADDITIVE_STEP 만큼 선형 증가 / 스로틀: DECREASE_FACTOR 배로 감소
+# - 동시에 여러 스로틀 응답이 와도 한 번만 줄이도록 최근 감소 후 DECREASE_WINDOW 안은 무시
+#   (이미 보낸 요청의 스로틀 응답은 한 RTT 안에 몰려 옴 → 1/rate 처럼 짧으면 고속에서 여러 번 줄어듦)
+# -------------------------
+class TokenBucket:
+    def __init__(self, rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # 버스트는 1초 분량까지만 허용
+        self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + ADDITIVE_STEP / self.rate)
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < max(DECREASE_WINDOW, 1.0 / self.rate):
+                return
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+            self._last_decrease = now
+
+def error_code(exc):
+    if isinstance(exc, ClientError):
+        return exc.response.get("Error", {}).get("Code")
+    return None
+
+# -------------------------
+# API 호출 스케줄러 (계정/리전 1개 단위로 생성)
+# - (서비스, API)별 토큰 버킷
+# - 스로틀/일시 오류는 지터 포함 지수 백오프로 재시도 (full jitter)
+# - 달성 처리량 등 지표 수집
+# -------------------------
+class RequestScheduler:
+    def __init__(self, initial_rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key):
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.initial_rate, self.min_rate, self.max_rate)
+                self._stats[key] = {"calls": 0, "ok": 0, "throttled": 0, "retries": 0,
+                                    "first": None, "last": None}
+            return self._buckets[key], self._stats[key]
+
+    def _record(self, stats, field):
+        with self._lock:
+            now = time.monotonic()
+            stats[field] += 1
+            if field == "calls":
+                stats["first"] = stats["first"] or now
+            stats["last"] = now
+
+    def call(self, key, fn, **params):
+        bucket, stats = self._bucket(key)
+        for attempt in range(self.max_attempts):
+            bucket.acquire()
+            self._record(stats, "calls")
+            try:
+                result = fn(**params)
+            except RETRYABLE_ERRORS as exc:
+                code = error_code(exc)
+                retryable = code in THROTTLE_CODES or code in TRANSIENT_CODES or code is None
+                if not retryable or attempt == self.max_attempts - 1:
+                    raise
+                if code in THROTTLE_CODES:
+                    self._record(stats, "throttled")
+                    bucket.on_throttle()
+                self._record(stats, "retries")
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                continue
+            self._record(stats, "ok")
+            bucket.on_success()
+            return result
+
+    # (서비스, API)별 지표: 호출/성공/스로틀/재시도, 달성 처리량, 현재 허용 속도
+    def metrics(self):
+        with self._lock:
+            items = [(key, dict(stats), self._buckets[key].rate) for key, stats in self._stats.items()]
+        out = {}
+        for (service, operation), stats, rate in sorted(items):
+            elapsed = (stats["last"] - stats["first"]) if stats["first"] else 0.0
+            out[f"{service}.{operation}"] = {
+                "calls": stats["calls"], "ok": stats["ok"],
+                "throttled": stats["throttled"], "retries": stats["retries"],
+                "achieved_rps": round(stats["ok"] / elapsed, 2) if elapsed > 0 else None,
+                "rate_limit": round(rate, 2),
+            }
+        return out
+
+    def print_metrics(self, title=""):
+        metrics = self.metrics()
+        if not metrics:
+            return
+        print(f"📊 API 호출 통계 {title}".rstrip())
+        print(f"  {'API':<48}{'calls':>7}{'throttled':>10}{'retries':>9}{'rps':>8}{'limit':>8}")
+        for name, m in metrics.items():
+            rps = "-" if m["achieved_rps"] is None else m["achieved_rps"]
+            print(f"  {name:<48}{m['calls']:>7}{m['throttled']:>10}{m['retries']:>9}{rps:>8}{m['rate_limit']:>8}")
+
+# -------------------------
+# 스케줄러 경유 session / client 래퍼
+# - 리포트/카탈로그는 그대로 session.client(...) 를 쓰면 됨
+# - paginator는 원래 paginator 대신 ScheduledPaginator: 스케줄러 경유 API 호출을 넘겨 받아 페이지를 직접 넘김
+#   (토큰 이름은 botocore 의 paginators-1 모델에서 읽음 → 실제/합성 client 모두 같은 경로)
+# -------------------------
+class ScheduledSession:
+    def __init__(self, session, scheduler):
+        self.session = session
+        self.scheduler = scheduler
+
+    def client(self, service, **kwargs):
+        kwargs.setdefault("config", NO_RETRY_CONFIG)
+        return ScheduledClient(self.session.client(service, **kwargs), self.scheduler, service)
+
+_PAGINATION = {}
+_PAGINATION_LOCK = threading.Lock()
+
+# 서비스별 paginator 설정 {API(snake_case): {input_token, output_token, limit_key, ...}}
+def pagination_config(service):
+    with _PAGINATION_LOCK:
+        if service not in _PAGINATION:
+            model = create_loader().load_service_model(service, "paginators-1")
+            _PAGINATION[service] = {xform_name(name): config for name, config in model["pagination"].items()}
+        return _PAGINATION[service]
+
+def _as_list(value):
+    return value if isinstance(value, list) else [value]
+
+class ScheduledPaginator:
+    def __init__(self, method, config):
+        self._method = method
+        self._input_tokens = _as_list(config["input_token"])
+        self._output_tokens = [jmespath.compile(expr) for expr in _as_list(config["output_token"])]
+        self._limit_key = config.get("limit_key")
+
+    # PaginationConfig 는 PageSize 만 사용 (리포트에서 쓰는 범위)
+    def paginate(self, PaginationConfig=None, **params):
+        config = PaginationConfig or {}
+        if config.get("PageSize") and self._limit_key:
+            params[self._limit_key] = config["PageSize"]
+        previous = None
+        while True:
+            page = self._method(**params)
+            yield page
+            tokens = [expr.search(page) for expr in self._output_tokens]
+            if all(token is None for token in tokens) or tokens == previous:
+                return
+            params.update(zip(self._input_tokens, tokens))
+            previous = tokens
+
+class ScheduledClient:
+    def __init__(self, client, scheduler, service):
+        self._client = client
+        self._scheduler = scheduler
+        self._service = service
+
+    def _scheduled(self, operation, method):
+        return lambda **params: self._scheduler.call((self._service, operation), method, **params)
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith("_") or name in ("meta", "exceptions", "can_paginate", "get_waiter") or not callable(attr):
+            return attr
+        return self._scheduled(name, attr)
+
+    def get_paginator(self, operation):
+        config = pagination_config(self._service).get(operation)
+        if config is None:
+            return self._client.get_paginator(operation)   # 페이지 없는 API 등 → 원래 오류 그대로
+        return ScheduledPaginator(self._scheduled(operation, getattr(self._client, operation)), config)
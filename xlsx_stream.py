@@ -0,0 +1,62 @@
+from array import array
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle
+from openpyxl.worksheet.cell_range import MultiCellRange
+
+# ==========================================
+# openpyxl write-only 스트리밍 헬퍼
+# - 행은 만들자마자 파일로 흘려보내고 메모리에 남기지 않음
+# - 셀마다 Alignment/Border 객체를 만들지 않고 공유 NamedStyle 이름만 지정
+# - 주의: write-only 시트는 위에서 아래로 한 번만 쓸 수 있으므로
+#   열 너비/행 높이/틀 고정은 첫 행을 쓰기 전에 설정
+# ==========================================
+
+# styles: {스타일명: {"font": ..., "fill": ..., "alignment": ..., "border": ...}}
+def new_workbook(styles):
+    wb = Workbook(write_only=True)
+    for name, attrs in styles.items():
+        wb.add_named_style(NamedStyle(name=name, **attrs))
+    return wb
+
+# 한 행 생성: style 은 스타일명 하나 또는 셀별 스타일명 리스트
+def styled_row(ws, values, style):
+    styles = style if isinstance(style, (list, tuple)) else [style] * len(values)
+    row = []
+    for value, name in zip(values, styles):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = name
+        row.append(cell)
+    return row
+
+# 병합 범위 일괄 등록 (시트를 닫을 때 mergeCells 로 기록됨)
+# - merged_cells.add()는 매번 기존 범위와 겹침 검사(O(n))를 하므로
+#   "A3:A5" 형태 문자열로 모아 두었다가 시트 작성 끝에 한 번에 지정
+def set_merges(ws, refs):
+    ws.merged_cells = MultiCellRange(" ".join(refs))
+
+# -------------------------
+# 세로 병합 구간 (시작행, 끝행) 을 정수 배열로 보관
+# - mergeCells 는 sheetData 뒤에 기록되므로 시트 끝까지 모아야 함 → 범위 문자열 대신 행 번호만 보관
+# - close() 에서 cols 마다 "A3:A5" 형태로 풀어 set_merges
+# -------------------------
+class RowMerges:
+    def __init__(self, cols, fixed=()):
+        self.cols = cols
+        self.fixed = list(fixed)
+        self.rows = array("I")
+
+    def add(self, start_row, end_row):
+        if end_row > start_row:
+            self.rows.extend((start_row, end_row))
+
+    def refs(self):
+        yield from self.fixed
+        rows = self.rows
+        for i in range(0, len(rows), 2):
+            for col in self.cols:
+                yield f"{col}{rows[i]}:{col}{rows[i + 1]}"
+
+    def close(self, ws):
+        set_merges(ws, self.refs())